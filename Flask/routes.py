@@ -736,7 +736,7 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
         
         context = {
-            'period': f"{start_date or 'début'} → {end_date or 'aujourd\'hui'}",
+            'period': f"{start_date or 'début'} → " + (end_date or "aujourd'hui"),
             'themes': themes if themes else ['Tous thèmes'],
             'sentiment_positive': sentiment_counts.get('positive', 0),
             'sentiment_negative': sentiment_counts.get('negative', 0),
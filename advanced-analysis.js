@@ -240,17 +240,25 @@ class AdvancedAnalysisManager {
                 themes: selectedThemes,
                 include_sentiment: includeSentiment,
                 include_sources: includeSources,
-                generate_pdf: generatePDF
+                generate_pdf: generatePDF,
+                stream: true
             };
 
             const response = await fetch('/api/generate-ia-report', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
+                    'Accept': 'text/event-stream'
                 },
                 body: JSON.stringify(requestData)
             });
 
+            // Rapport transmis au fil de l'eau (server-sent events)
+            if ((response.headers.get('Content-Type') || '').includes('text/event-stream')) {
+                await this.consumeIAReportStream(response, resultDiv, generatePDF);
+                return;
+            }
+
             const data = await response.json();
 
             if (data.success) {
@@ -277,6 +285,56 @@ class AdvancedAnalysisManager {
         }
     }
 
+    static async consumeIAReportStream(response, container, generatePDF) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let meta = null;
+        let analysisHtml = '';
+
+        const handleEvent = (rawEvent) => {
+            let eventName = 'message';
+            let payload = '';
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) eventName = line.slice(6).trim();
+                else if (line.startsWith('data:')) payload += line.slice(5).trim();
+            });
+            if (!payload) return;
+            const data = JSON.parse(payload);
+
+            if (eventName === 'meta') {
+                meta = data;
+                this.displayIAReportResults({ ...meta, analysis_html: '' }, container, false);
+                document.getElementById('analysisContent').innerHTML =
+                    '<p class="text-gray-600"><i class="fas fa-spinner fa-spin mr-2"></i>Génération en cours...</p>';
+            } else if (eventName === 'chunk') {
+                // Réécrire le HTML cumulé pour que les listes ouvertes restent bien formées
+                analysisHtml += data.html;
+                document.getElementById('analysisContent').innerHTML = analysisHtml;
+            } else if (eventName === 'done') {
+                this.displayIAReportResults({
+                    ...meta,
+                    analysis_html: data.status_badge + analysisHtml,
+                    llama_status: data.llama_status
+                }, container, generatePDF);
+            }
+        };
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            events.forEach(handleEvent);
+        }
+
+        if (buffer.trim()) {
+            handleEvent(buffer);
+        }
+    }
+
     static displayIAReportResults(data, container, generatePDF) {
         let pdfSection = '';
 
@@ -6,9 +6,8 @@ Module de détection d'anomalies et d'écarts dans les données géopolitiques
 import logging
 import numpy as np
 from typing import List, Dict, Any
-from datetime import datetime, timedelta
-from scipy import stats
-from .database import DatabaseManager
+from datetime import datetime
+from .database import DatabaseManager, days_ago_timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -26,18 +25,18 @@ class AnomalyDetector:
         Utilise la méthode statistique des z-scores
         """
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
+            cutoff_ts = days_ago_timestamp(days)
             
             conn = self.db_manager.get_connection()
             cursor = conn.cursor()
             
             # Récupérer les données de sentiment
             cursor.execute("""
-                SELECT sentiment_score, pub_date
+                SELECT sentiment_score, pub_ts
                 FROM articles
-                WHERE pub_date >= ?
-                ORDER BY pub_date
-            """, (cutoff_date,))
+                WHERE pub_ts >= ?
+                ORDER BY pub_ts
+            """, (cutoff_ts,))
             
             scores = [row[0] for row in cursor.fetchall()]
             conn.close()
@@ -79,20 +78,20 @@ class AnomalyDetector:
         Détecte les anomalies dans l'apparition d'un thème
         """
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
+            cutoff_ts = days_ago_timestamp(days)
             
             conn = self.db_manager.get_connection()
             cursor = conn.cursor()
             
             # Compter les articles par jour pour ce thème
             cursor.execute("""
-                SELECT DATE(a.pub_date) as date, COUNT(*) as count
+                SELECT DATE(a.pub_ts, 'unixepoch') as date, COUNT(*) as count
                 FROM articles a
                 JOIN theme_analyses ta ON a.id = ta.article_id
-                WHERE ta.theme_id = ? AND a.pub_date >= ?
-                GROUP BY DATE(a.pub_date)
+                WHERE ta.theme_id = ? AND a.pub_ts >= ?
+                GROUP BY date
                 ORDER BY date
-            """, (theme_id, cutoff_date))
+            """, (theme_id, cutoff_ts))
             
             daily_counts = [(row[0], row[1]) for row in cursor.fetchall()]
             conn.close()
@@ -135,7 +134,7 @@ class AnomalyDetector:
         Détecte les anomalies dans les corrélations entre thèmes et sentiments
         """
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
+            cutoff_ts = days_ago_timestamp(days)
             
             conn = self.db_manager.get_connection()
             cursor = conn.cursor()
@@ -146,10 +145,10 @@ class AnomalyDetector:
                 FROM themes t
                 JOIN theme_analyses ta ON t.id = ta.theme_id
                 JOIN articles a ON ta.article_id = a.id
-                WHERE a.pub_date >= ? AND ta.confidence >= 0.1
+                WHERE a.pub_ts >= ? AND ta.confidence >= 0.1
                 GROUP BY t.id, t.name
                 HAVING COUNT(*) >= 5
-            """, (cutoff_date,))
+            """, (cutoff_ts,))
             
             theme_data = cursor.fetchall()
             conn.close()
@@ -164,6 +163,7 @@ class AnomalyDetector:
             
             # Corrélation entre sentiment et fréquence
             if len(sentiment_scores) > 1 and len(article_counts) > 1:
+                from scipy import stats
                 correlation, p_value = stats.pearsonr(sentiment_scores, article_counts)
                 
                 return [{
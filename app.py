@@ -1,6 +1,7 @@
-from Flask.app_factory import create_app
-
-app = create_app()
+from Flask.app_factory import create_app, should_start_services
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Sous la garde : les workers du pool de sentiment (spawn) ré-importent
+    # __main__ et ne doivent pas reconstruire l'application (WSGI : wsgi.py)
+    app = create_app(start_services=should_start_services(use_reloader=True))
+    app.run(debug=True, host='0.0.0.0', port=5000)
@@ -1,9 +1,32 @@
 import os
+import multiprocessing
 from flask import Flask
 import logging
 
-def create_app():
-    """Factory pour créer l'application Flask"""
+def should_start_services(use_reloader: bool = False) -> bool:
+    """
+    Faux dans un worker multiprocessing (spawn ré-importe __main__), dans
+    le processus parent du rechargeur Werkzeug, qui ne sert aucune requête,
+    et dans tout processus autre que le détenteur du verrou des services
+    (un seul des workers gunicorn lance les tâches de fond)
+    """
+    if multiprocessing.parent_process() is not None:
+        return False
+    if use_reloader and os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        return False
+
+    from .service_lock import acquire_service_lock
+    return acquire_service_lock('services')
+
+def create_app(start_services: bool = None):
+    """
+    Factory pour créer l'application Flask
+    start_services : pool de sentiment et tâches de fond (collecte sociale,
+    planificateur des flux, deltas live, instantanés) ; par défaut
+    should_start_services()
+    """
+    if start_services is None:
+        start_services = should_start_services()
     
     # Obtenir le chemin absolu du répertoire racine
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -26,8 +49,18 @@ def create_app():
                 template_folder=template_dir,
                 static_folder=static_dir)
     
+    # Sérialisation JSON rapide et compression des réponses
+    from .response_layer import init_response_layer
+    init_response_layer(app)
+
+    # Profilage à la demande (PROFILING_ENABLED : en-tête X-Profile)
+    from .profiling import init_profiling
+    init_profiling(app)
+    
     # Configuration
-    from .config import DB_PATH
+    from .config import (DB_PATH, SENTIMENT_WARMUP, SENTIMENT_WORKERS,
+                         SOCIAL_COLLECTOR_ENABLED, ARCHIVE_SNAPSHOTS_ENABLED,
+                         FEED_SCHEDULER_ENABLED, LIVE_UPDATES_ENABLED)
     app.config['DATABASE_PATH'] = DB_PATH
     
     # Initialisation des managers
@@ -41,10 +74,12 @@ def create_app():
     from .database_migrations import run_migrations
     from .social_aggregator import get_social_aggregator
     from .social_comparator import get_social_comparator
+    from .social_collector import get_social_collector
     from .routes_social import register_social_routes
     from .archiviste import get_archiviste
     from .routes_archiviste import register_archiviste_routes
     from .anomaly_detector import AnomalyDetector
+    from .feed_scheduler import get_feed_scheduler
 
     db_manager = DatabaseManager()
     
@@ -59,17 +94,63 @@ def create_app():
     corroboration_engine = CorroborationEngine()
     social_aggregator = get_social_aggregator(db_manager)
     social_comparator = get_social_comparator(db_manager)             
+    social_collector = get_social_collector(db_manager)
     archiviste = get_archiviste(db_manager)
     anomaly_detector = AnomalyDetector(db_manager)
+    feed_scheduler = get_feed_scheduler(db_manager, rss_manager)
+
+    if start_services:
+        # Démarrage du pool de scoring (chaque worker précharge VADER),
+        # ou préchargement local si le scoring reste dans ce processus
+        if SENTIMENT_WORKERS:
+            from .sentiment_service import get_sentiment_service
+            get_sentiment_service().start()
+        elif SENTIMENT_WARMUP:
+            from .model_registry import get_model_registry
+            get_model_registry().warm_up()
+
+        # Collecte sociale en arrière-plan : les pages lisent le stockage local
+        if SOCIAL_COLLECTOR_ENABLED:
+            social_collector.start()
+
+        # Deltas du dashboard poussés en SSE après chaque ingestion
+        if LIVE_UPDATES_ENABLED:
+            from .live_updates import get_dashboard_publisher
+            get_dashboard_publisher(db_manager).start()
+
+        # Rafraîchissement adaptatif des flux RSS (sinon : python -m Flask.feed_scheduler),
+        # sauf si un planificateur séparé tient déjà le verrou
+        from .service_lock import acquire_service_lock
+        if FEED_SCHEDULER_ENABLED and acquire_service_lock('feed_scheduler'):
+            feed_scheduler.start()
+
+        # Instantanés des périodes historiques calculés en arrière-plan
+        if ARCHIVE_SNAPSHOTS_ENABLED:
+            archiviste.snapshots.start()
+    else:
+        logging.getLogger(__name__).info("⏸️ Services de fond non démarrés dans ce processus")
+
+    # Jauges /metrics : files d'attente et abonnés, lues à la collecte
+    from .metrics import register_runtime_gauges
+    from .sentiment_service import get_sentiment_service
+    from .live_updates import get_event_bus
+    register_runtime_gauges(
+        sentiment_service=get_sentiment_service(),
+        feed_scheduler=feed_scheduler,
+        archiviste=archiviste,
+        event_bus=get_event_bus()
+    )
 
     # Enregistrement des routes
     from .routes import register_routes
     from .routes_advanced import register_advanced_routes
+    from .routes_profiling import register_profiling_routes
 
     # CORRECTION : Passer anomaly_detector aux routes principales
     register_routes(app, db_manager, theme_manager, theme_analyzer, rss_manager, advanced_theme_manager, anomaly_detector)
     register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_engine)
     register_social_routes(app, db_manager)
     register_archiviste_routes(app, db_manager)
+    register_profiling_routes(app)
 
     return app
\ No newline at end of file
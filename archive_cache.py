@@ -0,0 +1,138 @@
+# Flask/archive_cache.py
+"""
+Cache disque des recherches Archive.org
+Stocké en SQLite : survit aux redémarrages, borné en taille (éviction LRU)
+et servi même expiré pendant qu'une mise à jour est faite en arrière-plan
+(stale-while-revalidate)
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Optional, Tuple
+from .database import DatabaseManager
+from .config import ARCHIVE_CACHE_MAX_BYTES
+from .metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+FRESH = 'fresh'
+STALE = 'stale'
+
+
+class ArchiveCache:
+    """
+    Cache clé → JSON avec TTL par entrée
+
+    Les entrées expirées ne sont pas supprimées : elles sont retournées
+    avec l'état STALE pour que l'appelant les serve et les rafraîchisse.
+    Seule la limite de taille (max_bytes) retire des entrées, les moins
+    récemment lues d'abord.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, max_bytes: int = ARCHIVE_CACHE_MAX_BYTES):
+        self.db_manager = db_manager
+        self.max_bytes = max_bytes
+        self._write_lock = threading.Lock()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: str) -> Tuple[Optional[Any], Optional[str]]:
+        """Retourne (valeur, FRESH|STALE) ou (None, None) si absente"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                "SELECT payload, expires_at FROM archive_cache WHERE cache_key = ?",
+                (key,)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                CACHE_REQUESTS.inc(cache='archive', result='miss')
+                return None, None
+
+            now = time.time()
+            cursor.execute(
+                "UPDATE archive_cache SET last_access = ? WHERE cache_key = ?",
+                (now, key)
+            )
+            conn.commit()
+
+            state = FRESH if now < row[1] else STALE
+            self.stats['hits' if state == FRESH else 'stale_hits'] += 1
+            CACHE_REQUESTS.inc(cache='archive', result='hit' if state == FRESH else 'stale')
+            return json.loads(row[0]), state
+
+        except Exception as e:
+            logger.error(f"Erreur lecture cache archive: {e}")
+            return None, None
+        finally:
+            conn.close()
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Enregistre une valeur puis applique la limite de taille"""
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+
+        with self._write_lock:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute("""
+                    INSERT OR REPLACE INTO archive_cache
+                    (cache_key, payload, size_bytes, created_at, expires_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (key, payload, len(payload.encode('utf-8')), now, now + ttl, now))
+
+                self._evict(cursor)
+                conn.commit()
+
+            except Exception as e:
+                logger.error(f"Erreur écriture cache archive: {e}")
+                conn.rollback()
+            finally:
+                conn.close()
+
+    def _evict(self, cursor):
+        """Supprime les entrées les moins récemment lues au-delà de max_bytes"""
+        cursor.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM archive_cache")
+        excess = cursor.fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+
+        cursor.execute("SELECT cache_key, size_bytes FROM archive_cache ORDER BY last_access ASC")
+        victims = []
+        for cache_key, size in cursor.fetchall():
+            if excess <= 0:
+                break
+            victims.append((cache_key,))
+            excess -= size
+
+        cursor.executemany("DELETE FROM archive_cache WHERE cache_key = ?", victims)
+        self.stats['evictions'] += len(victims)
+        logger.info(f"🧹 Cache archive: {len(victims)} entrées évincées (LRU)")
+
+    def get_stats(self) -> dict:
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT COUNT(*), COALESCE(SUM(size_bytes), 0),
+                       COUNT(CASE WHEN expires_at < ? THEN 1 END)
+                FROM archive_cache
+            """, (time.time(),))
+            entries, size_bytes, stale = cursor.fetchone()
+        finally:
+            conn.close()
+
+        return {
+            **self.stats,
+            'entries': entries,
+            'stale_entries': stale,
+            'size_bytes': size_bytes,
+            'max_bytes': self.max_bytes
+        }
@@ -0,0 +1,178 @@
+# Flask/archive_snapshots.py
+"""
+Instantanés des analyses historiques par (période, thème)
+Chaque analyse est calculée une fois par une tâche de fond puis réutilisée
+par les comparaisons : /api/archiviste/compare-eras devient une lecture.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from .database import DatabaseManager
+from .profiling import profile_job
+from .config import ARCHIVE_SNAPSHOT_MAX_AGE, ARCHIVE_SNAPSHOT_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """
+    Stockage et rafraîchissement des instantanés de périodes historiques
+    """
+
+    def __init__(self, db_manager: DatabaseManager, archiviste,
+                 max_age: float = ARCHIVE_SNAPSHOT_MAX_AGE,
+                 interval: float = ARCHIVE_SNAPSHOT_INTERVAL):
+        self.db_manager = db_manager
+        self.archiviste = archiviste
+        self.max_age = max_age
+        self.interval = interval
+        self._thread = None
+        self._refresh_lock = threading.Lock()
+        self.last_refresh = None
+
+    def get(self, period_keys: List[str], theme: str = None) -> Dict[str, Dict[str, Any]]:
+        """Instantanés existants des périodes demandées (même périmés)"""
+        if not period_keys:
+            return {}
+
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            placeholders = ','.join('?' * len(period_keys))
+            cursor.execute(f"""
+                SELECT period_key, analysis, computed_at
+                FROM period_snapshots
+                WHERE theme = ? AND period_key IN ({placeholders})
+            """, [theme or ''] + list(period_keys))
+
+            snapshots = {}
+            for period_key, analysis, computed_at in cursor.fetchall():
+                snapshot = json.loads(analysis)
+                snapshot['computed_at'] = computed_at
+                snapshots[period_key] = snapshot
+            return snapshots
+
+        finally:
+            conn.close()
+
+    def save(self, period_key: str, theme: Optional[str], analysis: Dict[str, Any]):
+        stats = analysis.get('statistics', {})
+        dist = stats.get('sentiment_distribution', {})
+
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                INSERT OR REPLACE INTO period_snapshots
+                (period_key, theme, analysis, items_analyzed, avg_sentiment,
+                 positive_percent, negative_percent, neutral_percent,
+                 emotional_intensity, computed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                period_key,
+                theme or '',
+                json.dumps(analysis, ensure_ascii=False, default=str),
+                analysis.get('items_analyzed', 0),
+                stats.get('average_sentiment_score', 0.0),
+                dist.get('positive_percent', 0.0),
+                dist.get('negative_percent', 0.0),
+                dist.get('neutral_percent', 0.0),
+                stats.get('emotional_intensity', 'neutral'),
+                time.time()
+            ))
+            conn.commit()
+
+        except Exception as e:
+            logger.error(f"Erreur sauvegarde instantané {period_key}: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def compute(self, period_keys: List[str], theme: str = None) -> Dict[str, Dict[str, Any]]:
+        """Calcule (fetch en pipeline, scoring en parallèle) et enregistre"""
+        results = self.archiviste.analyze_historical_periods(period_keys, theme)
+
+        snapshots = {}
+        for period_key, result in results.items():
+            if result.get('success'):
+                self.save(period_key, theme, result)
+                snapshots[period_key] = {**result, 'computed_at': time.time()}
+        return snapshots
+
+    def get_or_compute(self, period_keys: List[str], theme: str = None) -> Dict[str, Dict[str, Any]]:
+        """Lecture des instantanés ; seules les périodes jamais calculées le sont ici"""
+        snapshots = self.get(period_keys, theme)
+        missing = [key for key in period_keys if key not in snapshots]
+        if missing:
+            logger.info(f"📸 Instantanés manquants, calcul: {missing}")
+            snapshots.update(self.compute(missing, theme))
+        return snapshots
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Recalcule les instantanés absents ou plus vieux que max_age pour
+        toutes les périodes, sans thème puis pour chaque thème
+        """
+        with self._refresh_lock:
+            period_keys = list(self.archiviste.historical_periods)
+            refreshed = 0
+
+            for theme in [None] + list(self.archiviste.historical_themes):
+                existing = self.get(period_keys, theme)
+                due = [
+                    key for key in period_keys
+                    if force or key not in existing
+                    or time.time() - existing[key]['computed_at'] > self.max_age
+                ]
+                if due:
+                    refreshed += len(self.compute(due, theme))
+
+            self.last_refresh = time.time()
+            logger.info(f"📸 Instantanés historiques rafraîchis: {refreshed}")
+            return refreshed
+
+    def start(self):
+        """Tâche de fond : rafraîchissement périodique des instantanés"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while True:
+                try:
+                    with profile_job('archive_snapshots'):
+                        self.refresh()
+                except Exception as e:
+                    logger.error(f"❌ Erreur rafraîchissement instantanés: {e}")
+                time.sleep(self.interval)
+
+        self._thread = threading.Thread(target=run, name='archive-snapshots')
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info("✅ Tâche des instantanés historiques démarrée")
+
+    def get_status(self) -> Dict[str, Any]:
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT COUNT(*), MIN(computed_at), MAX(computed_at)
+                FROM period_snapshots
+            """)
+            count, oldest, newest = cursor.fetchone()
+        finally:
+            conn.close()
+
+        return {
+            'snapshots': count,
+            'oldest_computed_at': oldest,
+            'newest_computed_at': newest,
+            'last_refresh': self.last_refresh,
+            'max_age': self.max_age,
+            'refreshing': self._refresh_lock.locked()
+        }
@@ -430,14 +430,25 @@ class ArchivisteManager {
         resultsDiv.innerHTML = '<div class="text-center py-4"><i class="fas fa-spinner fa-spin text-red-600 text-xl"></i></div>';
 
         try {
-            const response = await fetch('/api/archiviste/trends-evolution');
-            const data = await response.json();
+            // L'endpoint est paginé : on suit next_before jusqu'à la dernière page
+            const trends = [];
+            let before = null;
 
-            if (data.success) {
-                this.displayTrendsEvolution(data.trends, resultsDiv);
-            } else {
-                this.showError(resultsDiv, data.error || 'Erreur lors du chargement des tendances');
-            }
+            do {
+                const url = '/api/archiviste/trends-evolution?limit=100' + (before ? `&before=${before}` : '');
+                const response = await fetch(url);
+                const data = await response.json();
+
+                if (!data.success) {
+                    this.showError(resultsDiv, data.error || 'Erreur lors du chargement des tendances');
+                    return;
+                }
+
+                trends.push(...data.trends);
+                before = data.pagination && data.pagination.has_more ? data.pagination.next_before : null;
+            } while (before);
+
+            this.displayTrendsEvolution(trends, resultsDiv);
 
         } catch (error) {
             this.showError(resultsDiv, 'Erreur réseau: ' + error.message);
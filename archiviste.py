@@ -9,12 +9,19 @@ import logging
 import json
 import re
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from functools import lru_cache
 from .database import DatabaseManager
-from .sentiment_analyzer import SentimentAnalyzer
+from .sentiment_service import get_sentiment_service
 from .theme_analyzer import ThemeAnalyzer
+from .http_client import HttpClient, RetryPolicy, TokenBucket, RateLimitedExecutor, get_http_client
+from .archive_cache import ArchiveCache, FRESH, STALE
+from .archive_snapshots import SnapshotStore
+from .config import (ARCHIVE_CACHE_TTL, ARCHIVE_CACHE_HISTORICAL_TTL,
+                     ARCHIVE_FETCH_WORKERS, ARCHIVE_ANALYSIS_WORKERS)
 
 logger = logging.getLogger(__name__)
 
@@ -23,24 +30,36 @@ class Archiviste:
     Archiviste pour l'analyse historique avec rate limiting
     """
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, http_client: HttpClient = None):
         self.db_manager = db_manager
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment_analyzer = get_sentiment_service()
         self.theme_analyzer = ThemeAnalyzer(db_manager)
+        self.http = http_client or get_http_client()
         
-        # Rate limiting pour Archive.org
-        self.last_request_time = 0
+        # Rate limiting pour Archive.org : seau à jetons partagé par tous les
+        # threads, requêtes servies par une file et des workers dédiés
         self.min_request_interval = 2.0  # 2 secondes entre requêtes
+        self.rate_limiter = TokenBucket(rate=1.0 / self.min_request_interval, capacity=1)
+        self.fetch_queue = RateLimitedExecutor(
+            self.rate_limiter,
+            max_workers=ARCHIVE_FETCH_WORKERS,
+            thread_name_prefix='archive-fetch'
+        )
         self.max_retries = 3
         self.request_timeout = 30
+        self.retry_policy = RetryPolicy(max_attempts=self.max_retries, backoff_base=1.0)
         
         # Configuration Archive.org
         self.archive_base_url = "https://archive.org/advancedsearch.php"
         
-        # Cache des résultats (expire après 1 heure)
-        self._cache = {}
-        self._cache_expiry = {}
-        self.cache_duration = 3600  # 1 heure
+        # Cache disque des résultats (LRU borné, servi expiré pendant le rafraîchissement)
+        self.cache = ArchiveCache(db_manager)
+        
+        # Analyses de périodes en parallèle et instantanés réutilisés par les comparaisons
+        self._analysis_executor = ThreadPoolExecutor(
+            max_workers=ARCHIVE_ANALYSIS_WORKERS, thread_name_prefix='archive-analysis'
+        )
+        self.snapshots = SnapshotStore(db_manager, self)
         
         # Collections d'archives
         self.collections = [
@@ -79,40 +98,73 @@ class Archiviste:
             'politique': ['politique', 'politics', 'élection', 'election', 'gouvernement', 'government']
         }
     
-    def _throttle_request(self):
-        """Applique un délai entre requêtes pour respecter le rate limiting"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            sleep_time = self.min_request_interval - elapsed
-            logger.debug(f"⏳ Throttling: pause de {sleep_time:.2f}s")
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
-    
-    def _get_cache_key(self, query: str, collection: str, start_date: str, end_date: str) -> str:
+    def _get_cache_key(self, query: str, collection: str, start_date: str, end_date: str,
+                       limit: int) -> str:
         """Génère une clé de cache unique"""
-        return f"{collection}:{query}:{start_date}:{end_date}"
+        return f"{collection}:{query}:{start_date}:{end_date}:{limit}"
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Vérifie si le cache est encore valide"""
-        if cache_key not in self._cache_expiry:
-            return False
-        return time.time() < self._cache_expiry[cache_key]
+    def _cache_ttl(self, end_date: Optional[str]) -> float:
+        """Les périodes closes ne changent presque plus : TTL long"""
+        if end_date and end_date[:4].isdigit() and int(end_date[:4]) < datetime.now().year:
+            return ARCHIVE_CACHE_HISTORICAL_TTL
+        return ARCHIVE_CACHE_TTL
     
     def search_archive_collection(self, query: str, collection: str = 'newspapers', 
                                 start_date: str = None, end_date: str = None,
                                 limit: int = 50) -> List[Dict[str, Any]]:
         """
-        Recherche dans Archive.org avec cache et rate limiting
+        Recherche dans Archive.org avec cache disque et rate limiting
+        Une entrée expirée est servie immédiatement et rafraîchie en arrière-plan
+        """
+        return self.search_archive_collection_async(
+            query, collection, start_date, end_date, limit
+        ).result()
+    
+    def search_archive_collection_async(self, query: str, collection: str = 'newspapers',
+                                        start_date: str = None, end_date: str = None,
+                                        limit: int = 50) -> Future:
+        """
+        Version non bloquante : retourne un Future résolu avec les items
+        Les requêtes réseau passent par la file limitée (fetch_queue)
         """
-        # Vérifier le cache
-        cache_key = self._get_cache_key(query, collection, start_date or '', end_date or '')
-        if self._is_cache_valid(cache_key):
+        cache_key = self._get_cache_key(query, collection, start_date or '', end_date or '', limit)
+        items, state = self.cache.get(cache_key)
+        
+        if state == FRESH:
             logger.info(f"📦 Cache hit pour: {cache_key}")
-            return self._cache[cache_key]
+            return self._resolved(items)
         
-        # Throttling avant la requête
-        self._throttle_request()
+        args = (cache_key, query, collection, start_date, end_date, limit)
         
+        if state == STALE:
+            logger.info(f"📦 Cache expiré servi, rafraîchissement: {cache_key}")
+            self.fetch_queue.submit(self._fetch_and_store, *args, key=cache_key)
+            return self._resolved(items)
+        
+        return self.fetch_queue.submit(self._fetch_and_store, *args, key=cache_key)
+    
+    def _resolved(self, items: List[Dict[str, Any]]) -> Future:
+        future = Future()
+        future.set_result(items)
+        return future
+    
+    def _fetch_and_store(self, cache_key: str, query: str, collection: str,
+                         start_date: Optional[str], end_date: Optional[str],
+                         limit: int) -> List[Dict[str, Any]]:
+        """Exécuté par un worker de la file : requête puis mise en cache"""
+        items = self._fetch_archive(query, collection, start_date, end_date, limit)
+        if items is None:
+            return []
+        
+        self.cache.set(cache_key, items, self._cache_ttl(end_date))
+        return items
+    
+    def _fetch_archive(self, query: str, collection: str, start_date: Optional[str],
+                       end_date: Optional[str], limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Interroge Archive.org (retry ; le débit est limité par fetch_queue)
+        Retourne None en cas d'échec pour ne pas mettre d'erreur en cache
+        """
         # Construction de la requête
         search_query = f'collection:({collection})'
         if query:
@@ -131,41 +183,32 @@ class Archiviste:
         
         logger.info(f"🔍 Archive.org: {search_query[:100]}...")
         
-        # Tentatives avec retry
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.get(
-                    self.archive_base_url, 
-                    params=params, 
-                    timeout=self.request_timeout,
-                    headers={'User-Agent': 'GEOPOL-Research/2.2'}
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                items = data.get('response', {}).get('docs', [])
-                
-                # Mise en cache
-                self._cache[cache_key] = items
-                self._cache_expiry[cache_key] = time.time() + self.cache_duration
-                
-                logger.info(f"✅ Archive.org: {len(items)} items trouvés")
-                return items
-                
-            except requests.Timeout:
-                logger.warning(f"⏱️ Timeout tentative {attempt + 1}/{self.max_retries}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)  # Backoff exponentiel
-            except requests.RequestException as e:
-                logger.error(f"❌ Erreur Archive.org (tentative {attempt + 1}): {e}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
-            except Exception as e:
-                logger.error(f"❌ Erreur inattendue: {e}")
-                break
+        # Tentatives avec retry (backoff exponentiel géré par la politique)
+        try:
+            response = self.http.get(
+                self.archive_base_url, 
+                params=params, 
+                timeout=self.request_timeout,
+                headers={'User-Agent': 'GEOPOL-Research/2.2'},
+                retry=self.retry_policy
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            items = data.get('response', {}).get('docs', [])
+            
+            logger.info(f"✅ Archive.org: {len(items)} items trouvés")
+            return items
+            
+        except requests.Timeout:
+            logger.warning(f"⏱️ Timeout après {self.max_retries} tentatives")
+        except requests.RequestException as e:
+            logger.error(f"❌ Erreur Archive.org: {e}")
+        except Exception as e:
+            logger.error(f"❌ Erreur inattendue: {e}")
         
         logger.error("❌ Échec après toutes les tentatives")
-        return []
+        return None
     
     def extract_text_from_archive(self, item: Dict[str, Any]) -> str:
         """
@@ -188,16 +231,19 @@ class Archiviste:
             logger.debug(f"Erreur extraction texte: {e}")
             return item.get('title', '') or item.get('description', '')
     
-    def analyze_historical_content(self, text: str, year: int) -> Dict[str, Any]:
+    def analyze_historical_content(self, text: str, year: int,
+                                   sentiment: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Analyse le contenu historique avec gestion d'erreurs
+        sentiment permet de fournir un score déjà calculé par lot
         """
         if not text or len(text) < 50:
             return self._get_default_analysis(year)
         
         try:
             # Analyse de sentiment
-            sentiment = self.sentiment_analyzer.analyze_sentiment(text)
+            if sentiment is None:
+                sentiment = self.sentiment_analyzer.analyze_sentiment(text)
             
             # Analyse thématique
             themes = self.theme_analyzer.analyze_article(text, text[:100])
@@ -254,6 +300,25 @@ class Archiviste:
         
         return events[:5]
     
+    def _period_search_query(self, theme: str = None) -> str:
+        """Requête Archive.org d'un thème (ou requête générale)"""
+        if theme and theme in self.historical_themes:
+            keywords = ' OR '.join(self.historical_themes[theme][:5])  # Limite mots-clés
+            return f'({keywords})'
+        return 'geopolitics OR international OR history'
+    
+    def _fetch_period_items(self, period_key: str, theme: str = None,
+                            max_items: int = 100) -> Future:
+        """Lance (sans attendre) la recherche d'archives d'une période"""
+        period = self.historical_periods[period_key]
+        return self.search_archive_collection_async(
+            query=self._period_search_query(theme),
+            collection='newspapers',
+            start_date=period['start'],
+            end_date=period['end'],
+            limit=max_items
+        )
+    
     def analyze_historical_period(self, period_key: str, theme: str = None, 
                                 max_items: int = 100) -> Dict[str, Any]:
         """
@@ -267,27 +332,62 @@ class Archiviste:
                     'available_periods': list(self.historical_periods.keys())
                 }
             
+            items = self._fetch_period_items(period_key, theme, max_items).result()
+            return self._analyze_period_items(period_key, theme, items, max_items)
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur analyse période: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def analyze_historical_periods(self, period_keys: List[str], theme: str = None,
+                                   max_items: int = 100) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyse plusieurs périodes en pipeline : toutes les recherches sont
+        mises en file d'un coup (débit partagé), et chaque période est
+        analysée dès que ses archives arrivent (analyses en parallèle),
+        pendant que les suivantes sont encore en cours de téléchargement
+        """
+        results = {}
+        futures = {}
+        
+        for period_key in period_keys:
+            if period_key not in self.historical_periods:
+                results[period_key] = {
+                    'success': False,
+                    'error': f'Période inconnue: {period_key}',
+                    'available_periods': list(self.historical_periods.keys())
+                }
+                continue
+            futures[self._fetch_period_items(period_key, theme, max_items)] = period_key
+        
+        # Chaque période est analysée dès l'arrivée de ses archives, en parallèle
+        analyses = {}
+        for future in as_completed(futures):
+            period_key = futures[future]
+            try:
+                analyses[self._analysis_executor.submit(
+                    self._analyze_period_items, period_key, theme, future.result(), max_items
+                )] = period_key
+            except Exception as e:
+                logger.error(f"❌ Erreur analyse période {period_key}: {e}")
+                results[period_key] = {'success': False, 'error': str(e)}
+        
+        for future in as_completed(analyses):
+            results[analyses[future]] = future.result()
+        
+        return results
+    
+    def _analyze_period_items(self, period_key: str, theme: Optional[str],
+                              items: List[Dict[str, Any]], max_items: int) -> Dict[str, Any]:
+        """Analyse (sentiment, thèmes, statistiques) des archives d'une période"""
+        try:
             period = self.historical_periods[period_key]
             start_date = period['start']
-            end_date = period['end']
-            
-            logger.info(f"📚 Analyse: {period['name']} ({start_date} à {end_date})")
-            
-            # Construction de la requête
-            if theme and theme in self.historical_themes:
-                keywords = ' OR '.join(self.historical_themes[theme][:5])  # Limite mots-clés
-                search_query = f'({keywords})'
-            else:
-                search_query = 'geopolitics OR international OR history'
-            
-            # Recherche dans les archives
-            items = self.search_archive_collection(
-                query=search_query,
-                collection='newspapers',
-                start_date=start_date,
-                end_date=end_date,
-                limit=max_items
-            )
+            
+            logger.info(f"📚 Analyse: {period['name']} ({start_date} à {period['end']})")
             
             if not items:
                 return {
@@ -297,20 +397,30 @@ class Archiviste:
                     'theme': theme
                 }
             
+            # Extraction des textes puis scoring de sentiment en un seul lot
+            texts = []
+            for i, item in enumerate(items[:max_items]):
+                try:
+                    texts.append((item, self.extract_text_from_archive(item)))
+                except Exception as e:
+                    logger.debug(f"Erreur item {i}: {e}")
+            texts = [(item, text) for item, text in texts if text]
+            
+            scorable = [text for _, text in texts if len(text) >= 50]
+            scores = dict(zip(scorable, self.sentiment_analyzer.analyze_many(scorable)))
+            
             # Analyse du contenu
             analyzed_items = []
-            for i, item in enumerate(items[:max_items]):
+            year = int(start_date[:4])
+            for i, (item, text) in enumerate(texts):
                 try:
-                    text = self.extract_text_from_archive(item)
-                    if text:
-                        year = int(start_date[:4])
-                        analysis = self.analyze_historical_content(text, year)
-                        enriched_item = {
-                            **item,
-                            **analysis,
-                            'period': period['name']
-                        }
-                        analyzed_items.append(enriched_item)
+                    analysis = self.analyze_historical_content(text, year, scores.get(text))
+                    enriched_item = {
+                        **item,
+                        **analysis,
+                        'period': period['name']
+                    }
+                    analyzed_items.append(enriched_item)
                 except Exception as e:
                     logger.debug(f"Erreur item {i}: {e}")
                     continue
@@ -328,6 +438,7 @@ class Archiviste:
             
             result = {
                 'success': True,
+                'period_key': period_key,
                 'period': period,
                 'theme': theme,
                 'items_analyzed': len(analyzed_items),
@@ -452,30 +563,15 @@ class Archiviste:
         cursor = conn.cursor()
         
         try:
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS historical_analyses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    period_key TEXT,
-                    period_name TEXT,
-                    theme TEXT,
-                    total_items INTEGER,
-                    avg_sentiment_score REAL,
-                    emotional_intensity TEXT,
-                    top_themes TEXT,
-                    top_events TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
             cursor.execute("""
                 INSERT INTO historical_analyses 
                 (period_key, period_name, theme, total_items, avg_sentiment_score, 
                  emotional_intensity, top_themes, top_events)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (
-                analysis['period'].get('key', ''),
+                analysis.get('period_key') or analysis['period'].get('key', ''),
                 analysis['period'].get('name', ''),
-                analysis.get('theme', ''),
+                analysis.get('theme') or '',
                 analysis.get('items_analyzed', 0),
                 analysis.get('statistics', {}).get('average_sentiment_score', 0),
                 analysis.get('statistics', {}).get('emotional_intensity', ''),
@@ -494,22 +590,21 @@ class Archiviste:
     
     def compare_current_vs_historical(self, current_analysis: Dict, 
                                      historical_periods: List[str] = None) -> Dict[str, Any]:
-        """Compare l'analyse actuelle avec les périodes historiques"""
+        """
+        Compare l'analyse actuelle avec les périodes historiques
+        Les périodes proviennent des instantanés précalculés ; seules celles
+        qui n'ont jamais été calculées sont analysées ici
+        """
         try:
             if historical_periods is None:
                 historical_periods = ['1990-2000', '2000-2010', '2010-2020', '2020-2025']
             
-            comparisons = []
-            
-            for period_key in historical_periods:
-                historical = self.analyze_historical_period(period_key)
-                
-                if not historical.get('success'):
-                    continue
-                
-                comparison = self._compare_periods(current_analysis, historical, period_key)
-                comparisons.append(comparison)
+            snapshots = self.snapshots.get_or_compute(historical_periods)
+            available = [key for key in historical_periods if key in snapshots]
             
+            comparisons = self._compare_snapshots(
+                current_analysis, [snapshots[key] for key in available], available
+            )
             synthesis = self._synthesize_comparisons(comparisons)
             
             return {
@@ -517,89 +612,73 @@ class Archiviste:
                 'current_analysis': current_analysis,
                 'comparisons': comparisons,
                 'synthesis': synthesis,
-                'historical_periods_analyzed': len(comparisons)
+                'historical_periods_analyzed': len(comparisons),
+                'snapshots_computed_at': {key: snapshots[key].get('computed_at') for key in available}
             }
             
         except Exception as e:
             logger.error(f"❌ Erreur comparaison: {e}")
             return {'success': False, 'error': str(e)}
     
-    def _compare_periods(self, current: Dict, historical: Dict, period_key: str) -> Dict[str, Any]:
-        """Compare deux périodes"""
-        try:
-            current_stats = current.get('statistics', {})
-            historical_stats = historical.get('statistics', {})
-            
-            current_sentiment = current_stats.get('average_sentiment_score', 0)
-            historical_sentiment = historical_stats.get('average_sentiment_score', 0)
-            sentiment_diff = current_sentiment - historical_sentiment
-            
-            evolution_type = self._classify_evolution(
-                sentiment_diff,
-                current_stats.get('emotional_intensity', 'neutral'),
-                historical_stats.get('emotional_intensity', 'neutral')
-            )
-            
-            return {
+    def _compare_snapshots(self, current: Dict, historicals: List[Dict],
+                           period_keys: List[str]) -> List[Dict[str, Any]]:
+        """
+        Compare l'analyse actuelle à toutes les périodes en une fois
+        (écart de sentiment, type d'évolution et similarité des
+        distributions, calculés sur des tableaux)
+        """
+        if not historicals:
+            return []
+        
+        percent_keys = ('positive_percent', 'negative_percent', 'neutral_percent')
+        current_stats = current.get('statistics', {})
+        current_dist = current_stats.get('sentiment_distribution', {})
+        current_sentiment = current_stats.get('average_sentiment_score', 0)
+        current_intensity = current_stats.get('emotional_intensity', 'neutral')
+        
+        stats = [h.get('statistics', {}) for h in historicals]
+        historical_sentiment = np.array([s.get('average_sentiment_score', 0) for s in stats], dtype=float)
+        historical_percents = np.array([
+            [s.get('sentiment_distribution', {}).get(k, 0) for k in percent_keys] for s in stats
+        ], dtype=float)
+        current_percents = np.array([current_dist.get(k, 0) for k in percent_keys], dtype=float)
+        intensity_changed = np.array([
+            s.get('emotional_intensity', 'neutral') != current_intensity for s in stats
+        ])
+        
+        diffs = current_sentiment - historical_sentiment
+        abs_diffs = np.abs(diffs)
+        
+        evolution = np.select(
+            [abs_diffs > 0.3, abs_diffs > 0.15, intensity_changed],
+            ['major_shift', 'moderate_change', 'intensity_change'],
+            default='stable'
+        )
+        interpretation = np.select(
+            [diffs > 0.3, diffs > 0.15, diffs < -0.3, diffs < -0.15],
+            ['Sentiment notablement plus positif', 'Sentiment légèrement plus positif',
+             'Sentiment notablement plus négatif', 'Sentiment légèrement plus négatif'],
+            default='Sentiment similaire'
+        )
+        similarity = np.clip(
+            1 - np.abs(historical_percents - current_percents).mean(axis=1) / 100, 0, 1
+        )
+        
+        return [
+            {
                 'period_key': period_key,
-                'period_name': historical_stats.get('period_key', period_key),
+                'period_name': stat.get('period_key', period_key),
                 'sentiment_comparison': {
                     'current': current_sentiment,
-                    'historical': historical_sentiment,
-                    'difference': round(sentiment_diff, 4),
-                    'interpretation': self._interpret_sentiment_change(sentiment_diff)
+                    'historical': float(historical_sentiment[i]),
+                    'difference': round(float(diffs[i]), 4),
+                    'interpretation': str(interpretation[i])
                 },
-                'evolution_type': evolution_type,
-                'similarity_score': self._calculate_similarity_score(current_stats, historical_stats)
+                'evolution_type': str(evolution[i]),
+                'similarity_score': round(float(similarity[i]), 3)
             }
-            
-        except Exception as e:
-            logger.error(f"Erreur comparaison: {e}")
-            return {'period_key': period_key, 'error': str(e)}
-    
-    def _classify_evolution(self, sentiment_diff: float, current_intensity: str, 
-                          historical_intensity: str) -> str:
-        """Classifie le type d'évolution"""
-        if abs(sentiment_diff) > 0.3:
-            return "major_shift"
-        elif abs(sentiment_diff) > 0.15:
-            return "moderate_change"
-        elif current_intensity != historical_intensity:
-            return "intensity_change"
-        else:
-            return "stable"
-    
-    def _interpret_sentiment_change(self, sentiment_diff: float) -> str:
-        """Interprète le changement de sentiment"""
-        if sentiment_diff > 0.3:
-            return "Sentiment notablement plus positif"
-        elif sentiment_diff > 0.15:
-            return "Sentiment légèrement plus positif"
-        elif sentiment_diff < -0.3:
-            return "Sentiment notablement plus négatif"
-        elif sentiment_diff < -0.15:
-            return "Sentiment légèrement plus négatif"
-        else:
-            return "Sentiment similaire"
-    
-    def _calculate_similarity_score(self, current_stats: Dict, historical_stats: Dict) -> float:
-        """Calcule un score de similarité"""
-        try:
-            current_dist = current_stats.get('sentiment_distribution', {})
-            historical_dist = historical_stats.get('sentiment_distribution', {})
-            
-            sentiment_diff = (
-                abs(current_dist.get('positive_percent', 0) - historical_dist.get('positive_percent', 0)) +
-                abs(current_dist.get('negative_percent', 0) - historical_dist.get('negative_percent', 0)) +
-                abs(current_dist.get('neutral_percent', 0) - historical_dist.get('neutral_percent', 0))
-            ) / 3
-            
-            similarity_score = 1 - (sentiment_diff / 100)
-            return round(max(0, min(1, similarity_score)), 3)
-            
-        except Exception as e:
-            logger.debug(f"Erreur calcul similarité: {e}")
-            return 0.0
+            for i, (period_key, stat) in enumerate(zip(period_keys, stats))
+        ]
     
     def _synthesize_comparisons(self, comparisons: List[Dict]) -> Dict[str, Any]:
         """Synthétise les comparaisons multiples"""
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Corpus synthétique déterministe pour les benchmarks
+Articles géopolitiques français et anglais, répartis sur les thèmes par
+défaut et sur des flux de tailles inégales (loi de Zipf), plus un serveur
+RSS local qui sert ces articles sans accès réseau.
+
+Même graine → même corpus : les résultats sont comparables d'un commit à l'autre.
+"""
+
+import sys
+import os
+import json
+import random
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from email.utils import format_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from xml.sax.saxutils import escape
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Flask.config import DEFAULT_THEMES
+
+DEFAULT_SEED = 42
+FEED_COUNT = 200
+DAYS_SPAN = 365
+
+LEXICON = {
+    'fr': {
+        'subjects': ["Le gouvernement", "La Commission européenne", "Le ministre des affaires étrangères",
+                     "L'ONU", "Le président", "Les négociateurs", "L'opposition", "La banque centrale",
+                     "Les experts", "Le parlement"],
+        'verbs': ["annonce", "dénonce", "prépare", "rejette", "soutient", "examine", "critique", "salue"],
+        'objects': ["un accord de cessez-le-feu", "de nouvelles sanctions", "un plan de relance",
+                    "une réforme des retraites", "un sommet international", "une hausse des taux",
+                    "un programme de vaccination", "une loi sur le climat"],
+        'places': ["à Paris", "à Bruxelles", "à Genève", "à Kiev", "à Pékin", "à Washington", "à Dakar", "à Berlin"],
+        'positive': ["un succès remarquable", "une excellente nouvelle", "un progrès encourageant", "une victoire"],
+        'negative': ["une crise grave", "un échec inquiétant", "une menace terrible", "un conflit meurtrier"],
+        'neutral': ["une décision attendue", "un calendrier précisé", "une réunion technique", "un rapport publié"],
+        'filler': "Selon plusieurs sources diplomatiques, les discussions se poursuivront dans les prochains jours.",
+    },
+    'en': {
+        'subjects': ["The government", "The European Commission", "The foreign minister", "The UN",
+                     "The president", "Negotiators", "The opposition", "The central bank",
+                     "Analysts", "Parliament"],
+        'verbs': ["announces", "condemns", "prepares", "rejects", "backs", "reviews", "criticises", "welcomes"],
+        'objects': ["a ceasefire agreement", "new sanctions", "a stimulus plan", "a pension reform",
+                    "an international summit", "a rate hike", "a vaccination programme", "a climate bill"],
+        'places': ["in Paris", "in Brussels", "in Geneva", "in Kyiv", "in Beijing", "in Washington", "in Dakar", "in Berlin"],
+        'positive': ["a remarkable success", "excellent news", "encouraging progress", "a great victory"],
+        'negative': ["a serious crisis", "a worrying failure", "a terrible threat", "a deadly conflict"],
+        'neutral': ["an expected decision", "a clarified timetable", "a technical meeting", "a published report"],
+        'filler': "According to several diplomatic sources, talks will continue in the coming days.",
+    }
+}
+
+
+def feed_urls(count=FEED_COUNT, base='https://bench.invalid'):
+    return [f"{base}/feed/{i}.xml" for i in range(count)]
+
+
+def _zipf_weights(count):
+    return [1.0 / (rank + 1) for rank in range(count)]
+
+
+def generate_articles(n, seed=DEFAULT_SEED, feeds=None, now=None):
+    """
+    Génère n articles (dict) de façon déterministe
+    ~60 % français / 40 % anglais, 1 à 2 thèmes par article, tonalité
+    positive/négative/neutre, dates réparties sur les DAYS_SPAN jours
+    précédant now (minuit du jour par défaut, pour que les fenêtres
+    « 7 derniers jours » de l'application portent sur le même volume)
+    """
+    rng = random.Random(seed)
+    feeds = feeds or feed_urls()
+    weights = _zipf_weights(len(feeds))
+    themes = list(DEFAULT_THEMES.items())
+    now = now or datetime.combine(date.today(), datetime.min.time())
+
+    for i in range(n):
+        lang = 'fr' if rng.random() < 0.6 else 'en'
+        lex = LEXICON[lang]
+        tone = rng.choice(('positive', 'negative', 'neutral'))
+        chosen = rng.sample(themes, rng.choice((1, 1, 2)))
+        keywords = [rng.choice(data['keywords']) for _, data in chosen]
+
+        title = f"{rng.choice(lex['subjects'])} {rng.choice(lex['verbs'])} {rng.choice(lex['objects'])} {rng.choice(lex['places'])}"
+        sentences = [
+            f"{title}: {rng.choice(lex[tone])}.",
+            f"{' '.join(keywords).capitalize()} : {rng.choice(lex[tone])} ({', '.join(keywords)}).",
+            lex['filler'],
+            f"{rng.choice(lex['subjects'])} {rng.choice(lex['verbs'])} {rng.choice(lex['objects'])}, {rng.choice(lex[tone])}.",
+        ]
+
+        yield {
+            'title': title,
+            'content': ' '.join(sentences),
+            'link': f"https://bench.invalid/article/{seed}/{i}",
+            'pub_date': now - timedelta(seconds=rng.randrange(DAYS_SPAN * 86400)),
+            'feed_url': feeds[rng.choices(range(len(feeds)), weights)[0]],
+            'lang': lang,
+            'tone': tone,
+            'themes': [theme_id for theme_id, _ in chosen]
+        }
+
+
+TONE_SCORES = {'positive': (0.25, 0.9), 'negative': (-0.9, -0.25), 'neutral': (-0.15, 0.15)}
+
+
+def populate_database(db_path, n, seed=DEFAULT_SEED, batch_size=20000, now=None):
+    """
+    Crée une base de benchmark de n articles (schéma de l'application,
+    migrations comprises) ; sentiments et thèmes viennent du générateur
+    Une base existante construite avec les mêmes paramètres est réutilisée.
+    """
+    from Flask.database import DatabaseManager, to_timestamp
+    from Flask.database_migrations import run_migrations
+
+    now = now or datetime.combine(date.today(), datetime.min.time())
+    marker = f"{db_path}.json"
+    params = {'articles': n, 'seed': seed, 'anchor': now.isoformat()}
+    if os.path.exists(db_path) and os.path.exists(marker):
+        with open(marker, encoding='utf-8') as f:
+            if json.load(f) == params:
+                run_migrations(DatabaseManager(db_path))  # Base construite avant une migration
+                return db_path
+    for path in (db_path, marker):
+        if os.path.exists(path):
+            os.remove(path)
+
+    db_manager = DatabaseManager(db_path)
+    run_migrations(db_manager)
+
+    rng = random.Random(seed + 1)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    cursor = conn.cursor()
+
+    start = time.perf_counter()
+    cursor.executemany("INSERT OR IGNORE INTO feeds (url) VALUES (?)", [(url,) for url in feed_urls()])
+    feed_ids = dict(cursor.execute("SELECT url, id FROM feeds").fetchall())
+    article_id = 0
+    articles, analyses = [], []
+
+    def flush():
+        cursor.executemany("""
+            INSERT INTO articles (id, title, content, link, pub_date, pub_ts, feed_url, feed_id, sentiment_score, sentiment_type)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, articles)
+        cursor.executemany("""
+            INSERT INTO theme_analyses (article_id, theme_id, confidence) VALUES (?, ?, ?)
+        """, analyses)
+        conn.commit()
+        articles.clear()
+        analyses.clear()
+
+    for article in generate_articles(n, seed, now=now):
+        article_id += 1
+        low, high = TONE_SCORES[article['tone']]
+        articles.append((
+            article_id, article['title'], article['content'], article['link'],
+            article['pub_date'].strftime('%Y-%m-%d %H:%M:%S'), to_timestamp(article['pub_date']),
+            article['feed_url'], feed_ids[article['feed_url']], round(rng.uniform(low, high), 4), article['tone']
+        ))
+        for theme_id in article['themes']:
+            analyses.append((article_id, theme_id, round(rng.uniform(0.3, 0.95), 3)))
+
+        if len(articles) >= batch_size:
+            flush()
+
+    flush()
+    cursor.execute("ANALYZE")
+    conn.close()
+
+    with open(marker, 'w', encoding='utf-8') as f:
+        json.dump(params, f)
+
+    print(f"   🗄️ Base de {n} articles créée en {time.perf_counter() - start:.1f}s ({db_path})")
+    return db_path
+
+
+def render_feed(url, articles):
+    items = ''.join(
+        "<item>"
+        f"<title>{escape(a['title'])}</title>"
+        f"<link>{escape(a['link'])}</link>"
+        f"<description>{escape(a['content'])}</description>"
+        f"<pubDate>{format_datetime(a['pub_date'])}</pubDate>"
+        "</item>"
+        for a in articles
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Flux de benchmark</title><link>{escape(url)}</link>{items}</channel></rss>"
+    ).encode('utf-8')
+
+
+class StubFeedServer:
+    """
+    Serveur RSS local : /feed/<i>.xml retourne items_per_feed articles
+    synthétiques (déterministes pour une graine donnée)
+
+        with StubFeedServer(feeds=20) as server:
+            urls = server.urls
+    """
+
+    def __init__(self, feeds=20, items_per_feed=50, seed=DEFAULT_SEED, port=0):
+        self.feeds = feeds
+        self.items_per_feed = items_per_feed
+        self.seed = seed
+        self.port = port
+        self._bodies = {}
+        self._server = None
+
+    def __enter__(self):
+        bodies = self._bodies
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body = bodies.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        base = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+        urls = feed_urls(self.feeds, base)
+        corpus = list(generate_articles(self.feeds * self.items_per_feed, self.seed + 2, feeds=urls))
+        for index, url in enumerate(urls):
+            chunk = corpus[index * self.items_per_feed:(index + 1) * self.items_per_feed]
+            for article in chunk:
+                article['link'] = f"{url}#{article['link'].rsplit('/', 1)[-1]}"
+            bodies[url[len(base):]] = render_feed(url, chunk)
+
+        self.urls = urls
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        return False
+
+
+if __name__ == '__main__':
+    # Aperçu du corpus
+    for article in generate_articles(3):
+        print(f"[{article['lang']}/{article['tone']}/{','.join(article['themes'])}] {article['title']}")
+        print(f"   {article['content'][:160]}...")
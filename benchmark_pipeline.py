@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Benchmark reproductible du pipeline d'analyse sur corpus synthétique
+- analyse de thèmes et de sentiment (détail par backend via /metrics)
+- ingestion depuis un serveur RSS local (aucun accès réseau)
+- corroboration, rapport d'anomalies et /api/stats sur des bases de
+  10k / 100k / 1M articles
+
+Les résultats sont écrits en JSON ; --compare signale les régressions
+par rapport à un résultat précédent (ex. celui du commit parent).
+
+Usage: python benchmark_pipeline.py [--sizes 10000,100000,1000000] [--output bench.json]
+                                    [--compare ancien.json] [--threshold 1.2]
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import platform
+import argparse
+import subprocess
+import logging
+from datetime import datetime
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_corpus import DEFAULT_SEED, StubFeedServer, generate_articles, populate_database
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(fn, iterations, warmup=1):
+    """Exécute fn iterations fois ; retourne les statistiques de latence (ms)"""
+    for _ in range(warmup):
+        fn()
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'calls': iterations,
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'total_ms': round(sum(latencies), 1)
+    }
+
+
+def environment(seed):
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        commit = None
+
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed
+    }
+
+
+# ----------------------------------------------------------------------
+# Benchmarks indépendants de la taille de la base
+# ----------------------------------------------------------------------
+
+def bench_theme_analyzer(db_manager, texts):
+    from Flask.theme_analyzer import ThemeAnalyzer
+
+    analyzer = ThemeAnalyzer(db_manager)
+    iterator = iter(texts * 2)
+    return measure(lambda: analyzer.analyze_article(*next(iterator)), len(texts))
+
+
+def bench_sentiment(texts):
+    """Temps total par appel, puis détail par backend lu dans l'histogramme /metrics"""
+    from Flask import metrics
+    from Flask.sentiment_analyzer import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer()
+    analyzer.analyze_sentiment(texts[0][1])  # Chargement des modèles hors mesure
+
+    metrics.set_enabled(True)
+    metrics.SENTIMENT_SECONDS.drain()
+    iterator = iter(texts * 2)
+    result = measure(lambda: analyzer.analyze_sentiment(next(iterator)[1]), len(texts), warmup=0)
+
+    backends = {}
+    for (backend,), (_, total, count) in metrics.SENTIMENT_SECONDS.drain().items():
+        backends[backend] = {'calls': count, 'mean_ms': round(total / count * 1000, 3)}
+    result['backends'] = backends
+    return result
+
+
+def bench_ingest(db_manager, feeds, items_per_feed, seed):
+    """Téléchargement, parsing, scoring et écriture depuis le serveur local"""
+    from Flask.rss_manager import RSSManager
+    from Flask.sentiment_service import get_sentiment_service
+
+    # Scoring dans le processus : mesure indépendante du nombre de cœurs
+    get_sentiment_service().workers = 0
+
+    rss_manager = RSSManager(db_manager)
+    with StubFeedServer(feeds=feeds, items_per_feed=items_per_feed, seed=seed) as server:
+        latencies = []
+        added = 0
+        start = time.perf_counter()
+        for url in server.urls:
+            call_start = time.perf_counter()
+            fetched = rss_manager.fetch_feed(url)
+            added += rss_manager.ingest_articles(fetched['articles'])
+            latencies.append((time.perf_counter() - call_start) * 1000)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'calls': len(latencies),
+        'articles': added,
+        'articles_per_sec': round(added / elapsed, 1) if elapsed else None,
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'total_ms': round(elapsed * 1000, 1)
+    }
+
+
+# ----------------------------------------------------------------------
+# Benchmarks dépendant du volume
+# ----------------------------------------------------------------------
+
+def _load_article(cursor, article_id, with_scores=False):
+    columns = "id, title, content, pub_date, feed_url, feed_id"
+    if with_scores:
+        columns += ", sentiment_type, sentiment_score"
+    cursor.execute(f"SELECT {columns} FROM articles WHERE id = ?", (article_id,))
+    names = [col[0] for col in cursor.description]
+    article = dict(zip(names, cursor.fetchone()))
+    cursor.execute("SELECT theme_id FROM theme_analyses WHERE article_id = ?", (article_id,))
+    article['themes'] = [row[0] for row in cursor.fetchall()]
+    return article
+
+
+def bench_corroboration(db_manager, size, iterations, seed):
+    """Même sélection de candidats que /api/corroboration (7 jours, 200 max)"""
+    from Flask.corroboration_engine import CorroborationEngine
+    from Flask.database import days_ago_timestamp
+
+    engine = CorroborationEngine()
+    rng = random.Random(seed)
+    conn = db_manager.get_connection()
+    cursor = conn.cursor()
+
+    def candidates_for(article_id):
+        cursor.execute("""
+            SELECT id FROM articles
+            WHERE pub_ts >= ? AND id != ?
+            ORDER BY pub_ts DESC
+            LIMIT 200
+        """, (days_ago_timestamp(7, start_of_day=True), article_id))
+        return [_load_article(cursor, row[0], with_scores=True) for row in cursor.fetchall()]
+
+    try:
+        ids = [rng.randint(1, size) for _ in range(iterations + 1)]
+        queries = iter(ids)
+        candidates = measure(lambda: candidates_for(next(queries)), iterations)
+
+        workload = [(_load_article(cursor, article_id), candidates_for(article_id)) for article_id in ids]
+    finally:
+        conn.close()
+
+    iterator = iter(workload)
+    matching = measure(lambda: engine.find_corroborations(*next(iterator)), iterations)
+    matching['candidates'] = len(workload[0][1])
+    return {'candidates_query': candidates, 'find_corroborations': matching}
+
+
+def bench_anomalies(db_manager, iterations):
+    from Flask.anomaly_detector import AnomalyDetector
+
+    detector = AnomalyDetector(db_manager)
+    return measure(detector.get_comprehensive_anomaly_report, iterations)
+
+
+def bench_stats_endpoint(db_manager, iterations):
+    """/api/stats via le client de test Flask (sans threads de fond)"""
+    from flask import Flask
+    from Flask.theme_manager import ThemeManager
+    from Flask.theme_manager_advanced import AdvancedThemeManager
+    from Flask.theme_analyzer import ThemeAnalyzer
+    from Flask.rss_manager import RSSManager
+    from Flask.anomaly_detector import AnomalyDetector
+    from Flask.response_layer import init_response_layer
+    from Flask.routes import register_routes
+
+    app = Flask(__name__)
+    init_response_layer(app)
+    register_routes(app, db_manager, ThemeManager(db_manager), ThemeAnalyzer(db_manager),
+                    RSSManager(db_manager), AdvancedThemeManager(db_manager), AnomalyDetector(db_manager))
+    client = app.test_client()
+
+    def call():
+        response = client.get('/api/stats', headers={'Accept-Encoding': 'gzip'})
+        if response.status_code != 200:
+            raise RuntimeError(f"/api/stats: HTTP {response.status_code}")
+
+    return measure(call, iterations)
+
+
+# ----------------------------------------------------------------------
+# Exécution et comparaison
+# ----------------------------------------------------------------------
+
+def run(args):
+    from Flask.database import DatabaseManager
+    from Flask.database_migrations import run_migrations
+
+    os.makedirs(args.workdir, exist_ok=True)
+    results = {'meta': environment(args.seed), 'micro': {}, 'sizes': {}}
+
+    texts = [(a['content'], a['title']) for a in generate_articles(args.texts, args.seed + 3)]
+
+    print("\n🔬 Benchmarks unitaires")
+    db_path = os.path.join(args.workdir, 'bench_micro.db')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    micro_db = DatabaseManager(db_path)
+    run_migrations(micro_db)
+
+    results['micro']['theme_analyzer.analyze_article'] = bench_theme_analyzer(micro_db, texts)
+    results['micro']['sentiment_analyzer.analyze_sentiment'] = bench_sentiment(texts)
+    results['micro']['rss_manager.ingest'] = bench_ingest(micro_db, args.feeds, args.items_per_feed, args.seed)
+    for name, stats in results['micro'].items():
+        print(f"   {name}: {stats['mean_ms']:.3f} ms/appel (p95 {stats['p95_ms']:.3f})")
+
+    for size in args.sizes:
+        print(f"\n📚 Base de {size} articles")
+        db_manager = DatabaseManager(populate_database(
+            os.path.join(args.workdir, f'bench_{size}.db'), size, args.seed))
+
+        size_results = bench_corroboration(db_manager, size, args.iterations, args.seed)
+        size_results['anomaly_detector.get_comprehensive_anomaly_report'] = bench_anomalies(db_manager, args.iterations)
+        size_results['api_stats'] = bench_stats_endpoint(db_manager, args.iterations)
+        results['sizes'][str(size)] = size_results
+
+        for name, stats in size_results.items():
+            print(f"   {name}: {stats['mean_ms']:.3f} ms/appel (p95 {stats['p95_ms']:.3f})")
+
+    return results
+
+
+def flatten(results):
+    flat = {f"micro/{name}": stats['mean_ms'] for name, stats in results.get('micro', {}).items()}
+    for size, ops in results.get('sizes', {}).items():
+        for name, stats in ops.items():
+            flat[f"{size}/{name}"] = stats['mean_ms']
+    return flat
+
+
+def compare(previous, current, threshold):
+    """Affiche les ratios actuel/précédent ; retourne les opérations en régression"""
+    before = flatten(previous)
+    after = flatten(current)
+    regressions = []
+
+    print(f"\n📊 Comparaison avec {previous['meta'].get('commit')} (seuil x{threshold})")
+    for key in sorted(after):
+        if key not in before or not before[key]:
+            continue
+        ratio = after[key] / before[key]
+        flag = '❌' if ratio > threshold else ('✅' if ratio < 1 / threshold else '  ')
+        print(f"   {flag} {key}: {before[key]:.3f} → {after[key]:.3f} ms (x{ratio:.2f})")
+        if ratio > threshold:
+            regressions.append({'operation': key, 'before_ms': before[key],
+                                'after_ms': after[key], 'ratio': round(ratio, 3)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline sur corpus synthétique")
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help="Tailles de base, séparées par des virgules")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--texts', type=int, default=300, help="Textes pour thèmes et sentiment")
+    parser.add_argument('--iterations', type=int, default=20, help="Appels par opération et par taille")
+    parser.add_argument('--feeds', type=int, default=20, help="Flux servis par le serveur local")
+    parser.add_argument('--items-per-feed', type=int, default=50)
+    parser.add_argument('--workdir', default='benchmark_data', help="Bases générées (réutilisées)")
+    parser.add_argument('--output', default=None, help="Fichier JSON de résultats")
+    parser.add_argument('--compare', default=None, help="Résultat JSON précédent")
+    parser.add_argument('--threshold', type=float, default=1.2, help="Ratio au-delà duquel on signale une régression")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+    args.sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run(args)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            results['regressions'] = compare(json.load(f), results, args.threshold)
+
+    output = args.output or f"benchmark_{results['meta']['commit'] or 'local'}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Résultats: {output}")
+
+    if args.fail_on_regression and results.get('regressions'):
+        print(f"❌ {len(results['regressions'])} régression(s)")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark du modèle Transformer de sentiment : PyTorch vs ONNX Runtime int8
+Affiche le débit (textes/s) et la latence p50/p95 par appel
+
+Usage: python benchmark_sentiment.py [--backend pytorch|onnx|all] [--texts 200] [--batch 1]
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from test_onnx_parity import load_corpus
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_backend(name):
+    if name == 'onnx':
+        from Flask.onnx_sentiment import load_onnx_pipeline
+        return load_onnx_pipeline()
+
+    from transformers import pipeline
+    from Flask.config import SENTIMENT_TRANSFORMER_MODEL
+    return pipeline(
+        "sentiment-analysis",
+        model=SENTIMENT_TRANSFORMER_MODEL,
+        return_all_scores=True
+    )
+
+
+def run_benchmark(name, texts, batch_size, warmup=5):
+    print(f"\n⏱️ Backend {name}")
+    start = time.perf_counter()
+    pipe = load_backend(name)
+    print(f"   Chargement: {time.perf_counter() - start:.2f}s")
+
+    for text in texts[:warmup]:
+        pipe(text)
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        call_start = time.perf_counter()
+        pipe(batch if batch_size > 1 else batch[0])
+        latencies.append((time.perf_counter() - call_start) * 1000)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        'backend': name,
+        'texts_per_sec': len(texts) / elapsed,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95)
+    }
+    print(f"   Débit: {result['texts_per_sec']:.1f} textes/s")
+    print(f"   Latence par appel (lot de {batch_size}): p50 {result['p50_ms']:.1f}ms, p95 {result['p95_ms']:.1f}ms")
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark sentiment PyTorch / ONNX")
+    parser.add_argument('--backend', choices=['pytorch', 'onnx', 'all'], default='all')
+    parser.add_argument('--texts', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.texts)
+    texts = [t[:512] for t in (corpus * (args.texts // len(corpus) + 1))[:args.texts]]
+
+    print("=" * 60)
+    print(f"🧪 BENCHMARK SENTIMENT ({len(texts)} textes)")
+    print("=" * 60)
+
+    backends = ['pytorch', 'onnx'] if args.backend == 'all' else [args.backend]
+    results = [run_benchmark(name, texts, args.batch) for name in backends]
+
+    if len(results) == 2 and results[0]['texts_per_sec']:
+        speedup = results[1]['texts_per_sec'] / results[0]['texts_per_sec']
+        print(f"\n🚀 Accélération ONNX int8: x{speedup:.2f}")
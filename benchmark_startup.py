@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage de l'application
+Chaque mesure tourne dans un processus neuf : import de Flask.app_factory
+puis create_app(), sur une base vide (premier déploiement, migrations
+complètes) et sur une base existante (redémarrage).
+
+Signale aussi les bibliothèques lourdes chargées au démarrage, qui
+devraient l'être au premier usage.
+
+Usage: python benchmark_startup.py [--runs 5] [--output startup.json]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['sklearn', 'scipy', 'xhtml2pdf', 'transformers', 'torch', 'onnxruntime', 'bs4', 'nltk']
+
+CHILD = """
+import json, multiprocessing, os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+import Flask.config as config
+config.DB_PATH = {db_path!r}
+from Flask.app_factory import create_app
+imported = time.perf_counter()
+create_app()
+created = time.perf_counter()
+print(json.dumps({{
+    'import_s': imported - start,
+    'create_app_s': created - imported,
+    'total_s': created - start,
+    'heavy_modules': [m for m in {heavy!r} if m in sys.modules]
+}}))
+sys.stdout.flush()
+# Sans attendre les threads de fond ni le préchargement des workers de scoring
+for child in multiprocessing.active_children():
+    child.terminate()
+os._exit(0)
+"""
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure_once(db_path):
+    code = CHILD.format(
+        root=os.path.dirname(os.path.abspath(__file__)),
+        db_path=db_path,
+        heavy=HEAVY_MODULES
+    )
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True, text=True, timeout=300
+    )
+    wall = time.perf_counter() - started
+
+    lines = [line for line in output.stdout.splitlines() if line.startswith('{')]
+    if output.returncode != 0 or not lines:
+        raise RuntimeError(f"Échec du démarrage:\n{output.stderr[-2000:]}")
+
+    result = json.loads(lines[-1])
+    result['wall_s'] = wall  # Inclut le lancement de l'interpréteur
+    return result
+
+
+def summarize(samples):
+    summary = {}
+    for key in ('import_s', 'create_app_s', 'total_s', 'wall_s'):
+        values = [s[key] for s in samples]
+        summary[key] = {
+            'median': round(percentile(values, 50), 3),
+            'min': round(min(values), 3),
+            'max': round(max(values), 3)
+        }
+    summary['heavy_modules'] = sorted({m for s in samples for m in s['heavy_modules']})
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage de l'application")
+    parser.add_argument('--runs', type=int, default=5, help="Redémarrages mesurés")
+    parser.add_argument('--output', default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, 'startup.db')
+
+        print("\n🚀 Premier démarrage (base vide)")
+        cold = measure_once(db_path)
+        print(f"   import {cold['import_s']:.2f}s, create_app {cold['create_app_s']:.2f}s")
+
+        print(f"\n🔁 Redémarrages ({args.runs})")
+        warm = []
+        for i in range(args.runs):
+            warm.append(measure_once(db_path))
+            print(f"   #{i + 1}: import {warm[-1]['import_s']:.2f}s, "
+                  f"create_app {warm[-1]['create_app_s']:.2f}s, total {warm[-1]['wall_s']:.2f}s")
+
+    results = {'first_start': cold, 'restart': summarize(warm)}
+    restart = results['restart']
+    print(f"\n📊 Redémarrage médian: {restart['total_s']['median']:.2f}s "
+          f"(import {restart['import_s']['median']:.2f}s, create_app {restart['create_app_s']['median']:.2f}s)")
+    if restart['heavy_modules']:
+        print(f"   ⚠️ Chargés au démarrage: {', '.join(restart['heavy_modules'])}")
+    else:
+        print("   ✅ Aucune bibliothèque lourde chargée au démarrage")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Résultats: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
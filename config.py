@@ -8,6 +8,93 @@ TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 # Configuration RSS
 UPDATE_INTERVAL = 360
 MAX_ARTICLES_PER_FEED = 100
+FEED_FETCH_TIMEOUT = 15         # Secondes max pour télécharger un flux
+FEED_USER_AGENT = 'GEOPOL-RSS/2.2 (+feedparser)'
+
+# Planificateur des flux (UPDATE_INTERVAL = intervalle initial, en secondes)
+FEED_SCHEDULER_ENABLED = True   # False si le planificateur tourne dans un worker séparé
+FEED_SCHEDULER_WORKERS = 8      # Flux téléchargés en parallèle
+FEED_FETCH_RATE = 5.0           # Téléchargements max par seconde (lissage de la charge)
+FEED_MIN_INTERVAL = 120         # Intervalle minimal d'un flux très actif
+FEED_MAX_INTERVAL = 24 * 3600   # Intervalle maximal (flux inactif ou en erreur)
+FEED_TARGET_NEW_ARTICLES = 5    # Nouveaux articles visés par téléchargement
+FEED_INTERVAL_JITTER = 0.1      # Variation aléatoire (±10 %) de l'échéance
+FEED_VALIDATION_WORKERS = 32    # Flux validés en parallèle lors d'un import
+FEED_VALIDATION_TIMEOUT = 10    # Secondes max par flux validé
+FEED_VALIDATION_MAX_BYTES = 5 * 1024 * 1024  # Taille max lue par flux validé
+FEED_HOST_FAILURE_THRESHOLD = 5 # Échecs réseau/5xx consécutifs avant de suspendre un hôte
+FEED_HOST_RESET_TIMEOUT = 300   # Secondes avant un nouvel essai sur un hôte suspendu
+
+# Mises à jour en direct du dashboard (Server-Sent Events)
+LIVE_UPDATES_ENABLED = True     # False : le dashboard revient au rafraîchissement périodique
+LIVE_POLL_INTERVAL = 10         # Secondes entre deux vérifications de la base (écritures externes)
+LIVE_HEARTBEAT = 15             # Secondes entre deux commentaires keep-alive
+LIVE_EVENT_HISTORY = 200        # Événements conservés pour la reprise (Last-Event-ID)
+LIVE_QUEUE_SIZE = 100           # Événements en attente max par client avant resync
+LIVE_ANOMALY_Z = 2.0            # Seuil de z-score des alertes d'anomalie
+
+# Réponses HTTP (sérialisation et compression)
+JSON_ENCODER = 'orjson'         # 'orjson' (si installé) ou 'json'
+COMPRESSION_ENABLED = True      # gzip/brotli selon Accept-Encoding
+COMPRESSION_MIN_SIZE = 1024     # Octets en dessous desquels on ne compresse pas
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 4  # Qualité brotli (0-11) : 4 = bon compromis temps réel
+
+# Instrumentation (/metrics, format Prometheus)
+METRICS_ENABLED = True          # False : mesures désactivées (coût quasi nul)
+
+# Profilage à la demande (en-tête X-Profile: cprofile|sample, ou ?_profile=)
+PROFILING_ENABLED = False       # Déclencheurs de profilage et endpoints /api/admin/profil*
+PROFILING_TOKEN = os.environ.get('GEO_PROFILING_TOKEN')  # Si défini : exigé (en-tête X-Profile-Token)
+PROFILING_BUFFER_SIZE = 50      # Profils conservés en mémoire (tampon circulaire)
+PROFILING_SAMPLE_INTERVAL = 0.005  # Secondes entre deux échantillons de pile
+PROFILING_TOP_FUNCTIONS = 30    # Fonctions listées dans le résumé d'un profil
+TRACEMALLOC_FRAMES = 10         # Profondeur des piles enregistrées par tracemalloc
+TRACEMALLOC_SNAPSHOTS = 5       # Instantanés mémoire conservés
+
+# Configuration des rapports IA (Llama)
+REPORT_MAX_ARTICLES = 2000      # Articles maximum pour un rapport map-reduce
+REPORT_CHUNK_SIZE = 20          # Articles par lot résumé (étape map)
+REPORT_REDUCE_FAN_IN = 12       # Synthèses fusionnées par appel (étape reduce)
+# Doit correspondre à l'option -np du serveur llama.cpp (contexte -c partagé entre
+# les slots) : un slot épinglé par type de rapport (4), les suivants aux synthèses
+# map-reduce. Avec 4 slots ou moins, aucun slot n'est épinglé.
+LLAMA_PARALLEL_SLOTS = 6
+
+# Configuration des réseaux sociaux
+SOCIAL_FETCH_BUDGET = 12.0      # Secondes max pour interroger toutes les sources
+NITTER_HEDGE_DELAY = 2.0        # Délai avant d'interroger une instance Nitter miroir
+NITTER_FAILURE_THRESHOLD = 3    # Échecs consécutifs avant de couper une instance
+NITTER_RESET_TIMEOUT = 300.0    # Secondes avant de réessayer une instance coupée
+SOCIAL_COLLECTOR_ENABLED = True # Collecte périodique en arrière-plan vers social_posts
+SOCIAL_COLLECT_INTERVAL = 900   # Secondes entre deux collectes
+SOCIAL_COLLECT_DAYS = 1         # Fenêtre (jours) des posts collectés
+
+# Configuration des modèles de sentiment
+SENTIMENT_TRANSFORMER_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+SENTIMENT_WARMUP = True         # Préchargement des modèles en arrière-plan au démarrage
+MODEL_IDLE_TIMEOUT = 3600       # Secondes d'inactivité avant déchargement (0 = jamais)
+SENTIMENT_BACKEND = 'pytorch'   # 'pytorch' (pleine précision) ou 'onnx' (ONNX Runtime int8)
+ONNX_MODEL_DIR = os.path.join(BASE_DIR, 'models', 'sentiment-onnx-int8')  # Export : python -m Flask.onnx_sentiment
+ONNX_INTRA_OP_THREADS = 0       # Threads ONNX Runtime par session (0 = automatique)
+# Processus de scoring (0 = dans le processus Flask). Chaque worker a son propre
+# registre de modèles : compter ~1 Go de RAM par worker pour le Transformer
+# PyTorch (~200 Mo en ONNX int8), chargé à son premier texte. Au-delà de 2,
+# le gain de débit se paie en copies du modèle.
+SENTIMENT_WORKERS = 1
+SENTIMENT_BATCH_SIZE = 32       # Textes maximum par lot envoyé à un worker
+SENTIMENT_BATCH_WINDOW_MS = 20  # Attente max pour remplir un lot
+SENTIMENT_TIMEOUT = 60.0        # Secondes max d'attente d'un score
+
+# Configuration de l'archiviste (Archive.org)
+ARCHIVE_CACHE_MAX_BYTES = 50 * 1024 * 1024     # Taille max du cache disque (éviction LRU)
+ARCHIVE_CACHE_TTL = 86400                      # Fraîcheur des périodes en cours (1 jour)
+ARCHIVE_CACHE_HISTORICAL_TTL = 30 * 86400      # Fraîcheur des périodes closes (30 jours)
+ARCHIVE_FETCH_WORKERS = 2                      # Workers de la file de requêtes Archive.org
+ARCHIVE_ANALYSIS_WORKERS = 4                   # Périodes analysées en parallèle
+ARCHIVE_SNAPSHOTS_ENABLED = True               # Calcul des instantanés (période, thème) en arrière-plan
+ARCHIVE_SNAPSHOT_INTERVAL = 6 * 3600           # Secondes entre deux passes de la tâche
+ARCHIVE_SNAPSHOT_MAX_AGE = 7 * 86400           # Âge max d'un instantané avant recalcul
 
 # Configuration de l'analyse
 SENTIMENT_THRESHOLD = 0.2
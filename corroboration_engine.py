@@ -4,11 +4,14 @@ Moteur de corroboration d'articles - Version optimisée Flask pure
 Sans dépendances lourdes obligatoires
 """
 
+import importlib.util
 import logging
 import re
 import difflib
+import time
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from .metrics import CORROBORATION_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +23,9 @@ try:
 except ImportError:
     logger.info("rapidfuzz non disponible - utilisation de difflib")
 
-HAVE_SKLEARN = False
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    HAVE_SKLEARN = True
-except ImportError:
+# sklearn (~1 s d'import) n'est chargé qu'au premier calcul TF-IDF
+HAVE_SKLEARN = importlib.util.find_spec('sklearn') is not None
+if not HAVE_SKLEARN:
     logger.info("sklearn non disponible - utilisation de similarité textuelle basique")
 
 
@@ -36,12 +36,16 @@ class CorroborationEngine:
     """
     
     def __init__(self):
-        self.tfidf = None
+        self._tfidf = None
         self.window_days = 7  # Fenêtre temporelle par défaut
-        
-        if HAVE_SKLEARN:
+    
+    @property
+    def tfidf(self):
+        """Vectoriseur TF-IDF créé au premier usage (None sans sklearn)"""
+        if self._tfidf is None and HAVE_SKLEARN:
             try:
-                self.tfidf = TfidfVectorizer(
+                from sklearn.feature_extraction.text import TfidfVectorizer
+                self._tfidf = TfidfVectorizer(
                     max_features=2000,
                     ngram_range=(1, 2),
                     min_df=1
@@ -49,6 +53,8 @@ class CorroborationEngine:
                 logger.info("✅ TF-IDF initialisé")
             except Exception as e:
                 logger.warning(f"Erreur init TF-IDF: {e}")
+                self._tfidf = False
+        return self._tfidf or None
     
     def _normalize_text(self, text: str) -> str:
         """Normalise un texte pour la comparaison"""
@@ -83,9 +89,11 @@ class CorroborationEngine:
         Calcule la similarité sémantique
         Utilise TF-IDF si disponible, sinon similarité textuelle
         """
-        if HAVE_SKLEARN and self.tfidf:
+        tfidf = self.tfidf
+        if tfidf:
             try:
-                vectors = self.tfidf.fit_transform([target] + candidates)
+                from sklearn.metrics.pairwise import cosine_similarity
+                vectors = tfidf.fit_transform([target] + candidates)
                 similarities = cosine_similarity(vectors[0:1], vectors[1:]).flatten()
                 return similarities.tolist()
             except Exception as e:
@@ -158,12 +166,14 @@ class CorroborationEngine:
         
         return intersection / union if union > 0 else 0.0
     
-    def _source_similarity(self, source1: str, source2: str) -> float:
-        """Vérifie si deux sources sont identiques"""
+    def _source_similarity(self, source1, source2) -> float:
+        """Vérifie si deux sources sont identiques (feeds.id, ou URL du flux)"""
         if not source1 or not source2:
             return 0.0
         
-        return 1.0 if source1.lower() == source2.lower() else 0.0
+        if isinstance(source1, str) and isinstance(source2, str):
+            return 1.0 if source1.lower() == source2.lower() else 0.0
+        return 1.0 if source1 == source2 else 0.0
     
     def compute_similarity(self, article: Dict, candidate: Dict) -> float:
         """
@@ -214,11 +224,14 @@ class CorroborationEngine:
             scores.append(temporal_sim)
             weights.append(0.1)
         
-        # 5. Similarité de source
-        source_sim = self._source_similarity(
-            article.get('feed_url', ''),
-            candidate.get('feed_url', '')
-        )
+        # 5. Similarité de source (entiers si les deux articles viennent de la base)
+        if article.get('feed_id') and candidate.get('feed_id'):
+            source_sim = self._source_similarity(article['feed_id'], candidate['feed_id'])
+        else:
+            source_sim = self._source_similarity(
+                article.get('feed_url', ''),
+                candidate.get('feed_url', '')
+            )
         scores.append(source_sim)
         weights.append(0.05)
         
@@ -250,6 +263,7 @@ class CorroborationEngine:
         
         article_id = article.get('id')
         results = []
+        started = time.perf_counter()
         
         logger.info(f"🔍 Recherche de corroboration pour article {article_id} parmi {len(candidates)} candidats")
         
@@ -277,6 +291,7 @@ class CorroborationEngine:
         
         # Limiter le nombre de résultats
         results = results[:top_n]
+        CORROBORATION_SECONDS.observe(time.perf_counter() - started)
         
         logger.info(f"✅ {len(results)} articles corroborants trouvés (seuil: {threshold})")
         
@@ -1,97 +1,89 @@
 import sqlite3
 import json
+import time
 import logging
-from datetime import datetime
-from typing import List, Dict, Any
-from .config import DB_PATH, DEFAULT_THEMES
+import threading
+from datetime import datetime, date, timezone
+from typing import List, Dict, Any, Optional, Union
+from .config import DB_PATH
 
 logger = logging.getLogger(__name__)
 
+# Bases dont le schéma est à jour (migrations exécutées une fois par chemin)
+_schema_ready = set()
+_schema_running = set()
+_schema_lock = threading.RLock()
+
+def to_timestamp(value: Union[datetime, date, str, int, float, None]) -> Optional[int]:
+    """
+    Convertit une date d'article en secondes epoch UTC (colonne pub_ts).
+    Les dates naïves sont en UTC (feedparser), les chaînes au format ISO.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+def day_bounds(start_day: Optional[str] = None, end_day: Optional[str] = None):
+    """
+    Bornes [début, fin) en secondes epoch de jours 'YYYY-MM-DD' inclusifs,
+    pour écrire pub_ts >= ? AND pub_ts < ? au lieu de DATE(pub_date)
+    """
+    start_ts = to_timestamp(date.fromisoformat(start_day[:10])) if start_day else None
+    end_ts = to_timestamp(date.fromisoformat(end_day[:10])) + 86400 if end_day else None
+    return start_ts, end_ts
+
+def days_ago_timestamp(days: float, start_of_day: bool = False) -> int:
+    """
+    Secondes epoch d'il y a `days` jours ; start_of_day : à minuit UTC
+    de ce jour-là (équivalent de DATE('now', '-N days'))
+    """
+    now = int(time.time())
+    if start_of_day:
+        now -= now % 86400
+    return int(now - days * 86400)
+
 class DatabaseManager:
     def __init__(self, db_path: str = DB_PATH):
+        """
+        Aucun accès à la base ici : le schéma (tables, index, thèmes par
+        défaut) est créé par les migrations, à la première connexion
+        """
         self.db_path = db_path
-        self._init_database()
-    
-    def _init_database(self):
-        """Initialise la base de données avec les tables nécessaires"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Table des thèmes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS themes (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                keywords TEXT,
-                color TEXT DEFAULT '#6366f1',
-                description TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Table des articles
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT,
-                link TEXT UNIQUE,
-                pub_date DATETIME,
-                feed_url TEXT,
-                sentiment_score REAL,
-                sentiment_type TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Table d'association articles-thèmes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS theme_analyses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                article_id INTEGER,
-                theme_id TEXT,
-                confidence REAL DEFAULT 0.5,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
-                FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Index pour les performances
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_pub_date ON articles(pub_date)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_feed_url ON articles(feed_url)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_theme_analyses_article ON theme_analyses(article_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_theme_analyses_theme ON theme_analyses(theme_id)")
-        
-        conn.commit()
-        conn.close()
-        
-        # Peupler avec les thèmes par défaut
-        self._populate_default_themes()
-    
-    def _populate_default_themes(self):
-        """Ajoute les thèmes par défaut à la base"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        for theme_id, theme_data in DEFAULT_THEMES.items():
-            cursor.execute("""
-                INSERT OR IGNORE INTO themes (id, name, keywords, color)
-                VALUES (?, ?, ?, ?)
-            """, (
-                theme_id,
-                theme_id.capitalize(),
-                json.dumps(theme_data['keywords'], ensure_ascii=False),
-                theme_data['color']
-            ))
-        
-        conn.commit()
-        conn.close()
     
     def get_connection(self):
         """Retourne une connexion à la base de données"""
+        if self.db_path not in _schema_ready:
+            self._ensure_schema()
         return sqlite3.connect(self.db_path)
     
+    def _ensure_schema(self):
+        """
+        Exécute les migrations une fois par chemin de base, quel que soit le
+        point d'entrée (application, scripts, gestionnaires instanciés seuls)
+        """
+        with _schema_lock:
+            # _schema_running : connexions ouvertes par les migrations elles-mêmes
+            if self.db_path in _schema_ready or self.db_path in _schema_running:
+                return
+            _schema_running.add(self.db_path)
+            try:
+                from .database_migrations import run_migrations
+                run_migrations(self)
+                _schema_ready.add(self.db_path)
+            finally:
+                _schema_running.discard(self.db_path)
+    
     def execute_query(self, query: str, params: tuple = ()):
         """Exécute une requête et retourne le résultat"""
         conn = self.get_connection()
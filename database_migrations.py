@@ -3,12 +3,26 @@
 Migrations de base de données pour ajouter les fonctionnalités avancées
 """
 
+import json
 import logging
 from typing import Optional
 from .database import DatabaseManager
+from .config import DEFAULT_THEMES
 
 logger = logging.getLogger(__name__)
 
+# pub_ts suit pub_date ; repli sur created_at comme le backfill (migration 14)
+PUB_TS_UPDATE_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS trg_articles_pub_ts_update
+    AFTER UPDATE OF pub_date ON articles
+    BEGIN
+        UPDATE articles
+        SET pub_ts = COALESCE(CAST(strftime('%s', NEW.pub_date) AS INTEGER),
+                              CAST(strftime('%s', NEW.created_at) AS INTEGER))
+        WHERE id = NEW.id;
+    END
+"""
+
 
 class DatabaseMigrations:
     """Gestionnaire de migrations de la base de données"""
@@ -17,14 +31,37 @@ class DatabaseMigrations:
         self.db_manager = db_manager
     
     def run_all_migrations(self):
-        """Exécute toutes les migrations nécessaires"""
-        logger.info("🔄 Démarrage des migrations...")
-        
+        """
+        Exécute toutes les migrations nécessaires
+        Le numéro de la dernière migration est enregistré dans PRAGMA
+        user_version : au redémarrage, une base à jour ne coûte qu'une lecture
+        """
         migrations = [
+            ("00_create_base_schema", self._create_base_schema),
             ("01_add_bayesian_columns", self._add_bayesian_columns),
             ("02_create_corroboration_table", self._create_corroboration_table),
             ("03_add_indices", self._add_performance_indices),
+            ("04_create_llm_summary_cache", self._create_llm_summary_cache),
+            ("05_create_social_store", self._create_social_store),
+            ("06_add_social_indices", self._add_social_indices),
+            ("07_create_archive_cache", self._create_archive_cache),
+            ("08_create_period_snapshots", self._create_period_snapshots),
+            ("09_historical_analyses_latest", self._create_historical_latest),
+            ("10_create_feeds_schedule", self._create_feeds_schedule),
+            ("11_add_feed_registry_columns", self._add_feed_registry_columns),
+            ("12_create_theme_advanced_tables", self._create_theme_advanced_tables),
+            ("13_create_sentiment_comparisons", self._create_sentiment_comparisons),
+            ("14_add_articles_pub_ts", self._add_articles_pub_ts),
+            ("15_add_articles_feed_id", self._add_articles_feed_id),
+            ("16_fix_pub_ts_update_trigger", self._fix_pub_ts_update_trigger),
         ]
+        schema_version = int(migrations[-1][0].split('_')[0])
+        
+        if self._get_schema_version() >= schema_version:
+            logger.debug(f"⏭️  Schéma à jour (version {schema_version})")
+            return
+        
+        logger.info("🔄 Démarrage des migrations...")
         
         for name, migration_func in migrations:
             try:
@@ -39,7 +76,27 @@ class DatabaseMigrations:
                 logger.error(f"❌ Erreur migration {name}: {e}")
                 raise
         
-        logger.info("✅ Toutes les migrations terminées")
+        self._set_schema_version(schema_version)
+        logger.info(f"✅ Toutes les migrations terminées (schéma version {schema_version})")
+    
+    def _get_schema_version(self) -> int:
+        """Version 0 si la table migrations a été supprimée (reset_migrations, fix_all)"""
+        conn = self.db_manager.get_connection()
+        try:
+            has_log = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'migrations'"
+            ).fetchone()
+            return conn.execute("PRAGMA user_version").fetchone()[0] if has_log else 0
+        finally:
+            conn.close()
+    
+    def _set_schema_version(self, version: int):
+        conn = self.db_manager.get_connection()
+        try:
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        finally:
+            conn.close()
     
     def _should_run_migration(self, migration_name: str) -> bool:
         """Vérifie si une migration doit être exécutée"""
@@ -81,6 +138,75 @@ class DatabaseMigrations:
         finally:
             conn.close()
     
+    def _create_base_schema(self):
+        """
+        Tables principales, index et thèmes par défaut
+        (auparavant recréés à chaque instanciation de DatabaseManager)
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS themes (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    keywords TEXT,
+                    color TEXT DEFAULT '#6366f1',
+                    description TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    content TEXT,
+                    link TEXT UNIQUE,
+                    pub_date DATETIME,
+                    feed_url TEXT,
+                    sentiment_score REAL,
+                    sentiment_type TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS theme_analyses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    article_id INTEGER,
+                    theme_id TEXT,
+                    confidence REAL DEFAULT 0.5,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
+                    FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE
+                )
+            """)
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_pub_date ON articles(pub_date)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_feed_url ON articles(feed_url)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_theme_analyses_article ON theme_analyses(article_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_theme_analyses_theme ON theme_analyses(theme_id)")
+            
+            cursor.executemany("""
+                INSERT OR IGNORE INTO themes (id, name, keywords, color)
+                VALUES (?, ?, ?, ?)
+            """, [
+                (
+                    theme_id,
+                    theme_id.capitalize(),
+                    json.dumps(theme_data['keywords'], ensure_ascii=False),
+                    theme_data['color']
+                )
+                for theme_id, theme_data in DEFAULT_THEMES.items()
+            ])
+            
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
     def _add_bayesian_columns(self):
         """Ajoute les colonnes pour l'analyse bayésienne"""
         conn = self.db_manager.get_connection()
@@ -170,6 +296,547 @@ class DatabaseMigrations:
         finally:
             conn.close()
     
+    def _create_llm_summary_cache(self):
+        """Crée la table de cache des synthèses par lot (rapports map-reduce)"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS llm_chunk_summaries (
+                    content_hash TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    article_count INTEGER DEFAULT 0,
+                    period TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            logger.info("  ➕ Table llm_chunk_summaries créée")
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _create_social_store(self):
+        """Crée le stockage local des posts sociaux et l'historique de collecte"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS social_posts (
+                    id TEXT PRIMARY KEY,
+                    title TEXT,
+                    content TEXT,
+                    link TEXT,
+                    pub_date DATETIME,
+                    source TEXT,
+                    source_type TEXT,
+                    author TEXT,
+                    sentiment_score REAL,
+                    sentiment_type TEXT,
+                    sentiment_confidence REAL,
+                    engagement TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS social_collection_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at DATETIME NOT NULL,
+                    finished_at DATETIME NOT NULL,
+                    posts_count INTEGER DEFAULT 0,
+                    saved_count INTEGER DEFAULT 0,
+                    sources_status TEXT,
+                    error TEXT
+                )
+            """)
+            
+            logger.info("  ➕ Tables social_posts et social_collection_runs créées")
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _add_social_indices(self):
+        """Index des posts sociaux (filtres par date, regroupements par source)"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            indices = [
+                ("idx_social_pub_date", "social_posts", "pub_date"),
+                ("idx_social_source", "social_posts", "source, source_type"),
+            ]
+            
+            for idx_name, table_name, columns in indices:
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS {idx_name} 
+                    ON {table_name}({columns})
+                """)
+                logger.info(f"  ➕ Index créé: {idx_name}")
+            
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _create_archive_cache(self):
+        """Crée le cache disque des recherches Archive.org"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS archive_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_archive_cache_access 
+                ON archive_cache(last_access)
+            """)
+            
+            logger.info("  ➕ Table archive_cache créée")
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _create_period_snapshots(self):
+        """Crée la table des instantanés d'analyses historiques (période, thème)"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS period_snapshots (
+                    period_key TEXT NOT NULL,
+                    theme TEXT NOT NULL DEFAULT '',
+                    analysis TEXT NOT NULL,
+                    items_analyzed INTEGER DEFAULT 0,
+                    avg_sentiment REAL DEFAULT 0.0,
+                    positive_percent REAL DEFAULT 0.0,
+                    negative_percent REAL DEFAULT 0.0,
+                    neutral_percent REAL DEFAULT 0.0,
+                    emotional_intensity TEXT,
+                    computed_at REAL NOT NULL,
+                    PRIMARY KEY (period_key, theme)
+                )
+            """)
+            
+            logger.info("  ➕ Table period_snapshots créée")
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _create_historical_latest(self):
+        """
+        Index de historical_analyses et table « dernière analyse par
+        (période, thème) » tenue à jour par trigger à chaque insertion
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS historical_analyses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    period_key TEXT,
+                    period_name TEXT,
+                    theme TEXT,
+                    total_items INTEGER,
+                    avg_sentiment_score REAL,
+                    emotional_intensity TEXT,
+                    top_themes TEXT,
+                    top_events TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Pagination par id décroissant (rowid) : l'id suit l'ordre de création
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_hist_period_theme 
+                ON historical_analyses(period_key, theme)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_hist_theme 
+                ON historical_analyses(theme)
+            """)
+            logger.info("  ➕ Index historical_analyses créés")
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS historical_analyses_latest (
+                    period_key TEXT NOT NULL,
+                    theme TEXT NOT NULL,
+                    analysis_id INTEGER NOT NULL,
+                    period_name TEXT,
+                    total_items INTEGER,
+                    avg_sentiment_score REAL,
+                    emotional_intensity TEXT,
+                    top_themes TEXT,
+                    created_at DATETIME,
+                    PRIMARY KEY (period_key, theme)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_hist_latest_id 
+                ON historical_analyses_latest(analysis_id)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_hist_latest_theme 
+                ON historical_analyses_latest(theme, analysis_id)
+            """)
+            
+            # Remplissage initial : la plus récente analyse de chaque couple
+            cursor.execute("""
+                INSERT OR REPLACE INTO historical_analyses_latest
+                (period_key, theme, analysis_id, period_name, total_items,
+                 avg_sentiment_score, emotional_intensity, top_themes, created_at)
+                SELECT COALESCE(period_key, ''), COALESCE(theme, ''), id, period_name, total_items,
+                       avg_sentiment_score, emotional_intensity, top_themes, created_at
+                FROM historical_analyses
+                WHERE id IN (
+                    SELECT MAX(id) FROM historical_analyses
+                    GROUP BY COALESCE(period_key, ''), COALESCE(theme, '')
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_historical_latest
+                AFTER INSERT ON historical_analyses
+                BEGIN
+                    INSERT OR REPLACE INTO historical_analyses_latest
+                    (period_key, theme, analysis_id, period_name, total_items,
+                     avg_sentiment_score, emotional_intensity, top_themes, created_at)
+                    VALUES (COALESCE(NEW.period_key, ''), COALESCE(NEW.theme, ''), NEW.id,
+                            NEW.period_name, NEW.total_items, NEW.avg_sentiment_score,
+                            NEW.emotional_intensity, NEW.top_themes, NEW.created_at);
+                END
+            """)
+            
+            logger.info("  ➕ Table historical_analyses_latest et trigger créés")
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _create_feeds_schedule(self):
+        """
+        Crée la table des flux suivis par le planificateur (état de
+        planification par flux), initialisée avec les flux déjà connus
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS feeds (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL UNIQUE,
+                    enabled INTEGER NOT NULL DEFAULT 1,
+                    interval_seconds REAL,
+                    next_due REAL,
+                    last_fetched REAL,
+                    last_new_articles INTEGER DEFAULT 0,
+                    publish_rate REAL,
+                    consecutive_errors INTEGER DEFAULT 0,
+                    last_error TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_feeds_next_due
+                ON feeds(enabled, next_due)
+            """)
+            
+            cursor.execute("""
+                INSERT OR IGNORE INTO feeds (url)
+                SELECT DISTINCT feed_url FROM articles
+                WHERE feed_url IS NOT NULL AND feed_url != ''
+            """)
+            
+            logger.info(f"  ➕ Table feeds créée ({cursor.rowcount} flux existants)")
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _add_feed_registry_columns(self):
+        """Ajoute à feeds les colonnes du registre (titre, origine, validation)"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("PRAGMA table_info(feeds)")
+            existing_columns = {row[1] for row in cursor.fetchall()}
+            
+            new_columns = [
+                ("title", "TEXT"),
+                ("origin", "TEXT DEFAULT 'manual'"),
+                ("validation_status", "TEXT DEFAULT 'pending'"),
+                ("http_status", "INTEGER"),
+                ("item_count", "INTEGER"),
+                ("validation_error", "TEXT"),
+                ("validated_at", "REAL"),
+            ]
+            
+            for col_name, col_type in new_columns:
+                if col_name not in existing_columns:
+                    cursor.execute(f"ALTER TABLE feeds ADD COLUMN {col_name} {col_type}")
+                    logger.info(f"  ➕ Colonne ajoutée: feeds.{col_name}")
+            
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_feeds_validation
+                ON feeds(validation_status)
+            """)
+            
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _create_theme_advanced_tables(self):
+        """Tables du gestionnaire de thèmes avancé (mots-clés pondérés, synonymes...)"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS theme_keywords_weighted (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    theme_id TEXT NOT NULL,
+                    keyword TEXT NOT NULL,
+                    weight REAL DEFAULT 1.0,
+                    category TEXT DEFAULT 'primary',
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE,
+                    UNIQUE(theme_id, keyword)
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS theme_synonyms (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    theme_id TEXT NOT NULL,
+                    original_word TEXT NOT NULL,
+                    synonym TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS theme_context (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    theme_id TEXT NOT NULL,
+                    context_type TEXT NOT NULL,
+                    context_value TEXT NOT NULL,
+                    metadata TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS theme_learning_stats (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    theme_id TEXT NOT NULL,
+                    keyword TEXT NOT NULL,
+                    usage_count INTEGER DEFAULT 0,
+                    accuracy REAL DEFAULT 0.0,
+                    last_used DATETIME,
+                    FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE,
+                    UNIQUE(theme_id, keyword)
+                )
+            """)
+            
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _create_sentiment_comparisons(self):
+        """Historique des comparaisons RSS / réseaux sociaux"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sentiment_comparisons (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME,
+                    rss_total INTEGER,
+                    rss_avg_sentiment REAL,
+                    social_total INTEGER,
+                    social_avg_sentiment REAL,
+                    divergence_absolute REAL,
+                    factor_z_value REAL,
+                    interpretation TEXT,
+                    recommendations TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _add_articles_pub_ts(self, batch_size: int = 5000):
+        """
+        Ajoute articles.pub_ts (secondes epoch UTC) : les filtres par période
+        deviennent des intervalles sur un entier indexé au lieu de DATE(pub_date)
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("PRAGMA table_info(articles)")
+            if 'pub_ts' not in {row[1] for row in cursor.fetchall()}:
+                cursor.execute("ALTER TABLE articles ADD COLUMN pub_ts INTEGER")
+                logger.info("  ➕ Colonne ajoutée: articles.pub_ts")
+            conn.commit()
+            
+            # Backfill par tranches d'id (verrou d'écriture court à chaque lot)
+            max_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+            filled = 0
+            for start in range(0, max_id + 1, batch_size):
+                cursor.execute("""
+                    UPDATE articles
+                    SET pub_ts = COALESCE(
+                        CAST(strftime('%s', pub_date) AS INTEGER),
+                        CAST(strftime('%s', created_at) AS INTEGER)
+                    )
+                    WHERE id >= ? AND id < ? AND pub_ts IS NULL
+                """, (start, start + batch_size))
+                filled += cursor.rowcount
+                conn.commit()
+            
+            # Écritures qui ne renseignent pas pub_ts (scripts, imports)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_articles_pub_ts_insert
+                AFTER INSERT ON articles
+                WHEN NEW.pub_ts IS NULL
+                BEGIN
+                    UPDATE articles
+                    SET pub_ts = COALESCE(CAST(strftime('%s', NEW.pub_date) AS INTEGER),
+                                          CAST(strftime('%s', 'now') AS INTEGER))
+                    WHERE id = NEW.id;
+                END
+            """)
+            cursor.execute(PUB_TS_UPDATE_TRIGGER)
+            
+            # Index couvrant : période + répartition des sentiments sans lire la table
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_articles_pub_ts_sentiment
+                ON articles(pub_ts, sentiment_type, sentiment_score)
+            """)
+            # Plus aucun filtre ni tri sur pub_date : un index de moins à chaque insertion
+            cursor.execute("DROP INDEX IF EXISTS idx_articles_pub_date")
+            
+            logger.info(f"  ➕ pub_ts renseigné pour {filled} articles")
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _fix_pub_ts_update_trigger(self):
+        """
+        Recrée le trigger de mise à jour de pub_ts avec le repli sur
+        created_at : une pub_date illisible mettait pub_ts à NULL et
+        sortait l'article de toutes les requêtes par période
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("DROP TRIGGER IF EXISTS trg_articles_pub_ts_update")
+            cursor.execute(PUB_TS_UPDATE_TRIGGER)
+            
+            cursor.execute("""
+                UPDATE articles
+                SET pub_ts = COALESCE(
+                    CAST(strftime('%s', pub_date) AS INTEGER),
+                    CAST(strftime('%s', created_at) AS INTEGER)
+                )
+                WHERE pub_ts IS NULL
+            """)
+            logger.info(f"  🔧 pub_ts réparé pour {cursor.rowcount} articles")
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
+    def _add_articles_feed_id(self, batch_size: int = 5000):
+        """
+        Ajoute articles.feed_id (référence feeds.id) : filtres et agrégats
+        par source sur un entier au lieu de l'URL complète du flux
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("PRAGMA table_info(articles)")
+            if 'feed_id' not in {row[1] for row in cursor.fetchall()}:
+                cursor.execute("ALTER TABLE articles ADD COLUMN feed_id INTEGER REFERENCES feeds(id)")
+                logger.info("  ➕ Colonne ajoutée: articles.feed_id")
+            
+            # Sources apparues depuis la création de feeds (migration 10)
+            cursor.execute("""
+                INSERT OR IGNORE INTO feeds (url)
+                SELECT DISTINCT feed_url FROM articles
+                WHERE feed_url IS NOT NULL AND feed_url != ''
+            """)
+            conn.commit()
+            
+            max_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+            filled = 0
+            for start in range(0, max_id + 1, batch_size):
+                cursor.execute("""
+                    UPDATE articles
+                    SET feed_id = (SELECT f.id FROM feeds f WHERE f.url = articles.feed_url)
+                    WHERE id >= ? AND id < ? AND feed_id IS NULL AND feed_url IS NOT NULL
+                """, (start, start + batch_size))
+                filled += cursor.rowcount
+                conn.commit()
+            
+            # Écritures qui ne renseignent que feed_url (scripts, imports)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS trg_articles_feed_id_insert
+                AFTER INSERT ON articles
+                WHEN NEW.feed_id IS NULL AND NEW.feed_url IS NOT NULL AND NEW.feed_url != ''
+                BEGIN
+                    INSERT OR IGNORE INTO feeds (url) VALUES (NEW.feed_url);
+                    UPDATE articles
+                    SET feed_id = (SELECT id FROM feeds WHERE url = NEW.feed_url)
+                    WHERE id = NEW.id;
+                END
+            """)
+            
+            # Articles d'une source sur une période ; remplace l'index sur l'URL
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_articles_feed_pub_ts
+                ON articles(feed_id, pub_ts)
+            """)
+            cursor.execute("DROP INDEX IF EXISTS idx_articles_feed_url")
+            
+            logger.info(f"  ➕ feed_id renseigné pour {filled} articles")
+            conn.commit()
+            
+        finally:
+            conn.close()
+    
     def get_migration_status(self) -> dict:
         """Retourne le statut des migrations"""
         conn = self.db_manager.get_connection()
@@ -0,0 +1,365 @@
+# Flask/feed_registry.py
+"""
+Registre persistant des flux RSS
+Import en masse (liste d'URL, une par ligne, ou OPML) dans la table feeds
+et validation concurrente : chaque flux est téléchargé avec un timeout et
+son statut HTTP, son nombre d'items et son titre sont enregistrés.
+"""
+
+import logging
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+import feedparser
+import requests
+from .database import DatabaseManager
+from .http_client import get_http_client
+from .config import (
+    FEED_USER_AGENT, FEED_VALIDATION_WORKERS, FEED_VALIDATION_TIMEOUT,
+    FEED_VALIDATION_MAX_BYTES
+)
+
+logger = logging.getLogger(__name__)
+
+# Résultats de validation écrits en base par lots
+VALIDATION_FLUSH_SIZE = 100
+
+
+def parse_feed_list(content: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Extrait les (url, titre) d'un document OPML ou d'une liste texte
+    (une URL par ligne, lignes vides et commentaires # ignorés)
+    Les doublons sont retirés en conservant l'ordre
+    """
+    entries = []
+
+    if '<opml' in content[:1000].lower():
+        root = ET.fromstring(content.encode('utf-8'))
+        for outline in root.iter('outline'):
+            url = outline.get('xmlUrl') or outline.get('xmlurl')
+            if url:
+                entries.append((url.strip(), outline.get('title') or outline.get('text')))
+    else:
+        for line in content.splitlines():
+            line = line.strip()
+            if line and not line.startswith('#'):
+                entries.append((line, None))
+
+    seen = set()
+    unique = []
+    for url, title in entries:
+        if url.startswith(('http://', 'https://')) and url not in seen:
+            seen.add(url)
+            unique.append((url, title))
+    return unique
+
+
+def probe_feed(url: str, timeout: float = FEED_VALIDATION_TIMEOUT,
+               max_bytes: int = FEED_VALIDATION_MAX_BYTES) -> Dict[str, Any]:
+    """
+    Télécharge un flux et retourne statut HTTP, nombre d'items, titre, erreur
+    Le corps est lu en streaming et abandonné au-delà de max_bytes
+    """
+    result = {'url': url, 'http_status': None, 'item_count': 0, 'title': None, 'error': None}
+
+    try:
+        response = get_http_client().get(
+            url, headers={'User-Agent': FEED_USER_AGENT}, timeout=timeout, stream=True
+        )
+    except requests.RequestException as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+
+    try:
+        result['http_status'] = response.status_code
+        if response.status_code >= 400:
+            result['error'] = f"HTTP {response.status_code}"
+            return result
+
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body.extend(chunk)
+            if len(body) > max_bytes:
+                result['error'] = f"Flux trop volumineux (> {max_bytes} octets)"
+                return result
+    except requests.RequestException as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        return result
+    finally:
+        response.close()
+
+    try:
+        feed = feedparser.parse(bytes(body))
+    except Exception as e:
+        result['error'] = f"Erreur parsing: {e}"
+        return result
+
+    result['item_count'] = len(feed.entries)
+    result['title'] = feed.feed.get('title')
+    if feed.bozo and not feed.entries:
+        result['error'] = f"Flux invalide: {feed.get('bozo_exception')}"
+    return result
+
+
+class FeedRegistry:
+    """
+    Accès à la table feeds : import, liste, validation en arrière-plan
+    Une seule validation à la fois ; sa progression est lisible via
+    get_validation_status()
+    """
+
+    def __init__(self, db_manager: DatabaseManager,
+                 workers: int = FEED_VALIDATION_WORKERS,
+                 timeout: float = FEED_VALIDATION_TIMEOUT):
+        self.db_manager = db_manager
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self._validation_lock = threading.Lock()
+        self._thread = None
+        self.validation = {
+            'running': False,
+            'total': 0,
+            'done': 0,
+            'valid': 0,
+            'invalid': 0,
+            'started_at': None,
+            'finished_at': None
+        }
+
+    # ------------------------------------------------------------------
+    # Import
+    # ------------------------------------------------------------------
+
+    def import_feeds(self, content: str, origin: str = 'import') -> Dict[str, Any]:
+        """Importe une liste texte ou OPML ; retourne les compteurs d'import"""
+        entries = parse_feed_list(content)
+
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("SELECT COUNT(*) FROM feeds")
+            before = cursor.fetchone()[0]
+
+            cursor.executemany("""
+                INSERT OR IGNORE INTO feeds (url, title, origin)
+                VALUES (?, ?, ?)
+            """, [(url, title, origin) for url, title in entries])
+
+            # Complète le titre des flux déjà connus (import OPML)
+            cursor.executemany("""
+                UPDATE feeds SET title = ? WHERE url = ? AND title IS NULL
+            """, [(title, url) for url, title in entries if title])
+
+            cursor.execute("SELECT COUNT(*) FROM feeds")
+            added = cursor.fetchone()[0] - before
+            conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Erreur import des flux: {e}")
+            raise
+        finally:
+            conn.close()
+
+        logger.info(f"📥 Import flux: {added} ajoutés sur {len(entries)} lus")
+        return {
+            'parsed': len(entries),
+            'added': added,
+            'already_registered': len(entries) - added
+        }
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def get_urls(self, enabled_only: bool = False) -> List[str]:
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            query = "SELECT url FROM feeds"
+            if enabled_only:
+                query += " WHERE enabled = 1"
+            cursor.execute(query + " ORDER BY url")
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def list_feeds(self, status: str = None, limit: int = 100,
+                   offset: int = 0) -> Dict[str, Any]:
+        """
+        Flux du registre avec leur dernier résultat de validation, leur
+        nombre d'articles et la date du plus récent (index feed_id, pub_ts)
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            where = "WHERE validation_status = ?" if status else ""
+            params = [status] if status else []
+
+            cursor.execute(f"SELECT COUNT(*) FROM feeds {where}", params)
+            total = cursor.fetchone()[0]
+
+            cursor.execute(f"""
+                SELECT id, url, title, origin, enabled, validation_status,
+                       http_status, item_count, validation_error, validated_at,
+                       (SELECT COUNT(*) FROM articles a WHERE a.feed_id = feeds.id) AS article_count,
+                       (SELECT MAX(a.pub_ts) FROM articles a WHERE a.feed_id = feeds.id) AS last_article_ts
+                FROM feeds {where}
+                ORDER BY id
+                LIMIT ? OFFSET ?
+            """, params + [limit, offset])
+
+            columns = [col[0] for col in cursor.description]
+            feeds = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+            cursor.execute("""
+                SELECT validation_status, COUNT(*) FROM feeds
+                GROUP BY validation_status
+            """)
+            by_status = {row[0]: row[1] for row in cursor.fetchall()}
+
+            return {'total': total, 'feeds': feeds, 'by_status': by_status}
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------
+
+    def _select_for_validation(self, urls: List[str] = None, pending_only: bool = True) -> List[str]:
+        if urls:
+            # Les URL inconnues sont enregistrées, sinon leur résultat
+            # ne trouverait aucune ligne à mettre à jour
+            targets = list(dict.fromkeys(urls))
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+
+            try:
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO feeds (url, origin) VALUES (?, 'manual')
+                """, [(url,) for url in targets])
+                conn.commit()
+            finally:
+                conn.close()
+            return targets
+
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            query = "SELECT url FROM feeds"
+            if pending_only:
+                query += " WHERE validation_status = 'pending'"
+            cursor.execute(query + " ORDER BY id")
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def _store_results(self, results: List[Dict[str, Any]]):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.executemany("""
+                UPDATE feeds
+                SET validation_status = ?, http_status = ?, item_count = ?,
+                    validation_error = ?, validated_at = ?,
+                    title = COALESCE(title, ?)
+                WHERE url = ?
+            """, [
+                (
+                    'error' if r['error'] else 'valid',
+                    r['http_status'],
+                    r['item_count'],
+                    r['error'],
+                    r['validated_at'],
+                    r['title'],
+                    r['url']
+                )
+                for r in results
+            ])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def validate(self, urls: List[str] = None, pending_only: bool = True) -> Dict[str, Any]:
+        """
+        Valide les flux (par défaut : ceux jamais validés) dans un pool de
+        threads ; les résultats sont écrits par lots de VALIDATION_FLUSH_SIZE
+        """
+        with self._validation_lock:
+            targets = self._select_for_validation(urls, pending_only)
+            self.validation.update({
+                'running': True,
+                'total': len(targets),
+                'done': 0,
+                'valid': 0,
+                'invalid': 0,
+                'started_at': time.time(),
+                'finished_at': None
+            })
+            logger.info(f"🔎 Validation de {len(targets)} flux ({self.workers} workers, timeout {self.timeout}s)")
+
+            pending = []
+            try:
+                with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='feed-validate') as executor:
+                    futures = [executor.submit(probe_feed, url, self.timeout) for url in targets]
+                    for future in as_completed(futures):
+                        result = future.result()
+                        result['validated_at'] = time.time()
+                        pending.append(result)
+
+                        self.validation['done'] += 1
+                        self.validation['invalid' if result['error'] else 'valid'] += 1
+
+                        if len(pending) >= VALIDATION_FLUSH_SIZE:
+                            self._store_results(pending)
+                            pending = []
+            finally:
+                if pending:
+                    self._store_results(pending)
+                self.validation['running'] = False
+                self.validation['finished_at'] = time.time()
+
+            logger.info(f"✅ Validation terminée: {self.validation['valid']} valides, "
+                        f"{self.validation['invalid']} en erreur")
+            return self.get_validation_status()
+
+    def validate_async(self, urls: List[str] = None, pending_only: bool = True) -> bool:
+        """Lance la validation en arrière-plan ; False si une est déjà en cours"""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+
+        def run():
+            try:
+                self.validate(urls, pending_only)
+            except Exception as e:
+                logger.error(f"❌ Erreur validation des flux: {e}")
+
+        self._thread = threading.Thread(target=run, name='feed-validation')
+        self._thread.daemon = True
+        self._thread.start()
+        return True
+
+    def get_validation_status(self) -> Dict[str, Any]:
+        status = dict(self.validation)
+        if status['started_at']:
+            end = status['finished_at'] or time.time()
+            status['elapsed_seconds'] = round(end - status['started_at'], 1)
+        return status
+
+
+# Instance globale
+_feed_registry = None
+
+def get_feed_registry(db_manager: DatabaseManager) -> FeedRegistry:
+    """Retourne l'instance singleton du registre de flux"""
+    global _feed_registry
+    if _feed_registry is None:
+        _feed_registry = FeedRegistry(db_manager)
+    return _feed_registry
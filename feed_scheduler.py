@@ -0,0 +1,440 @@
+# Flask/feed_scheduler.py
+"""
+Planificateur adaptatif des flux RSS
+File de priorité (tas) des flux indexée par leur prochaine échéance :
+l'intervalle de chaque flux suit son rythme de publication observé et
+s'allonge en cas d'erreurs. Les téléchargements passent par un seau à
+jetons et les échéances sont légèrement aléatoires pour lisser la charge.
+
+Tourne dans l'application (FEED_SCHEDULER_ENABLED) ou dans un processus
+séparé : python -m Flask.feed_scheduler
+"""
+
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from .database import DatabaseManager
+from .http_client import TokenBucket
+from .profiling import profile_job
+from .config import (
+    UPDATE_INTERVAL, MAX_ARTICLES_PER_FEED, FEED_SCHEDULER_WORKERS,
+    FEED_FETCH_RATE, FEED_MIN_INTERVAL, FEED_MAX_INTERVAL,
+    FEED_TARGET_NEW_ARTICLES, FEED_INTERVAL_JITTER
+)
+
+logger = logging.getLogger(__name__)
+
+# Poids de la dernière observation dans la moyenne du rythme de publication
+RATE_SMOOTHING = 0.3
+# Allongement de l'intervalle quand un flux ne publie rien
+IDLE_BACKOFF = 1.5
+# Secondes entre deux relectures de la table feeds (flux ajoutés ailleurs)
+RELOAD_INTERVAL = 300
+
+
+class FeedScheduler:
+    """
+    Boucle de planification : dépile les flux échus, les télécharge dans
+    un pool de threads puis les replanifie selon compute_interval
+    """
+
+    def __init__(self, db_manager: DatabaseManager, rss_manager=None,
+                 base_interval: float = UPDATE_INTERVAL,
+                 min_interval: float = FEED_MIN_INTERVAL,
+                 max_interval: float = FEED_MAX_INTERVAL,
+                 workers: int = FEED_SCHEDULER_WORKERS,
+                 fetch_rate: float = FEED_FETCH_RATE):
+        if rss_manager is None:
+            from .rss_manager import RSSManager
+            rss_manager = RSSManager(db_manager)
+
+        self.db_manager = db_manager
+        self.rss_manager = rss_manager
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.workers = max(1, workers)
+        self.limiter = TokenBucket(fetch_rate, capacity=self.workers)
+
+        self._heap: List[tuple] = []          # (next_due, feed_id, url)
+        # feed_id → échéance en vigueur (None pendant le téléchargement) ;
+        # les entrées du tas qui ne correspondent plus sont ignorées
+        self._due: Dict[int, Optional[float]] = {}
+        self._cond = threading.Condition()
+        self._slots = threading.Semaphore(self.workers)
+        self._executor = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.in_flight = 0
+        self.stats = {'fetches': 0, 'not_modified': 0, 'errors': 0, 'new_articles': 0}
+
+    # ------------------------------------------------------------------
+    # Politique d'intervalle
+    # ------------------------------------------------------------------
+
+    def compute_interval(self, interval: Optional[float], rate: Optional[float],
+                         new_articles: int, elapsed: Optional[float],
+                         errors: int) -> tuple:
+        """
+        Nouvel intervalle (secondes) et rythme de publication lissé
+        (articles/seconde) après un téléchargement
+
+        - erreur : recul exponentiel depuis l'intervalle de base
+        - fenêtre saturée (MAX_ARTICLES_PER_FEED nouveaux) : intervalle minimal
+        - sinon : intervalle visant FEED_TARGET_NEW_ARTICLES par passage,
+          allongé de IDLE_BACKOFF tant que le flux ne publie rien
+        """
+        interval = interval or self.base_interval
+
+        if errors:
+            interval = self.base_interval * (2 ** min(errors, 10))
+            return min(self.max_interval, interval), rate
+
+        if elapsed and elapsed > 0:
+            observed = new_articles / elapsed
+            rate = observed if rate is None else (
+                RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * rate
+            )
+
+        if new_articles >= MAX_ARTICLES_PER_FEED:
+            interval = self.min_interval
+        elif new_articles == 0:
+            interval = interval * IDLE_BACKOFF
+        elif rate:
+            interval = FEED_TARGET_NEW_ARTICLES / rate
+
+        return max(self.min_interval, min(self.max_interval, interval)), rate
+
+    def _jitter(self, interval: float) -> float:
+        return interval * random.uniform(1 - FEED_INTERVAL_JITTER, 1 + FEED_INTERVAL_JITTER)
+
+    # ------------------------------------------------------------------
+    # File de priorité
+    # ------------------------------------------------------------------
+
+    def _push(self, next_due: float, feed_id: int, url: str):
+        with self._cond:
+            heapq.heappush(self._heap, (next_due, feed_id, url))
+            self._due[feed_id] = next_due
+            self._cond.notify()
+
+    def load(self) -> int:
+        """
+        Ajoute au tas les flux actifs qui n'y sont pas encore
+        Un flux jamais planifié reçoit une échéance aléatoire dans le
+        premier intervalle : pas de rafale au démarrage
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("SELECT id, url, next_due FROM feeds WHERE enabled = 1")
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        now = time.time()
+        added = 0
+        for feed_id, url, next_due in rows:
+            if feed_id in self._due:
+                continue
+            if next_due is None:
+                next_due = now + random.uniform(0, self.base_interval)
+            self._push(next_due, feed_id, url)
+            added += 1
+        return added
+
+    def register_feeds(self, urls: List[str], due_now: bool = False) -> int:
+        """Enregistre des flux dans la table feeds et les planifie"""
+        urls = [url.strip() for url in urls if url and url.strip()]
+        if not urls:
+            return 0
+
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.executemany("INSERT OR IGNORE INTO feeds (url) VALUES (?)", [(url,) for url in urls])
+            inserted = cursor.rowcount
+            if due_now:
+                placeholders = ','.join('?' * len(urls))
+                cursor.execute(f"UPDATE feeds SET next_due = ? WHERE url IN ({placeholders})",
+                               [time.time()] + urls)
+            conn.commit()
+        finally:
+            conn.close()
+
+        if self._thread is not None:
+            self.load()
+            if due_now:
+                self.reschedule_now(urls)
+        return max(inserted, 0)
+
+    def reschedule_now(self, urls: List[str]):
+        """Avance l'échéance de flux déjà planifiés (hors téléchargements en cours)"""
+        wanted = set(urls)
+        with self._cond:
+            entries = [(feed_id, url) for _, feed_id, url in self._heap
+                       if url in wanted and self._due.get(feed_id) is not None]
+        now = time.time()
+        for feed_id, url in dict(entries).items():
+            self._push(now, feed_id, url)
+
+    # ------------------------------------------------------------------
+    # Boucle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Démarre la boucle de planification (idempotent)"""
+        if self.running:
+            return
+
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='feed-fetch')
+        count = self.load()
+        self._thread = threading.Thread(target=self._run, name='feed-scheduler')
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"✅ Planificateur de flux démarré ({count} flux, {self.workers} workers)")
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_forever(self):
+        """Mode worker séparé : bloque jusqu'à l'interruption"""
+        self.start()
+        try:
+            while self._thread.is_alive():
+                self._thread.join(1.0)
+        except KeyboardInterrupt:
+            logger.info("🛑 Arrêt du planificateur de flux")
+            self.stop()
+
+    def _next_due_feed(self) -> Optional[tuple]:
+        """Attend la prochaine échéance ; None si arrêt ou relecture due"""
+        with self._cond:
+            while not self._stop.is_set():
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    due, feed_id, url = heapq.heappop(self._heap)
+                    if self._due.get(feed_id) != due:
+                        continue  # entrée remplacée par une échéance plus récente
+                    self._due[feed_id] = None
+                    return due, feed_id, url
+                wait = self._heap[0][0] - now if self._heap else RELOAD_INTERVAL
+                if not self._cond.wait(min(wait, RELOAD_INTERVAL)):
+                    return None
+        return None
+
+    def _run(self):
+        last_reload = time.time()
+
+        while not self._stop.is_set():
+            if time.time() - last_reload > RELOAD_INTERVAL:
+                self.load()
+                last_reload = time.time()
+
+            item = self._next_due_feed()
+            if item is None:
+                continue
+
+            # Débit borné (jetons) et au plus `workers` téléchargements en cours :
+            # les flux restent dans le tas plutôt que dans la file du pool
+            self._slots.acquire()
+            self.limiter.acquire()
+            with self._cond:
+                self.in_flight += 1
+            try:
+                self._executor.submit(self._process, *item)
+            except RuntimeError:
+                self._release()
+                break
+
+    def _release(self):
+        with self._cond:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _process(self, due: float, feed_id: int, url: str):
+        try:
+            with profile_job('feed_scheduler'):
+                next_due = self.update_feed(feed_id, url)
+        except Exception as e:
+            logger.error(f"❌ Erreur planification flux {url}: {e}")
+            next_due = time.time() + self._jitter(self.base_interval)
+        finally:
+            self._release()
+
+        if next_due is None or self._stop.is_set():
+            with self._cond:
+                self._due.pop(feed_id, None)
+        else:
+            self._push(next_due, feed_id, url)
+
+    def update_feed(self, feed_id: int, url: str) -> Optional[float]:
+        """
+        Télécharge un flux, enregistre ses nouveaux articles et son nouvel
+        état de planification ; retourne la prochaine échéance (None si
+        le flux a été désactivé entre-temps)
+        """
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT enabled, interval_seconds, last_fetched, publish_rate,
+                       consecutive_errors, etag, last_modified
+                FROM feeds WHERE id = ?
+            """, (feed_id,))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+        if row is None or not row[0]:
+            return None
+        _, interval, last_fetched, rate, errors, etag, modified = row
+
+        fetched_at = time.time()
+        result = self.rss_manager.fetch_feed(url, etag, modified)
+        self.stats['fetches'] += 1
+
+        new_articles = 0
+        if result['error']:
+            errors = (errors or 0) + 1
+            self.stats['errors'] += 1
+            logger.warning(f"⚠️ Flux {url} en erreur ({errors}x): {result['error']}")
+        else:
+            errors = 0
+            if result['not_modified']:
+                self.stats['not_modified'] += 1
+            else:
+                new_articles = self.rss_manager.ingest_articles(result['articles'])
+                self.stats['new_articles'] += new_articles
+
+        elapsed = fetched_at - last_fetched if last_fetched else None
+        interval, rate = self.compute_interval(interval, rate, new_articles, elapsed, errors)
+        next_due = fetched_at + self._jitter(interval)
+
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                UPDATE feeds
+                SET interval_seconds = ?, next_due = ?, last_fetched = ?,
+                    last_new_articles = ?, publish_rate = ?, consecutive_errors = ?,
+                    last_error = ?, etag = ?, last_modified = ?
+                WHERE id = ?
+            """, (
+                interval, next_due, fetched_at, new_articles, rate, errors,
+                result['error'], result['etag'], result['modified'], feed_id
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+        if new_articles:
+            logger.info(f"📰 {url}: {new_articles} nouveaux articles (prochain passage dans {int(interval)}s)")
+        return next_due
+
+    # ------------------------------------------------------------------
+    # Supervision
+    # ------------------------------------------------------------------
+
+    def get_status(self) -> Dict[str, Any]:
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT COUNT(*),
+                       COUNT(CASE WHEN enabled = 1 THEN 1 END),
+                       COUNT(CASE WHEN consecutive_errors > 0 THEN 1 END),
+                       AVG(interval_seconds), MIN(interval_seconds), MAX(interval_seconds)
+                FROM feeds
+            """)
+            total, enabled, failing, avg_interval, min_interval, max_interval = cursor.fetchone()
+
+            cursor.execute("""
+                SELECT url, interval_seconds, publish_rate, last_new_articles
+                FROM feeds
+                WHERE enabled = 1 AND publish_rate IS NOT NULL
+                ORDER BY publish_rate DESC LIMIT 10
+            """)
+            fastest = [
+                {
+                    'url': url,
+                    'interval_seconds': round(interval or 0),
+                    'articles_per_hour': round((rate or 0) * 3600, 2),
+                    'last_new_articles': last_new
+                }
+                for url, interval, rate, last_new in cursor.fetchall()
+            ]
+        finally:
+            conn.close()
+
+        with self._cond:
+            pending = [due for due in self._due.values() if due is not None]
+        next_due = min(pending) if pending else None
+        queued = len(pending)
+
+        return {
+            'running': self.running,
+            'feeds': total,
+            'enabled_feeds': enabled,
+            'failing_feeds': failing,
+            'queued': queued,
+            'in_flight': self.in_flight,
+            'next_due_in': round(next_due - time.time(), 1) if next_due else None,
+            'interval_seconds': {
+                'avg': round(avg_interval) if avg_interval else None,
+                'min': round(min_interval) if min_interval else None,
+                'max': round(max_interval) if max_interval else None
+            },
+            'fastest_feeds': fastest,
+            **self.stats
+        }
+
+
+# Instance globale
+_feed_scheduler = None
+
+def get_feed_scheduler(db_manager: DatabaseManager, rss_manager=None) -> FeedScheduler:
+    """Retourne l'instance singleton du planificateur de flux"""
+    global _feed_scheduler
+    if _feed_scheduler is None:
+        _feed_scheduler = FeedScheduler(db_manager, rss_manager)
+    return _feed_scheduler
+
+
+def main():
+    """Worker séparé : planificateur seul, sans serveur web"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    from .database_migrations import run_migrations
+    from .service_lock import acquire_service_lock
+
+    # Un seul planificateur par base, application comprise
+    if not acquire_service_lock('feed_scheduler'):
+        logger.error("❌ Un planificateur des flux tourne déjà pour cette base")
+        raise SystemExit(1)
+
+    db_manager = DatabaseManager()
+    run_migrations(db_manager)
+    get_feed_scheduler(db_manager).run_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+# Configuration gunicorn : gunicorn -c gunicorn.conf.py wsgi:app
+# /api/live/dashboard garde une connexion SSE ouverte par onglet. Avec des
+# workers sync, chaque onglet bloquerait un worker entier et serait coupé
+# au bout de `timeout` ; avec gthread, une connexion occupe un thread et le
+# battement du worker ne dépend pas de la durée des requêtes.
+import os
+
+bind = os.environ.get('GEO_BIND', '0.0.0.0:5000')
+worker_class = 'gthread'
+workers = int(os.environ.get('GEO_WORKERS', 2))
+# Onglets du dashboard ouverts simultanément par worker, plus les requêtes courantes
+threads = int(os.environ.get('GEO_THREADS', 32))
+timeout = 30
+graceful_timeout = 10
+# Pas de preload : les tâches de fond doivent démarrer dans un worker (verrou des services)
+preload_app = False
@@ -0,0 +1,337 @@
+# Flask/http_client.py
+"""
+Couche HTTP sortante partagée
+Sessions poolées par hôte (keep-alive), politiques de retry/backoff
+et métriques de temps par hôte
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """
+    Politique de nouvelle tentative avec backoff exponentiel
+    Remplace les boucles ad hoc `time.sleep(2 ** attempt)`
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 1.0,
+                 backoff_factor: float = 2.0, max_backoff: float = 30.0,
+                 retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Délai avant la tentative suivante (attempt commence à 0)"""
+        return min(self.max_backoff, self.backoff_base * (self.backoff_factor ** attempt))
+
+    def wait(self, attempt: int):
+        """Attend le délai de backoff si une tentative reste possible"""
+        if attempt < self.max_attempts - 1:
+            delay = self.backoff(attempt)
+            logger.debug(f"⏳ Backoff: pause de {delay:.2f}s")
+            time.sleep(delay)
+
+    def should_retry_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+
+# Aucune nouvelle tentative (comportement par défaut des appels simples)
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur par hôte : après failure_threshold échecs consécutifs,
+    l'hôte est ignoré pendant reset_timeout secondes, puis une seule
+    requête d'essai est autorisée (état semi-ouvert)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def is_open(self) -> bool:
+        """
+        Vrai si aucune requête ne serait autorisée maintenant, sans changer
+        l'état (contrairement à allow_request, qui passe en semi-ouvert)
+        """
+        with self._lock:
+            if self._state == self.OPEN:
+                return time.monotonic() - self.opened_at < self.reset_timeout
+            return self._state == self.HALF_OPEN
+
+    def allow_request(self) -> bool:
+        """
+        Autorise une requête ; en fin de délai d'ouverture, passe en
+        semi-ouvert : l'appelant doit alors appeler record_success ou
+        record_failure, sinon le disjoncteur reste bloqué
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                return True
+            # Ouvert, ou essai semi-ouvert déjà en cours
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class TokenBucket:
+    """
+    Limiteur de débit thread-safe partagé (seau à jetons)
+    rate jetons par seconde, rafales jusqu'à capacity
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> float:
+        """Prend un jeton si possible ; sinon retourne l'attente nécessaire (secondes)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Attend qu'un jeton soit disponible"""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+class RateLimitedExecutor:
+    """
+    File de requêtes sortantes servie par des workers qui prennent un
+    jeton avant chaque appel : les threads web soumettent et récupèrent
+    un Future au lieu de dormir eux-mêmes. La file est FIFO, donc les
+    demandes de plusieurs appelants sont servies dans l'ordre d'arrivée.
+    Les soumissions identiques (même clé) en cours partagent le même Future.
+    """
+
+    def __init__(self, limiter: TokenBucket, max_workers: int = 2,
+                 thread_name_prefix: str = 'rate-limited'):
+        self.limiter = limiter
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix=thread_name_prefix)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, key: str = None, **kwargs) -> Future:
+        def run():
+            self.limiter.acquire()
+            return fn(*args, **kwargs)
+
+        if key is None:
+            return self._executor.submit(run)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(run)
+            self._inflight[key] = future
+
+        def forget(_):
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+        future.add_done_callback(forget)
+        return future
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+
+class HostMetrics:
+    """Compteurs de requêtes et de temps pour un hôte"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_status = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'avg_ms': round(self.total_ms / self.requests, 1) if self.requests else 0.0,
+            'max_ms': round(self.max_ms, 1),
+            'last_status': self.last_status
+        }
+
+
+class HttpClient:
+    """
+    Client HTTP sortant : une session requests poolée par hôte,
+    réutilisée entre les appels (pas de nouvelle poignée de main TCP/TLS)
+    """
+
+    def __init__(self, pool_maxsize: int = 10, default_timeout: float = 30,
+                 default_headers: Optional[Dict[str, str]] = None):
+        self.pool_maxsize = pool_maxsize
+        self.default_timeout = default_timeout
+        self.default_headers = default_headers or {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._metrics: Dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _host_key(self, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _get_session(self, host: str) -> requests.Session:
+        """Retourne (ou crée) la session poolée de l'hôte"""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(self.default_headers)
+                self._sessions[host] = session
+                self._metrics[host] = HostMetrics()
+            return session
+
+    def _record(self, host: str, elapsed_ms: float, status: Optional[int],
+                error: bool, retry: bool):
+        with self._lock:
+            metrics = self._metrics.setdefault(host, HostMetrics())
+            metrics.requests += 1
+            metrics.total_ms += elapsed_ms
+            metrics.max_ms = max(metrics.max_ms, elapsed_ms)
+            if status is not None:
+                metrics.last_status = status
+            if error:
+                metrics.errors += 1
+            if retry:
+                metrics.retries += 1
+
+    def request(self, method: str, url: str, retry: RetryPolicy = None,
+                **kwargs) -> requests.Response:
+        """
+        Effectue une requête avec la session de l'hôte
+
+        Les exceptions requests (Timeout, ConnectionError...) sont relevées
+        après la dernière tentative ; une réponse dont le statut reste dans
+        retry.retry_statuses est retournée telle quelle.
+        """
+        retry = retry or NO_RETRY
+        kwargs.setdefault('timeout', self.default_timeout)
+        host = self._host_key(url)
+        session = self._get_session(host)
+
+        for attempt in range(retry.max_attempts):
+            is_last = attempt == retry.max_attempts - 1
+            start = time.perf_counter()
+            try:
+                response = session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self._record(host, elapsed_ms, None, error=True, retry=not is_last)
+                if is_last:
+                    raise
+                logger.warning(f"⚠️ {method} {host} (tentative {attempt + 1}/{retry.max_attempts}): {e}")
+                retry.wait(attempt)
+                continue
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            should_retry = retry.should_retry_status(response.status_code) and not is_last
+            self._record(host, elapsed_ms, response.status_code,
+                         error=response.status_code >= 400, retry=should_retry)
+
+            if not should_retry:
+                return response
+
+            logger.warning(f"⚠️ {method} {host} HTTP {response.status_code} "
+                           f"(tentative {attempt + 1}/{retry.max_attempts})")
+            response.close()
+            retry.wait(attempt)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Métriques par hôte (requêtes, erreurs, retries, temps)"""
+        with self._lock:
+            return {host: metrics.to_dict() for host, metrics in self._metrics.items()}
+
+    def close(self):
+        """Ferme toutes les sessions poolées"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+# Instance globale
+_http_client = None
+
+def get_http_client() -> HttpClient:
+    """Retourne le client HTTP partagé par tous les modules sortants"""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
+
+def set_http_client(client: HttpClient):
+    """Remplace le client partagé (ex: tests contre un serveur local)"""
+    global _http_client
+    _http_client = client
@@ -0,0 +1,275 @@
+# Flask/live_updates.py
+"""
+Mises à jour en direct du dashboard (Server-Sent Events)
+Après chaque ingestion, un seul calcul de delta (nouveaux articles,
+sentiments, thèmes, alertes d'anomalie) est publié à tous les onglets
+abonnés : la charge suit le volume de données, pas le nombre de lecteurs.
+"""
+
+import json
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, Optional
+from .database import DatabaseManager, days_ago_timestamp
+from .profiling import profile_job
+from .config import (
+    LIVE_EVENT_HISTORY, LIVE_QUEUE_SIZE, LIVE_POLL_INTERVAL,
+    LIVE_HEARTBEAT, LIVE_ANOMALY_Z
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """File d'événements d'un client SSE"""
+
+    def __init__(self, size: int):
+        self.queue: "queue.Queue[tuple]" = queue.Queue(maxsize=size)
+        self.overflowed = False
+
+
+class EventBus:
+    """
+    Publication/abonnement en mémoire
+    Les derniers événements sont conservés pour rejouer ceux manqués
+    après une reconnexion (en-tête Last-Event-ID) ; un client trop lent
+    ou trop longtemps déconnecté reçoit un événement 'resync'.
+    """
+
+    def __init__(self, history: int = LIVE_EVENT_HISTORY, queue_size: int = LIVE_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any]) -> int:
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            message = (event_id, event, json.dumps(data, ensure_ascii=False, default=str))
+            self._history.append(message)
+
+            for subscription in self._subscribers:
+                if subscription.overflowed:
+                    continue
+                try:
+                    subscription.queue.put_nowait(message)
+                except queue.Full:
+                    subscription.overflowed = True
+        return event_id
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        subscription = Subscription(self.queue_size)
+
+        with self._lock:
+            if last_event_id is not None:
+                missed = [m for m in self._history if m[0] > last_event_id]
+                oldest = self._history[0][0] if self._history else self._next_id
+                if last_event_id < oldest - 1 or len(missed) > self.queue_size:
+                    subscription.overflowed = True
+                else:
+                    for message in missed:
+                        subscription.queue.put_nowait(message)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stream(self, subscription: Subscription, heartbeat: float = LIVE_HEARTBEAT) -> Iterator[str]:
+        """Générateur du flux text/event-stream d'un abonné"""
+        try:
+            yield f"retry: 5000\nevent: hello\ndata: {json.dumps({'subscribers': self.subscriber_count})}\n\n"
+            while True:
+                if subscription.overflowed:
+                    # Le client recharge l'état complet puis reprend les deltas
+                    subscription.overflowed = False
+                    with subscription.queue.mutex:
+                        subscription.queue.queue.clear()
+                    yield "event: resync\ndata: {}\n\n"
+                    continue
+                try:
+                    event_id, event, data = subscription.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": ping\n\n"
+                    continue
+                yield f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+
+class DashboardPublisher:
+    """
+    Calcule le delta du dashboard depuis le dernier article publié
+
+    notify() est appelé après chaque ingestion ; le thread de fond vérifie
+    aussi la base toutes les LIVE_POLL_INTERVAL secondes (articles écrits
+    par un autre processus, ex. le planificateur lancé séparément), par
+    une seule requête quel que soit le nombre d'abonnés.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, bus: EventBus,
+                 poll_interval: float = LIVE_POLL_INTERVAL,
+                 anomaly_z: float = LIVE_ANOMALY_Z):
+        self.db_manager = db_manager
+        self.bus = bus
+        self.poll_interval = poll_interval
+        self.anomaly_z = anomaly_z
+        self._last_id = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(target=self._run, name='live-dashboard')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def notify(self):
+        """Signale une ingestion terminée (non bloquant)"""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                with profile_job('live_dashboard'):
+                    self.publish_delta()
+            except Exception as e:
+                logger.error(f"❌ Erreur publication delta dashboard: {e}")
+
+    def _max_article_id(self, cursor) -> int:
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM articles")
+        return cursor.fetchone()[0]
+
+    def publish_delta(self) -> Optional[Dict[str, Any]]:
+        """Publie les nouveaux articles depuis le dernier delta ; None si rien"""
+        with self._lock:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+
+            try:
+                max_id = self._max_article_id(cursor)
+                if self._last_id is None or not self.bus.subscriber_count:
+                    # Sans abonné, le curseur avance sans calcul : un client
+                    # qui se connecte charge l'état complet via /api/stats
+                    self._last_id = max_id
+                    return None
+                if max_id <= self._last_id:
+                    return None
+
+                delta = self._compute_delta(cursor, self._last_id, max_id)
+                self._last_id = max_id
+            finally:
+                conn.close()
+
+        self.bus.publish('delta', delta)
+        logger.debug(f"📡 Delta dashboard publié: {delta['new_articles']} articles")
+        return delta
+
+    def _compute_delta(self, cursor, after_id: int, max_id: int) -> Dict[str, Any]:
+        cursor.execute("""
+            SELECT id, title, feed_url, sentiment_type, sentiment_score, DATE(pub_ts, 'unixepoch')
+            FROM articles
+            WHERE id > ? AND id <= ?
+        """, (after_id, max_id))
+        rows = cursor.fetchall()
+
+        sentiment = {'positive': 0, 'negative': 0, 'neutral': 0}
+        timeline = {}
+        for _, _, _, sentiment_type, _, date in rows:
+            if sentiment_type in sentiment:
+                sentiment[sentiment_type] += 1
+                day = timeline.setdefault(date, {'positive': 0, 'negative': 0, 'neutral': 0})
+                day[sentiment_type] += 1
+
+        # Même seuil de confiance que /api/stats
+        cursor.execute("""
+            SELECT theme_id, COUNT(DISTINCT article_id)
+            FROM theme_analyses
+            WHERE article_id > ? AND article_id <= ? AND confidence >= 0.3
+            GROUP BY theme_id
+        """, (after_id, max_id))
+        themes = {theme_id: count for theme_id, count in cursor.fetchall()}
+
+        return {
+            'new_articles': len(rows),
+            'last_article_id': max_id,
+            'sentiment': sentiment,
+            'themes': themes,
+            'timeline': timeline,
+            'anomalies': self._detect_anomalies(cursor, rows, after_id),
+            'published_at': time.time()
+        }
+
+    def _detect_anomalies(self, cursor, rows, after_id: int) -> list:
+        """Nouveaux articles dont le score s'écarte de plus de anomaly_z écarts-types (7 jours)"""
+        cursor.execute("""
+            SELECT COUNT(*), AVG(sentiment_score), AVG(sentiment_score * sentiment_score)
+            FROM articles
+            WHERE pub_ts >= ? AND id <= ?
+              AND sentiment_score IS NOT NULL
+        """, (days_ago_timestamp(7), after_id))
+        count, mean, mean_sq = cursor.fetchone()
+        if not count or count < 10:
+            return []
+
+        std = math.sqrt(max(0.0, mean_sq - mean * mean))
+        if std == 0:
+            return []
+
+        anomalies = []
+        for article_id, title, feed_url, sentiment_type, score, _ in rows:
+            if score is None:
+                continue
+            z_score = (score - mean) / std
+            if abs(z_score) > self.anomaly_z:
+                anomalies.append({
+                    'article_id': article_id,
+                    'title': title,
+                    'feed_url': feed_url,
+                    'sentiment_type': sentiment_type,
+                    'score': score,
+                    'z_score': round(z_score, 2)
+                })
+        return anomalies
+
+
+# Instances globales
+_event_bus = None
+_dashboard_publisher = None
+_live_lock = threading.Lock()
+
+def get_event_bus() -> EventBus:
+    """Retourne le bus d'événements du processus"""
+    global _event_bus
+    if _event_bus is None:
+        with _live_lock:
+            if _event_bus is None:
+                _event_bus = EventBus()
+    return _event_bus
+
+
+def get_dashboard_publisher(db_manager: DatabaseManager) -> DashboardPublisher:
+    """Retourne l'instance singleton du publicateur de deltas"""
+    global _dashboard_publisher
+    if _dashboard_publisher is None:
+        bus = get_event_bus()  # hors du verrou : il n'est pas réentrant
+        with _live_lock:
+            if _dashboard_publisher is None:
+                _dashboard_publisher = DashboardPublisher(db_manager, bus)
+    return _dashboard_publisher
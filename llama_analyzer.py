@@ -9,6 +9,7 @@ import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
+from .http_client import HttpClient, get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +19,10 @@ class LlamaAnalyzer:
     Analyseur géopolitique utilisant Llama 3.2 en local
     """
     
-    def __init__(self, llama_endpoint: str = "http://localhost:8080"):
+    def __init__(self, llama_endpoint: str = "http://localhost:8080",
+                 http_client: HttpClient = None):
         self.llama_endpoint = llama_endpoint
+        self.http = http_client or get_http_client()
         self.timeout = 300  # 5 minutes timeout
         
         # Templates de prompts professionnels
@@ -33,7 +36,7 @@ class LlamaAnalyzer:
     def test_connection(self) -> bool:
         """Teste la connexion au serveur Llama"""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.llama_endpoint}/health",
                 timeout=5
             )
@@ -278,7 +281,7 @@ Format HTML."""
             
             # Appel à Llama
             logger.info("📡 Envoi du prompt à Llama...")
-            response = requests.post(
+            response = self.http.post(
                 f"{self.llama_endpoint}/v1/chat/completions",
                 json={
                     "model": "llama3.2-3b-Q4_K_M",
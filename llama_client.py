@@ -5,75 +5,30 @@ Gère la génération de rapports d'analyse géopolitique
 Version optimisée avec gestion d'erreurs robuste
 """
 
+import json
 import logging
+import threading
+import time
 import requests
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
+from .config import LLAMA_PARALLEL_SLOTS
+from .http_client import HttpClient, get_http_client
+from .metrics import LLM_REQUEST_SECONDS
 
 logger = logging.getLogger(__name__)
 
+# Préfixes statiques des prompts de rapport (rôle + structure attendue)
+# Ils ne doivent contenir AUCUNE donnée variable : toute modification
+# invalide le cache KV du serveur llama.cpp pour ce type de rapport.
+_INSTRUCTION_HEADER = """### Instruction:
+Tu es un analyste géopolitique professionnel. Analyse les articles ci-dessous et produis un rapport structuré.
 
-class LlamaClient:
-    """Client pour interagir avec llama.cpp server"""
-    
-    def __init__(self, endpoint: str = "http://localhost:8080"):
-        self.endpoint = endpoint
-        self.timeout = 180  # 3 minutes pour analyses longues
-        
-        # Templates de prompts par type de rapport
-        self.prompt_templates = {
-            'geopolitique': self._build_geopolitique_prompt,
-            'economique': self._build_economique_prompt,
-            'securite': self._build_securite_prompt,
-            'synthese': self._build_synthese_prompt
-        }
-    
-    def test_connection(self) -> bool:
-        """Teste la connexion au serveur Llama"""
-        try:
-            response = requests.get(
-                f"{self.endpoint}/health",
-                timeout=5
-            )
-            return response.status_code == 200
-        except Exception as e:
-            logger.error(f"Connexion Llama échouée: {e}")
-            return False
-    
-    def _build_geopolitique_prompt(self, articles: List[Dict], 
-                                   context: Dict) -> str:
-        """Construit le prompt pour analyse géopolitique"""
-        
-        # Résumé des sentiments
-        sentiment_summary = f"""
-Positifs: {context.get('sentiment_positive', 0)} articles
-Négatifs: {context.get('sentiment_negative', 0)} articles
-Neutres: {context.get('sentiment_neutral', 0)} articles
 """
-        
-        # Top articles
-        top_articles = "\n".join([
-            f"- {art['title']} ({art.get('source', 'source inconnue')})"
-            for art in articles[:10]
-        ])
-        
-        themes_text = ", ".join(context.get('themes', [])) or "Tous thèmes"
-        
-        prompt = f"""Tu es GEOPOL, expert en analyse géopolitique. Produis un rapport structuré et factuel.
-
-CONTEXTE
-========
-Période: {context.get('period', 'Non spécifiée')}
-Articles: {len(articles)}
-Thèmes: {themes_text}
-
-SENTIMENTS
-==========
-{sentiment_summary}
 
-ARTICLES CLÉS
-=============
-{top_articles}
+REPORT_PROMPT_PREFIXES = {
+    'geopolitique': _INSTRUCTION_HEADER + """Tu es GEOPOL, expert en analyse géopolitique. Produis un rapport structuré et factuel.
 
 RAPPORT DEMANDÉ
 ===============
@@ -102,28 +57,10 @@ CONSIGNES:
 - 800-1200 mots
 
 Commence par "## 1. SYNTHÈSE EXÉCUTIVE".
-"""
-        return prompt
-    
-    def _build_economique_prompt(self, articles: List[Dict], 
-                                 context: Dict) -> str:
-        """Construit le prompt pour analyse économique"""
-        
-        top_articles = "\n".join([
-            f"- {art['title']}"
-            for art in articles[:10]
-        ])
-        
-        prompt = f"""Tu es un analyste économique senior. Produis une analyse structurée.
 
-DONNÉES
-=======
-Période: {context.get('period', 'Non spécifiée')}
-Articles: {len(articles)}
-
-TITRES CLÉS
-===========
-{top_articles}
+### Articles à analyser:
+""",
+    'economique': _INSTRUCTION_HEADER + """Tu es un analyste économique senior. Produis une analyse structurée.
 
 RAPPORT ÉCONOMIQUE
 ==================
@@ -147,28 +84,10 @@ RAPPORT ÉCONOMIQUE
 - Facteurs de volatilité
 
 600-900 mots. Commence par "## 1. INDICATEURS MACROÉCONOMIQUES".
-"""
-        return prompt
-    
-    def _build_securite_prompt(self, articles: List[Dict], 
-                               context: Dict) -> str:
-        """Construit le prompt pour analyse sécurité"""
-        
-        top_articles = "\n".join([
-            f"- {art['title']}"
-            for art in articles[:8]
-        ])
-        
-        prompt = f"""Tu es un expert en sécurité internationale. Produis un briefing sécuritaire.
-
-CONTEXTE
-========
-Période: {context.get('period', 'Non spécifiée')}
-Articles: {len(articles)}
 
-ÉVÉNEMENTS
-==========
-{top_articles}
+### Articles à analyser:
+""",
+    'securite': _INSTRUCTION_HEADER + """Tu es un expert en sécurité internationale. Produis un briefing sécuritaire.
 
 BRIEFING SÉCURITAIRE
 ====================
@@ -190,28 +109,10 @@ BRIEFING SÉCURITAIRE
 - Zones prioritaires
 
 500-800 mots. Commence par "## 1. MENACES ÉMERGENTES".
-"""
-        return prompt
-    
-    def _build_synthese_prompt(self, articles: List[Dict], 
-                               context: Dict) -> str:
-        """Construit le prompt pour synthèse hebdomadaire"""
-        
-        top_articles = "\n".join([
-            f"- {art['title']}"
-            for art in articles[:15]
-        ])
-        
-        prompt = f"""Tu es GEOPOL, spécialiste en synthèse d'actualité. Produis une synthèse hebdomadaire.
 
-PÉRIODE
-=======
-{context.get('period', 'Dernière semaine')}
-{len(articles)} articles
-
-ARTICLES MAJEURS
-================
-{top_articles}
+### Articles à analyser:
+""",
+    'synthese': _INSTRUCTION_HEADER + """Tu es GEOPOL, spécialiste en synthèse d'actualité. Produis une synthèse hebdomadaire.
 
 SYNTHÈSE HEBDOMADAIRE
 =====================
@@ -232,8 +133,335 @@ SYNTHÈSE HEBDOMADAIRE
 - Échéances importantes
 
 600-900 mots. Commence par "## 1. FAITS MARQUANTS".
+
+### Articles à analyser:
+"""
+}
+
+# Slot llama.cpp réservé à chaque type de rapport
+REPORT_SLOTS = {
+    'geopolitique': 0,
+    'economique': 1,
+    'securite': 2,
+    'synthese': 3
+}
+
+
+def summary_slots() -> List[int]:
+    """
+    Slots réservés aux synthèses map-reduce : ceux qui suivent les slots
+    de rapport. Vide si LLAMA_PARALLEL_SLOTS ne dépasse pas le nombre de
+    types de rapport : rien n'est alors épinglé, pour que les synthèses
+    n'écrasent pas le cache KV d'un préfixe de rapport.
+    """
+    return list(range(len(REPORT_SLOTS), LLAMA_PARALLEL_SLOTS))
+
+
+def report_slot(report_type: str) -> Optional[int]:
+    """Slot épinglé du type de rapport, ou None (voir summary_slots)"""
+    if not summary_slots():
+        return None
+    return REPORT_SLOTS.get(report_type)
+
+
+class LlamaClient:
+    """Client pour interagir avec llama.cpp server"""
+    
+    def __init__(self, endpoint: str = "http://localhost:8080",
+                 http_client: HttpClient = None):
+        self.endpoint = endpoint
+        self.http = http_client or get_http_client()
+        self.timeout = 180  # 3 minutes pour analyses longues
+        
+        # Historique borné des temps llama.cpp (prompt vs génération)
+        self.timing_history = deque(maxlen=200)
+        self._timings_lock = threading.Lock()
+        
+        # Templates de prompts par type de rapport
+        self.prompt_templates = {
+            'geopolitique': self._build_geopolitique_prompt,
+            'economique': self._build_economique_prompt,
+            'securite': self._build_securite_prompt,
+            'synthese': self._build_synthese_prompt
+        }
+    
+    def test_connection(self) -> bool:
+        """Teste la connexion au serveur Llama"""
+        try:
+            response = self.http.get(
+                f"{self.endpoint}/health",
+                timeout=5
+            )
+            return response.status_code == 200
+        except Exception as e:
+            logger.error(f"Connexion Llama échouée: {e}")
+            return False
+    
+    def _format_key_articles(self, articles: List[Dict], context: Dict,
+                             limit: int, with_source: bool = False) -> str:
+        """
+        Liste des articles clés pour les prompts de rapport
+        Si le contexte contient des synthèses par lot (map-reduce), elles
+        remplacent la liste de titres et couvrent l'ensemble des articles
+        """
+        chunk_summaries = context.get('chunk_summaries')
+        if chunk_summaries:
+            return "\n\n".join([
+                f"[Lot {i + 1} - {summary.get('period', '')} - "
+                f"{summary.get('article_count', 0)} articles]\n{summary['summary']}"
+                for i, summary in enumerate(chunk_summaries)
+            ])
+        
+        if with_source:
+            return "\n".join([
+                f"- {art['title']} ({art.get('source', 'source inconnue')})"
+                for art in articles[:limit]
+            ])
+        return "\n".join([
+            f"- {art['title']}"
+            for art in articles[:limit]
+        ])
+    
+    def _build_chunk_summary_prompt(self, articles: List[Dict]) -> str:
+        """Construit le prompt de synthèse d'un lot d'articles (étape map)"""
+        articles_text = "\n".join([
+            f"- {art['title']} ({art.get('source', 'source inconnue')}): "
+            f"{(art.get('content') or '')[:300]}"
+            for art in articles
+        ])
+        
+        return f"""### Instruction:
+Tu es GEOPOL. Résume les articles ci-dessous en 3 à 5 puces factuelles (événements, acteurs, lieux).
+Ne garde que les faits présents dans les articles. Pas d'introduction ni de conclusion.
+
+### Articles:
+{articles_text}
+
+### Synthèse:
+"""
+    
+    def _build_reduce_prompt(self, summaries: List[str]) -> str:
+        """Construit le prompt de fusion de plusieurs synthèses (étape reduce)"""
+        summaries_text = "\n\n".join(summaries)
+        
+        return f"""### Instruction:
+Tu es GEOPOL. Fusionne les synthèses ci-dessous en 5 à 8 puces factuelles.
+Regroupe les faits redondants et conserve les événements majeurs.
+
+### Synthèses:
+{summaries_text}
+
+### Synthèse fusionnée:
 """
-        return prompt
+    
+    def _build_geopolitique_prompt(self, articles: List[Dict], 
+                                   context: Dict) -> str:
+        """Construit la partie variable du prompt pour analyse géopolitique"""
+        
+        # Résumé des sentiments
+        sentiment_summary = f"""
+Positifs: {context.get('sentiment_positive', 0)} articles
+Négatifs: {context.get('sentiment_negative', 0)} articles
+Neutres: {context.get('sentiment_neutral', 0)} articles
+"""
+        
+        # Top articles (ou synthèses par lot en mode map-reduce)
+        top_articles = self._format_key_articles(articles, context, 10, with_source=True)
+        
+        themes_text = ", ".join(context.get('themes', [])) or "Tous thèmes"
+        
+        return f"""CONTEXTE
+========
+Période: {context.get('period', 'Non spécifiée')}
+Articles: {len(articles)}
+Thèmes: {themes_text}
+
+SENTIMENTS
+==========
+{sentiment_summary}
+
+ARTICLES CLÉS
+=============
+{top_articles}
+"""
+    
+    def _build_economique_prompt(self, articles: List[Dict], 
+                                 context: Dict) -> str:
+        """Construit la partie variable du prompt pour analyse économique"""
+        
+        top_articles = self._format_key_articles(articles, context, 10)
+        
+        return f"""DONNÉES
+=======
+Période: {context.get('period', 'Non spécifiée')}
+Articles: {len(articles)}
+
+TITRES CLÉS
+===========
+{top_articles}
+"""
+    
+    def _build_securite_prompt(self, articles: List[Dict], 
+                               context: Dict) -> str:
+        """Construit la partie variable du prompt pour analyse sécurité"""
+        
+        top_articles = self._format_key_articles(articles, context, 8)
+        
+        return f"""CONTEXTE
+========
+Période: {context.get('period', 'Non spécifiée')}
+Articles: {len(articles)}
+
+ÉVÉNEMENTS
+==========
+{top_articles}
+"""
+    
+    def _build_synthese_prompt(self, articles: List[Dict], 
+                               context: Dict) -> str:
+        """Construit la partie variable du prompt pour synthèse hebdomadaire"""
+        
+        top_articles = self._format_key_articles(articles, context, 15)
+        
+        return f"""PÉRIODE
+=======
+{context.get('period', 'Dernière semaine')}
+{len(articles)} articles
+
+ARTICLES MAJEURS
+================
+{top_articles}
+"""
+    
+    def _build_instruction_prompt(self, report_type: str, articles: List[Dict],
+                                  context: Dict) -> str:
+        """
+        Construit le prompt complet (format instruction) envoyé à Llama
+        
+        Le préfixe statique (rôle + structure du rapport) vient en premier
+        et reste identique octet pour octet d'un rapport à l'autre : le
+        serveur llama.cpp réutilise alors son cache KV (cache_prompt) et
+        n'évalue que la partie variable (contexte et articles).
+        """
+        if report_type not in self.prompt_templates:
+            report_type = 'geopolitique'
+        
+        data_section = self.prompt_templates[report_type](articles, context)
+        
+        logger.info(f"🦙 Envoi prompt à Llama ({len(data_section)} caractères variables)")
+        
+        return (
+            REPORT_PROMPT_PREFIXES[report_type]
+            + data_section
+            + "\n### Rapport d'analyse:\n"
+        )
+    
+    def _completion_payload(self, instruction_prompt: str, stream: bool,
+                            report_type: str = None) -> Dict:
+        """Paramètres de génération communs aux modes bloquant et streaming"""
+        payload = {
+            "prompt": instruction_prompt,
+            "temperature": 0.7,
+            "max_tokens": 2500,
+            "stop": ["###", "\n\n\n\n"],
+            "stream": stream,
+            "cache_prompt": True
+        }
+        
+        # Un slot par type de rapport : son cache KV garde le préfixe statique
+        slot = report_slot(report_type)
+        if slot is not None:
+            payload["id_slot"] = slot
+        
+        return payload
+    
+    def _record_timings(self, report_type: str, data: Dict) -> Optional[Dict]:
+        """
+        Enregistre les temps d'évaluation du prompt et de génération
+        renvoyés par llama.cpp (champ 'timings')
+        """
+        timings = data.get('timings')
+        if not timings:
+            return None
+        
+        entry = {
+            'report_type': report_type,
+            'prompt_tokens': timings.get('prompt_n', 0),
+            'prompt_ms': round(timings.get('prompt_ms', 0.0), 1),
+            'cached_tokens': data.get('tokens_cached', 0),
+            'generated_tokens': timings.get('predicted_n', 0),
+            'generation_ms': round(timings.get('predicted_ms', 0.0), 1),
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        with self._timings_lock:
+            self.timing_history.append(entry)
+        
+        logger.info(
+            f"⏱️ Llama {report_type}: prompt {entry['prompt_tokens']} tok "
+            f"en {entry['prompt_ms']} ms, génération {entry['generated_tokens']} tok "
+            f"en {entry['generation_ms']} ms"
+        )
+        return entry
+    
+    def get_timing_stats(self) -> Dict:
+        """Moyennes des temps prompt/génération par type de rapport"""
+        with self._timings_lock:
+            history = list(self.timing_history)
+        
+        stats = {}
+        for entry in history:
+            report_stats = stats.setdefault(entry['report_type'], {
+                'calls': 0, 'prompt_ms': 0.0, 'generation_ms': 0.0,
+                'prompt_tokens': 0, 'cached_tokens': 0, 'generated_tokens': 0
+            })
+            report_stats['calls'] += 1
+            for key in ('prompt_ms', 'generation_ms', 'prompt_tokens',
+                        'cached_tokens', 'generated_tokens'):
+                report_stats[key] += entry[key]
+        
+        for report_stats in stats.values():
+            calls = report_stats['calls']
+            report_stats['avg_prompt_ms'] = round(report_stats['prompt_ms'] / calls, 1)
+            report_stats['avg_generation_ms'] = round(report_stats['generation_ms'] / calls, 1)
+        
+        return {
+            'by_report_type': stats,
+            'recent': history[-20:]
+        }
+    
+    def complete(self, prompt: str, max_tokens: int = 400,
+                 temperature: float = 0.3, slot: int = None) -> str:
+        """
+        Complétion brute (sans test de connexion ni mode dégradé)
+        slot : slot llama.cpp imposé (voir summary_slots)
+        Lève une exception si le serveur répond en erreur
+        """
+        payload = {
+            "prompt": prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stop": ["###"],
+            "stream": False,
+            "cache_prompt": True
+        }
+        if slot is not None:
+            payload["id_slot"] = slot
+        
+        with LLM_REQUEST_SECONDS.time(operation='summary'):
+            response = self.http.post(
+                f"{self.endpoint}/completion",
+                json=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout
+            )
+        
+        if response.status_code != 200:
+            raise Exception(f"Erreur serveur: {response.status_code}")
+        
+        data = response.json()
+        self._record_timings('summary', data)
+        return data.get('content', '').strip()
     
     def generate_analysis(self, report_type: str, articles: List[Dict],
                          context: Dict) -> Dict:
@@ -261,38 +489,19 @@ SYNTHÈSE HEBDOMADAIRE
             }
         
         try:
-            # Construire le prompt
-            prompt_builder = self.prompt_templates.get(
-                report_type, 
-                self._build_geopolitique_prompt
+            instruction_prompt = self._build_instruction_prompt(
+                report_type, articles, context
             )
-            prompt = prompt_builder(articles, context)
-            
-            logger.info(f"🦙 Envoi prompt à Llama ({len(prompt)} caractères)")
-            
-            # Format instruction (optimal pour Llama 3)
-            instruction_prompt = f"""### Instruction:
-Tu es un analyste géopolitique professionnel. Analyse les articles ci-dessous et produis un rapport structuré.
-
-### Articles à analyser:
-{prompt}
-
-### Rapport d'analyse:
-"""
             
             # Appel API
-            response = requests.post(
-                f"{self.endpoint}/completion",
-                json={
-                    "prompt": instruction_prompt,
-                    "temperature": 0.7,
-                    "max_tokens": 2500,
-                    "stop": ["###", "\n\n\n\n"],
-                    "stream": False
-                },
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout
-            )
+            with LLM_REQUEST_SECONDS.time(operation=report_type):
+                response = self.http.post(
+                    f"{self.endpoint}/completion",
+                    json=self._completion_payload(instruction_prompt, stream=False,
+                                                  report_type=report_type),
+                    headers={"Content-Type": "application/json"},
+                    timeout=self.timeout
+                )
             
             logger.info(f"📥 Réponse HTTP: {response.status_code}")
             
@@ -301,6 +510,7 @@ Tu es un analyste géopolitique professionnel. Analyse les articles ci-dessous e
             
             data = response.json()
             analysis_text = data.get('content', '').strip()
+            timings = self._record_timings(report_type, data)
             
             if not analysis_text or len(analysis_text) < 200:
                 raise Exception(f"Réponse invalide ({len(analysis_text)} chars)")
@@ -311,8 +521,9 @@ Tu es un analyste géopolitique professionnel. Analyse les articles ci-dessous e
                 'success': True,
                 'analysis': analysis_text,
                 'model_used': 'llama3.2-3b-Q4_K_M',
-                'prompt_tokens': len(prompt.split()),
-                'completion_tokens': len(analysis_text.split())
+                'prompt_tokens': len(instruction_prompt.split()),
+                'completion_tokens': len(analysis_text.split()),
+                'timings': timings
             }
             
         except requests.Timeout:
@@ -335,6 +546,100 @@ Tu es un analyste géopolitique professionnel. Analyse les articles ci-dessous e
                 )
             }
     
+    def stream_analysis(self, report_type: str, articles: List[Dict],
+                        context: Dict) -> Iterator[Dict]:
+        """
+        Génère une analyse avec Llama en mode streaming (SSE llama.cpp)
+        
+        Produit des événements au fil de la génération :
+            {'type': 'token', 'content': str}  pour chaque fragment reçu
+            {'type': 'done', 'success': bool, ...}  en fin de génération
+        
+        En cas d'échec, l'analyse de secours est émise comme un unique
+        fragment avant l'événement 'done'.
+        """
+        
+        def fallback(error: str) -> Iterator[Dict]:
+            yield {
+                'type': 'token',
+                'content': self._generate_fallback_analysis(
+                    report_type, articles, context
+                )
+            }
+            yield {'type': 'done', 'success': False, 'error': error}
+        
+        if not self.test_connection():
+            logger.warning("⚠️ Serveur Llama inaccessible - mode dégradé")
+            yield from fallback('Serveur Llama inaccessible')
+            return
+        
+        received_chars = 0
+        timings = None
+        
+        try:
+            instruction_prompt = self._build_instruction_prompt(
+                report_type, articles, context
+            )
+            
+            started = time.perf_counter()
+            response = self.http.post(
+                f"{self.endpoint}/completion",
+                json=self._completion_payload(instruction_prompt, stream=True,
+                                              report_type=report_type),
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout,
+                stream=True
+            )
+            
+            with response:
+                logger.info(f"📥 Réponse HTTP (stream): {response.status_code}")
+                
+                if response.status_code != 200:
+                    raise Exception(f"Erreur serveur: {response.status_code}")
+                
+                for line in response.iter_lines(decode_unicode=True):
+                    # llama.cpp envoie des lignes "data: {...}" séparées par des lignes vides
+                    if not line or not line.startswith('data:'):
+                        continue
+                    
+                    data = json.loads(line[len('data:'):].strip())
+                    content = data.get('content', '')
+                    
+                    if content:
+                        received_chars += len(content)
+                        yield {'type': 'token', 'content': content}
+                    
+                    if data.get('stop'):
+                        # Le dernier événement porte les timings de la génération
+                        timings = self._record_timings(report_type, data)
+                        break
+            
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, operation=f'{report_type}_stream')
+            logger.info(f"✅ Analyse streamée ({received_chars} caractères)")
+            
+            yield {
+                'type': 'done',
+                'success': True,
+                'model_used': 'llama3.2-3b-Q4_K_M',
+                'prompt_tokens': len(instruction_prompt.split()),
+                'timings': timings
+            }
+            
+        except requests.Timeout:
+            logger.error("⏱️ Timeout Llama (stream)")
+            if received_chars:
+                yield {'type': 'done', 'success': False, 'error': 'Timeout - analyse interrompue'}
+            else:
+                yield from fallback('Timeout - analyse trop longue')
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur Llama (stream): {e}")
+            if received_chars:
+                # Le texte déjà transmis reste affiché côté client
+                yield {'type': 'done', 'success': False, 'error': str(e)}
+            else:
+                yield from fallback(str(e))
+    
     def _generate_fallback_analysis(self, report_type: str, 
                                     articles: List[Dict],
                                     context: Dict) -> str:
@@ -0,0 +1,294 @@
+# Flask/metrics.py
+"""
+Instrumentation au format Prometheus (exposée sur /metrics)
+Compteurs, histogrammes et jauges sans dépendance externe. Avec
+METRICS_ENABLED = False, observe()/inc() retournent immédiatement et
+time() renvoie un gestionnaire de contexte vide partagé.
+
+Les jauges sont des fonctions évaluées au moment de la collecte :
+elles ne coûtent rien entre deux scrapes.
+"""
+
+import bisect
+import contextlib
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+from .config import METRICS_ENABLED
+
+logger = logging.getLogger(__name__)
+
+# Seuils (secondes) : de la milliseconde (scoring, écriture) à la minute (LLM)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_enabled = METRICS_ENABLED
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    global _enabled
+    _enabled = enabled
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if not self.labelnames:
+            return ()
+        return tuple([str(labels.get(name, '')) for name in self.labelnames])
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        if not _enabled or not amount:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # clé → [compteurs par seuil (non cumulés), somme, nombre]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        if not _enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def time(self, **labels):
+        """with HISTOGRAM.time(label=...): mesure la durée du bloc"""
+        if not _enabled:
+            return _NULL_TIMER
+        return _Timer(self, labels)
+
+    def drain(self) -> Dict[Tuple[str, ...], list]:
+        """Retire et retourne les séries (remontée depuis un processus worker)"""
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def merge(self, drained: Dict[Tuple[str, ...], list]):
+        """Ajoute des séries retournées par drain() dans un autre processus"""
+        if not _enabled or not drained:
+            return
+        with self._lock:
+            for key, (counts, total, count) in drained.items():
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                series[0] = [a + b for a, b in zip(series[0], counts)]
+                series[1] += total
+                series[2] += count
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(key, (list(s[0]), s[1], s[2])) for key, s in self._series.items()]
+
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+GaugeValue = Union[float, Dict[Tuple[str, ...], float], None]
+
+
+class Gauge(_Metric):
+    """Jauge calculée à la collecte par une fonction"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, fn: Callable[[], GaugeValue],
+                 labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        try:
+            value = self.fn()
+        except Exception as e:
+            logger.debug(f"Jauge {self.name} indisponible: {e}")
+            return []
+        if value is None:
+            return []
+        if isinstance(value, dict):
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {v}"
+                    for key, v in value.items() if v is not None]
+        return [f"{self.name} {value}"]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def gauge(self, name: str, documentation: str, fn: Callable[[], GaugeValue],
+              labelnames: Sequence[str] = ()) -> Gauge:
+        """Enregistre (ou remplace) une jauge calculée"""
+        return self.register(Gauge(name, documentation, fn, labelnames))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            samples = metric.render()
+            if samples or metric.kind != 'gauge':
+                lines.extend(metric.header())
+                lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+# ----------------------------------------------------------------------
+# Étapes du pipeline
+# ----------------------------------------------------------------------
+
+FEED_FETCH_SECONDS = REGISTRY.register(Histogram(
+    'geo_feed_fetch_seconds', 'Téléchargement HTTP d\'un flux RSS'))
+FEED_PARSE_SECONDS = REGISTRY.register(Histogram(
+    'geo_feed_parse_seconds', 'Parsing feedparser d\'un flux'))
+FEED_FETCHES = REGISTRY.register(Counter(
+    'geo_feed_fetches_total', 'Téléchargements de flux par résultat', ['result']))
+SENTIMENT_SECONDS = REGISTRY.register(Histogram(
+    'geo_sentiment_seconds', 'Scoring de sentiment d\'un texte par backend', ['backend']))
+SENTIMENT_BATCH_SECONDS = REGISTRY.register(Histogram(
+    'geo_sentiment_batch_seconds', 'Aller-retour d\'un lot vers le pool de scoring'))
+THEME_SCORING_SECONDS = REGISTRY.register(Histogram(
+    'geo_theme_scoring_seconds', 'Détection des thèmes d\'un article'))
+DB_WRITE_SECONDS = REGISTRY.register(Histogram(
+    'geo_db_write_seconds', 'Écriture d\'un article (insertion, thèmes, commit)'))
+CORROBORATION_SECONDS = REGISTRY.register(Histogram(
+    'geo_corroboration_seconds', 'Recherche de corroborations pour un article'))
+LLM_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'geo_llm_request_seconds', 'Appels au serveur llama.cpp', ['operation']))
+
+ARTICLES_INGESTED = REGISTRY.register(Counter(
+    'geo_articles_ingested_total', 'Articles enregistrés'))
+ARTICLES_DEDUPED = REGISTRY.register(Counter(
+    'geo_articles_deduped_total', 'Articles ignorés car déjà en base'))
+ARTICLES_FAILED = REGISTRY.register(Counter(
+    'geo_articles_failed_total', 'Articles en échec de traitement'))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'geo_cache_requests_total', 'Lectures de cache par résultat', ['cache', 'result']))
+
+
+def _cache_hit_ratios() -> Dict[Tuple[str, ...], float]:
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in list(CACHE_REQUESTS._values.items()):
+        hits_total = totals.setdefault(cache, [0, 0])
+        hits_total[1] += value
+        if result in ('hit', 'stale'):
+            hits_total[0] += value
+    return {(cache,): round(hits / total, 4) for cache, (hits, total) in totals.items() if total}
+
+
+REGISTRY.gauge('geo_cache_hit_ratio', 'Part des lectures servies par le cache', _cache_hit_ratios, ['cache'])
+
+
+def register_runtime_gauges(sentiment_service=None, feed_scheduler=None,
+                            archiviste=None, event_bus=None):
+    """Jauges des files et caches des composants de l'application"""
+    if sentiment_service is not None:
+        REGISTRY.gauge('geo_sentiment_queue_depth', 'Textes en attente de scoring',
+                       lambda: sentiment_service._queue.qsize())
+    if feed_scheduler is not None:
+        REGISTRY.gauge('geo_feed_scheduler_queued', 'Flux planifiés',
+                       lambda: sum(1 for due in list(feed_scheduler._due.values()) if due is not None))
+        REGISTRY.gauge('geo_feed_scheduler_in_flight', 'Flux en cours de téléchargement',
+                       lambda: feed_scheduler.in_flight)
+    if archiviste is not None:
+        REGISTRY.gauge('geo_archive_fetch_pending', 'Requêtes Archive.org en file',
+                       lambda: archiviste.fetch_queue.pending())
+    if event_bus is not None:
+        REGISTRY.gauge('geo_live_subscribers', 'Clients SSE connectés au dashboard',
+                       lambda: event_bus.subscriber_count)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,218 @@
+# Flask/model_registry.py
+"""
+Registre de modèles partagé par tout le processus
+Chaque modèle (VADER, Transformer...) est chargé une seule fois, au premier
+usage, puis partagé entre tous les analyseurs. Préchargement optionnel en
+arrière-plan et déchargement explicite ou après inactivité.
+"""
+
+import gc
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from .config import SENTIMENT_TRANSFORMER_MODEL, SENTIMENT_BACKEND, MODEL_IDLE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Délai avant de retenter un chargement qui a échoué (ex: hors ligne)
+LOAD_RETRY_DELAY = 600
+
+
+class _ModelSlot:
+    """État d'un modèle enregistré"""
+
+    def __init__(self, loader: Callable[[], Any]):
+        self.loader = loader
+        self.instance = None
+        self.loaded_at = None
+        self.last_used = None
+        self.failed_at = None
+        self.error = None
+        self.load_seconds = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Registre thread-safe de modèles chargés paresseusement
+    """
+
+    def __init__(self, idle_timeout: float = MODEL_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._slots: Dict[str, _ModelSlot] = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Enregistre un chargeur ; le modèle n'est pas chargé tout de suite"""
+        with self._lock:
+            self._slots[name] = _ModelSlot(loader)
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Retourne le modèle, en le chargeant au premier appel
+        Retourne None si le modèle est indisponible (chargement en échec)
+        """
+        slot = self._slots.get(name)
+        if slot is None:
+            return None
+
+        if slot.instance is None:
+            with slot.lock:
+                # Un autre thread a pu charger le modèle pendant l'attente du verrou
+                if slot.instance is None:
+                    if slot.failed_at and time.time() - slot.failed_at < LOAD_RETRY_DELAY:
+                        return None
+                    self._load(name, slot)
+
+        slot.last_used = time.time()
+        return slot.instance
+
+    def _load(self, name: str, slot: _ModelSlot):
+        start = time.perf_counter()
+        try:
+            logger.info(f"📦 Chargement du modèle {name}...")
+            slot.instance = slot.loader()
+            slot.loaded_at = time.time()
+            slot.failed_at = None
+            slot.error = None
+            slot.load_seconds = round(time.perf_counter() - start, 2)
+            logger.info(f"✅ Modèle {name} chargé en {slot.load_seconds}s")
+            self._ensure_reaper()
+        except Exception as e:
+            slot.instance = None
+            slot.failed_at = time.time()
+            slot.error = str(e)
+            logger.warning(f"⚠️ Impossible de charger le modèle {name}: {e}")
+
+    def is_loaded(self, name: str) -> bool:
+        slot = self._slots.get(name)
+        return slot is not None and slot.instance is not None
+
+    def warm_up(self, names: List[str] = None, background: bool = True):
+        """Précharge les modèles (en arrière-plan par défaut)"""
+        names = names or list(self._slots)
+
+        def load_all():
+            for name in names:
+                self.get(name)
+
+        if not background:
+            load_all()
+            return
+
+        thread = threading.Thread(target=load_all, name='model-warmup')
+        thread.daemon = True
+        thread.start()
+
+    def unload(self, name: str) -> bool:
+        """Décharge un modèle ; il sera rechargé au prochain usage"""
+        slot = self._slots.get(name)
+        if slot is None:
+            return False
+
+        with slot.lock:
+            was_loaded = slot.instance is not None
+            slot.instance = None
+            slot.loaded_at = None
+            slot.failed_at = None
+            slot.error = None
+
+        if was_loaded:
+            gc.collect()
+            logger.info(f"🗑️ Modèle {name} déchargé")
+        return was_loaded
+
+    def evict_idle(self) -> List[str]:
+        """Décharge les modèles inutilisés depuis plus de idle_timeout secondes"""
+        if not self.idle_timeout:
+            return []
+
+        now = time.time()
+        evicted = []
+        for name, slot in list(self._slots.items()):
+            if slot.instance is not None and slot.last_used and now - slot.last_used > self.idle_timeout:
+                if self.unload(name):
+                    evicted.append(name)
+        return evicted
+
+    def _ensure_reaper(self):
+        """Démarre le thread d'éviction à la première charge de modèle"""
+        if not self.idle_timeout or self._reaper is not None:
+            return
+
+        def reap():
+            while True:
+                time.sleep(max(30.0, self.idle_timeout / 4))
+                try:
+                    self.evict_idle()
+                except Exception as e:
+                    logger.debug(f"Erreur éviction modèles: {e}")
+
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=reap, name='model-reaper')
+                self._reaper.daemon = True
+                self._reaper.start()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """État de chaque modèle enregistré"""
+        return {
+            name: {
+                'loaded': slot.instance is not None,
+                'loaded_at': slot.loaded_at,
+                'last_used': slot.last_used,
+                'load_seconds': slot.load_seconds,
+                'error': slot.error
+            }
+            for name, slot in self._slots.items()
+        }
+
+
+def _load_vader():
+    """Charge VADER (télécharge le lexique si nécessaire)"""
+    import nltk
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+        logger.info("✅ VADER lexicon déjà disponible")
+    except LookupError:
+        logger.info("📥 Téléchargement de VADER lexicon...")
+        nltk.download('vader_lexicon', quiet=True)
+        logger.info("✅ VADER lexicon téléchargé")
+
+    return SentimentIntensityAnalyzer()
+
+
+def _load_transformer():
+    """Charge le pipeline Transformer de sentiment selon SENTIMENT_BACKEND"""
+    if SENTIMENT_BACKEND == 'onnx':
+        from .onnx_sentiment import load_onnx_pipeline
+        return load_onnx_pipeline()
+
+    from transformers import pipeline
+
+    return pipeline(
+        "sentiment-analysis",
+        model=SENTIMENT_TRANSFORMER_MODEL,
+        return_all_scores=True
+    )
+
+
+# Instance globale
+_model_registry = None
+_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    """Retourne le registre de modèles du processus"""
+    global _model_registry
+    if _model_registry is None:
+        with _registry_lock:
+            if _model_registry is None:
+                registry = ModelRegistry()
+                registry.register('vader', _load_vader)
+                registry.register('transformer', _load_transformer)
+                _model_registry = registry
+    return _model_registry
@@ -0,0 +1,168 @@
+# Flask/onnx_sentiment.py
+"""
+Backend ONNX Runtime (quantifié int8) pour le modèle Transformer de sentiment
+Alternative CPU au pipeline PyTorch pleine précision, sélectionnée par
+SENTIMENT_BACKEND = 'onnx' dans config.py
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Union
+import numpy as np
+from .config import SENTIMENT_TRANSFORMER_MODEL, ONNX_MODEL_DIR, ONNX_INTRA_OP_THREADS
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = 'model.int8.onnx'
+LABELS_FILE = 'labels.json'
+MAX_LENGTH = 512
+
+
+def export_quantized_model(model_name: str = SENTIMENT_TRANSFORMER_MODEL,
+                           output_dir: str = ONNX_MODEL_DIR) -> str:
+    """
+    Exporte le modèle PyTorch en ONNX puis applique une quantification
+    dynamique int8 des poids (nécessite torch, transformers et onnxruntime)
+
+    Plusieurs processus peuvent exporter en même temps (workers du pool de
+    sentiment) : chacun travaille dans son propre répertoire temporaire puis
+    publie par os.replace, tokenizer et libellés d'abord, modèle en dernier
+    (sa présence signale un export complet).
+
+    Retourne le chemin du modèle quantifié
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    os.makedirs(output_dir, exist_ok=True)
+    int8_path = os.path.join(output_dir, MODEL_FILE)
+    work_dir = tempfile.mkdtemp(prefix='.export-', dir=output_dir)
+
+    try:
+        fp32_path = os.path.join(work_dir, 'model.onnx')
+
+        logger.info(f"📦 Export ONNX de {model_name}...")
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model.eval()
+
+        dummy = tokenizer("export onnx", return_tensors='pt')
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (dummy['input_ids'], dummy['attention_mask']),
+                fp32_path,
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['logits'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'logits': {0: 'batch'}
+                },
+                opset_version=14
+            )
+
+        logger.info("🔧 Quantification dynamique int8...")
+        quantize_dynamic(fp32_path, os.path.join(work_dir, MODEL_FILE), weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+
+        # Tokenizer et libellés à côté du modèle : le chargement ne dépend plus de torch
+        tokenizer.save_pretrained(work_dir)
+        labels = {str(i): label for i, label in model.config.id2label.items()}
+        with open(os.path.join(work_dir, LABELS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(labels, f)
+
+        published = sorted(
+            (name for name in os.listdir(work_dir)
+             if not name.endswith('.onnx') or name == MODEL_FILE),
+            key=lambda name: name == MODEL_FILE
+        )
+        for name in published:
+            os.replace(os.path.join(work_dir, name), os.path.join(output_dir, name))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    logger.info(f"✅ Modèle int8 exporté: {int8_path}")
+    return int8_path
+
+
+class OnnxSentimentPipeline:
+    """
+    Équivalent du pipeline transformers("sentiment-analysis", return_all_scores=True)
+    exécuté par ONNX Runtime : même format de sortie, mêmes libellés
+    """
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR,
+                 intra_op_threads: int = ONNX_INTRA_OP_THREADS):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, MODEL_FILE),
+            sess_options=options,
+            providers=['CPUExecutionProvider']
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        with open(os.path.join(model_dir, LABELS_FILE), encoding='utf-8') as f:
+            labels = json.load(f)
+        self.labels = [labels[str(i)] for i in range(len(labels))]
+
+    def __call__(self, texts: Union[str, List[str]]) -> List[List[Dict[str, Any]]]:
+        if isinstance(texts, str):
+            texts = [texts]
+
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True,
+            max_length=MAX_LENGTH, return_tensors='np'
+        )
+        logits = self.session.run(['logits'], {
+            'input_ids': encoded['input_ids'].astype(np.int64),
+            'attention_mask': encoded['attention_mask'].astype(np.int64)
+        })[0]
+
+        # Softmax stable numériquement
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = exp / exp.sum(axis=1, keepdims=True)
+
+        return [
+            [{'label': label, 'score': float(p)} for label, p in zip(self.labels, row)]
+            for row in probs
+        ]
+
+
+def load_onnx_pipeline(model_dir: str = ONNX_MODEL_DIR) -> OnnxSentimentPipeline:
+    """
+    Charge le pipeline ONNX, en exportant le modèle au premier lancement
+    (export préalable conseillé : python -m Flask.onnx_sentiment)
+    """
+    if not os.path.exists(os.path.join(model_dir, MODEL_FILE)):
+        logger.info("📥 Modèle ONNX absent, export depuis PyTorch...")
+        export_quantized_model(output_dir=model_dir)
+    return OnnxSentimentPipeline(model_dir)
+
+
+def main():
+    """Export explicite du modèle int8, avant de démarrer les workers"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    parser = argparse.ArgumentParser(description="Export ONNX int8 du modèle de sentiment")
+    parser.add_argument('--model', default=SENTIMENT_TRANSFORMER_MODEL)
+    parser.add_argument('--output-dir', default=ONNX_MODEL_DIR)
+    args = parser.parse_args()
+
+    export_quantized_model(args.model, args.output_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,409 @@
+# Flask/profiling.py
+"""
+Profilage à la demande des requêtes et des tâches de fond
+- requête : en-tête X-Profile: cprofile|sample (ou ?_profile=...) ;
+  l'identifiant du profil est renvoyé dans l'en-tête X-Profile-Id
+- tâche de fond : armée depuis l'endpoint admin pour N exécutions
+- profils conservés dans un tampon circulaire et téléchargeables
+  (.prof pour pstats/snakeviz, piles repliées pour flamegraph/speedscope)
+- tracemalloc : instantanés et différences pour traquer la croissance
+  mémoire
+
+Rien n'est actif tant que PROFILING_ENABLED est False.
+"""
+
+import cProfile
+import contextlib
+import hmac
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+from flask import Flask, g, request
+from .config import (
+    PROFILING_ENABLED, PROFILING_TOKEN, PROFILING_BUFFER_SIZE,
+    PROFILING_SAMPLE_INTERVAL, PROFILING_TOP_FUNCTIONS,
+    TRACEMALLOC_FRAMES, TRACEMALLOC_SNAPSHOTS
+)
+
+logger = logging.getLogger(__name__)
+
+MODES = ('cprofile', 'sample')
+
+# Tâches de fond instrumentées par profile_job()
+JOBS = ('feed_scheduler', 'social_collector', 'archive_snapshots', 'live_dashboard')
+
+# Un seul profileur par thread (cProfile remplace le hook du thread)
+_local = threading.local()
+
+
+def token_ok(req) -> bool:
+    """Jeton PROFILING_TOKEN (en-tête X-Profile-Token ou ?_profile_token=) s'il est configuré"""
+    if not PROFILING_TOKEN:
+        return True
+    supplied = req.headers.get('X-Profile-Token') or req.args.get('_profile_token') or ''
+    return hmac.compare_digest(supplied.encode(), PROFILING_TOKEN.encode())
+
+
+def _location(filename: str, line: int, name: str) -> str:
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+# ----------------------------------------------------------------------
+# Profileurs
+# ----------------------------------------------------------------------
+
+class CProfileCapture:
+    """Profil déterministe du thread courant"""
+
+    mode = 'cprofile'
+    extension = 'prof'
+
+    def start(self):
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        stats = pstats.Stats(self.profiler).stats
+
+        ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        self.summary = [
+            {
+                'function': _location(*key),
+                'calls': calls,
+                'self_ms': round(own * 1000, 3),
+                'cumulative_ms': round(cumulative * 1000, 3)
+            }
+            for key, (_, calls, own, cumulative, _) in ranked[:PROFILING_TOP_FUNCTIONS]
+        ]
+        # Même format que pstats.Stats.dump_stats()
+        self.data = marshal.dumps(stats)
+
+
+class SamplingCapture:
+    """
+    Échantillonnage de la pile du thread courant par un thread voisin
+    Surcoût indépendant du nombre d'appels : adapté aux requêtes longues
+    """
+
+    mode = 'sample'
+    extension = 'txt'
+
+    def __init__(self, interval: float = PROFILING_SAMPLE_INTERVAL):
+        self.interval = interval
+
+    def start(self):
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name='profile-sampler')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(_location(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+        samples = sum(self.stacks.values())
+        inclusive = Counter()
+        own = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            for frame in set(frames):
+                inclusive[frame] += count
+            own[frames[-1]] += count
+
+        # Classement par temps propre : les cadres du framework, présents
+        # dans toutes les piles, masqueraient les points chauds
+        self.summary = [
+            {
+                'function': function,
+                'self_samples': count,
+                'samples': inclusive[function],
+                'self_percent': round(100 * count / samples, 1),
+                'percent': round(100 * inclusive[function] / samples, 1)
+            }
+            for function, count in own.most_common(PROFILING_TOP_FUNCTIONS)
+        ]
+        # Piles repliées : une ligne « f1;f2;f3 N » par pile
+        self.data = '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common()).encode('utf-8')
+
+
+def _start_capture(mode: str):
+    """Démarre un profileur sur le thread courant ; None s'il y en a déjà un"""
+    if getattr(_local, 'active', False):
+        return None
+    capture = CProfileCapture() if mode == 'cprofile' else SamplingCapture()
+    _local.active = True
+    capture.started_at = time.time()
+    capture.start()
+    return capture
+
+
+def _finish_capture(capture, kind: str, name: str) -> int:
+    try:
+        capture.stop()
+    finally:
+        _local.active = False
+    return profile_store.add(kind, name, capture)
+
+
+# ----------------------------------------------------------------------
+# Stockage
+# ----------------------------------------------------------------------
+
+class ProfileStore:
+    """Tampon circulaire des derniers profils (thread-safe)"""
+
+    def __init__(self, size: int = PROFILING_BUFFER_SIZE):
+        self._profiles = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def add(self, kind: str, name: str, capture) -> int:
+        with self._lock:
+            profile_id = self._next_id
+            self._next_id += 1
+            self._profiles.append({
+                'id': profile_id,
+                'kind': kind,
+                'name': name,
+                'mode': capture.mode,
+                'started_at': capture.started_at,
+                'duration_ms': round((time.time() - capture.started_at) * 1000, 1),
+                'summary': capture.summary,
+                'extension': capture.extension,
+                'data': capture.data
+            })
+        logger.info(f"🔬 Profil {profile_id} enregistré ({kind} {name}, {capture.mode})")
+        return profile_id
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            {k: v for k, v in p.items() if k not in ('summary', 'data')}
+            for p in reversed(profiles)
+        ]
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile['id'] == profile_id:
+                    return profile
+        return None
+
+
+profile_store = ProfileStore()
+
+
+# ----------------------------------------------------------------------
+# Tâches de fond
+# ----------------------------------------------------------------------
+
+_armed_jobs: Dict[str, Dict[str, Any]] = {}
+_jobs_lock = threading.Lock()
+
+
+def arm_job(name: str, mode: str = 'cprofile', runs: int = 1):
+    """Profile les runs prochaines exécutions de la tâche name"""
+    with _jobs_lock:
+        _armed_jobs[name] = {'mode': mode, 'remaining': max(1, runs)}
+
+
+def disarm_job(name: str):
+    with _jobs_lock:
+        _armed_jobs.pop(name, None)
+
+
+def get_armed_jobs() -> Dict[str, Dict[str, Any]]:
+    with _jobs_lock:
+        return {name: dict(state) for name, state in _armed_jobs.items()}
+
+
+def _take_job(name: str) -> Optional[str]:
+    with _jobs_lock:
+        state = _armed_jobs.get(name)
+        if state is None:
+            return None
+        state['remaining'] -= 1
+        if state['remaining'] <= 0:
+            del _armed_jobs[name]
+        return state['mode']
+
+
+@contextlib.contextmanager
+def profile_job(name: str):
+    """with profile_job('feed_scheduler'): profile le bloc si la tâche est armée"""
+    # Chemin courant : aucune tâche armée, un test de dictionnaire
+    mode = _take_job(name) if _armed_jobs else None
+    capture = _start_capture(mode) if mode else None
+    if capture is None:
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        _finish_capture(capture, 'job', name)
+
+
+# ----------------------------------------------------------------------
+# Requêtes
+# ----------------------------------------------------------------------
+
+def _start_request_profile():
+    mode = request.headers.get('X-Profile') or request.args.get('_profile')
+    if mode not in MODES or not token_ok(request):
+        return
+    capture = _start_capture(mode)
+    if capture is not None:
+        g.profile_capture = capture
+
+
+def _finish_request_profile(response):
+    capture = g.pop('profile_capture', None)
+    if capture is not None:
+        profile_id = _finish_capture(capture, 'request', f"{request.method} {request.path}")
+        response.headers['X-Profile-Id'] = str(profile_id)
+    return response
+
+
+def _abort_request_profile(exc):
+    # Exception non gérée : after_request n'a pas été appelé
+    capture = g.pop('profile_capture', None)
+    if capture is not None:
+        _finish_capture(capture, 'request', f"{request.method} {request.path} (erreur)")
+
+
+def init_profiling(app: Flask):
+    """Installe les déclencheurs de profilage par requête"""
+    if not PROFILING_ENABLED:
+        return
+
+    app.before_request(_start_request_profile)
+    app.after_request(_finish_request_profile)
+    app.teardown_request(_abort_request_profile)
+    logger.info(f"🔬 Profilage à la demande actif (tampon de {PROFILING_BUFFER_SIZE} profils"
+                f"{', jeton requis' if PROFILING_TOKEN else ''})")
+
+
+# ----------------------------------------------------------------------
+# Mémoire (tracemalloc)
+# ----------------------------------------------------------------------
+
+class MemoryTracker:
+    """Instantanés tracemalloc numérotés et comparaisons entre eux"""
+
+    FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>'),
+    )
+
+    def __init__(self, keep: int = TRACEMALLOC_SNAPSHOTS):
+        self._snapshots = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+    def start(self, frames: int = TRACEMALLOC_FRAMES):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            logger.info(f"🧠 tracemalloc démarré ({frames} frames)")
+
+    def stop(self):
+        with self._lock:
+            self._snapshots.clear()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("🧠 tracemalloc arrêté")
+
+    def _find(self, snapshot_id: int):
+        for entry in self._snapshots:
+            if entry['id'] == snapshot_id:
+                return entry
+        return None
+
+    @staticmethod
+    def _format(stats, limit: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                'location': str(stat.traceback[0]) if stat.traceback else '?',
+                'size_kb': round(stat.size / 1024, 1),
+                'count': stat.count,
+                'size_diff_kb': round(getattr(stat, 'size_diff', 0) / 1024, 1),
+                'count_diff': getattr(stat, 'count_diff', 0)
+            }
+            for stat in stats[:limit]
+        ]
+
+    def take_snapshot(self, key: str = 'lineno', limit: int = 20) -> Dict[str, Any]:
+        """Prend un instantané (démarre tracemalloc si besoin) et liste les plus gros postes"""
+        self.start()
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+        current, peak = tracemalloc.get_traced_memory()
+
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            self._snapshots.append({'id': snapshot_id, 'taken_at': time.time(), 'snapshot': snapshot})
+
+        return {
+            'id': snapshot_id,
+            'traced_kb': round(current / 1024, 1),
+            'peak_kb': round(peak / 1024, 1),
+            'top': self._format(snapshot.statistics(key), limit)
+        }
+
+    def diff(self, base_id: int, target_id: int = None, key: str = 'lineno',
+             limit: int = 30) -> Optional[Dict[str, Any]]:
+        """Plus fortes croissances entre deux instantanés (par défaut : le dernier)"""
+        with self._lock:
+            base = self._find(base_id)
+            target = self._find(target_id) if target_id else (self._snapshots[-1] if self._snapshots else None)
+        if base is None or target is None:
+            return None
+
+        stats = target['snapshot'].compare_to(base['snapshot'], key)
+        return {
+            'base': base['id'],
+            'target': target['id'],
+            'elapsed_seconds': round(target['taken_at'] - base['taken_at'], 1),
+            'size_diff_kb': round(sum(s.size_diff for s in stats) / 1024, 1),
+            'top': self._format(stats, limit)
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [{'id': e['id'], 'taken_at': e['taken_at']} for e in self._snapshots]
+        return {
+            'tracing': tracing,
+            'frames': tracemalloc.get_traceback_limit() if tracing else None,
+            'traced_kb': round(current / 1024, 1),
+            'peak_kb': round(peak / 1024, 1),
+            'snapshots': snapshots
+        }
+
+
+memory_tracker = MemoryTracker()
@@ -0,0 +1,288 @@
+# Flask/report_summarizer.py
+"""
+Synthèse hiérarchique (map-reduce) des articles pour les rapports IA
+Permet d'intégrer des milliers d'articles dans le contexte limité de Llama
+"""
+
+import hashlib
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+from .database import DatabaseManager
+from .llama_client import LlamaClient, get_llama_client, summary_slots
+from .metrics import CACHE_REQUESTS
+from .config import REPORT_CHUNK_SIZE, REPORT_REDUCE_FAN_IN, LLAMA_PARALLEL_SLOTS
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter lorsque les prompts de synthèse changent (invalide le cache)
+SUMMARY_PROMPT_VERSION = 1
+
+
+class ReportSummarizer:
+    """
+    Résume les articles par lots en parallèle (map) puis fusionne les
+    synthèses (reduce). Chaque synthèse est mise en cache par empreinte
+    de contenu, ce qui permet de la réutiliser entre rapports portant sur
+    des périodes qui se chevauchent.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, llama_client: LlamaClient = None,
+                 chunk_size: int = REPORT_CHUNK_SIZE,
+                 reduce_fan_in: int = REPORT_REDUCE_FAN_IN,
+                 max_workers: int = None):
+        self.db_manager = db_manager
+        self.llama_client = llama_client or get_llama_client()
+        self.chunk_size = chunk_size
+        self.reduce_fan_in = reduce_fan_in
+        # Un appel par slot de synthèse : les slots des rapports gardent leur cache KV
+        self.slots = summary_slots()
+        if self.slots:
+            self.max_workers = min(max_workers or len(self.slots), len(self.slots))
+        else:
+            self.max_workers = max_workers or LLAMA_PARALLEL_SLOTS
+
+    def should_summarize(self, articles: List[Dict]) -> bool:
+        """Le map-reduce n'est utile qu'au-delà d'un lot d'articles"""
+        return len(articles) > self.chunk_size
+
+    def build_chunks(self, articles: List[Dict]) -> List[List[Dict]]:
+        """
+        Découpe les articles en lots stables : regroupement par jour de
+        publication puis par identifiant, pour que deux plages de dates qui
+        se chevauchent produisent les mêmes lots sur les jours communs
+        """
+        by_day = {}
+        for article in articles:
+            day = str(article.get('pub_date') or '')[:10]
+            by_day.setdefault(day, []).append(article)
+
+        chunks = []
+        for day in sorted(by_day):
+            day_articles = sorted(by_day[day], key=lambda a: a.get('id') or 0)
+            for i in range(0, len(day_articles), self.chunk_size):
+                chunks.append(day_articles[i:i + self.chunk_size])
+
+        return chunks
+
+    def _hash_articles(self, articles: List[Dict]) -> str:
+        """Empreinte du contenu d'un lot d'articles"""
+        digest = hashlib.sha256(f"map:v{SUMMARY_PROMPT_VERSION}".encode('utf-8'))
+        for article in articles:
+            digest.update(b'\x00')
+            digest.update((article.get('title') or '').encode('utf-8'))
+            digest.update(b'\x01')
+            digest.update((article.get('content') or '').encode('utf-8'))
+        return digest.hexdigest()
+
+    def _hash_summaries(self, summaries: List[Dict]) -> str:
+        """Empreinte d'un groupe de synthèses (étape reduce)"""
+        digest = hashlib.sha256(f"reduce:v{SUMMARY_PROMPT_VERSION}".encode('utf-8'))
+        for summary in summaries:
+            digest.update(summary['content_hash'].encode('utf-8'))
+        return digest.hexdigest()
+
+    def _get_cached(self, content_hashes: List[str]) -> Dict[str, Dict]:
+        """Récupère les synthèses déjà calculées"""
+        if not content_hashes:
+            return {}
+
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cached = {}
+            # Par paquets pour rester sous la limite de variables SQLite
+            for i in range(0, len(content_hashes), 500):
+                batch = content_hashes[i:i + 500]
+                placeholders = ','.join('?' * len(batch))
+                cursor.execute(f"""
+                    SELECT content_hash, summary, article_count, period
+                    FROM llm_chunk_summaries
+                    WHERE content_hash IN ({placeholders})
+                """, batch)
+
+                for row in cursor.fetchall():
+                    cached[row[0]] = {
+                        'content_hash': row[0],
+                        'summary': row[1],
+                        'article_count': row[2],
+                        'period': row[3]
+                    }
+
+            CACHE_REQUESTS.inc(len(cached), cache='llm_summary', result='hit')
+            CACHE_REQUESTS.inc(len(content_hashes) - len(cached), cache='llm_summary', result='miss')
+            return cached
+        finally:
+            conn.close()
+
+    def _store(self, summaries: List[Dict]):
+        """Met en cache les nouvelles synthèses"""
+        if not summaries:
+            return
+
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.executemany("""
+                INSERT OR REPLACE INTO llm_chunk_summaries
+                (content_hash, summary, article_count, period)
+                VALUES (?, ?, ?, ?)
+            """, [
+                (s['content_hash'], s['summary'], s['article_count'], s['period'])
+                for s in summaries
+            ])
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Erreur sauvegarde synthèses: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    def _period_label(self, articles: List[Dict]) -> str:
+        """Plage de dates couverte par un lot"""
+        days = sorted(str(a.get('pub_date') or '')[:10] for a in articles)
+        days = [d for d in days if d]
+        if not days:
+            return ''
+        return days[0] if days[0] == days[-1] else f"{days[0]} → {days[-1]}"
+
+    def _fallback_summary(self, articles: List[Dict]) -> str:
+        """Synthèse minimale (titres) si Llama échoue sur un lot"""
+        return "\n".join(f"- {a.get('title', 'Sans titre')}" for a in articles[:5])
+
+    def _run_parallel(self, jobs: List[Dict], build_prompt) -> List[Dict]:
+        """
+        Exécute les appels Llama des jobs non cachés en parallèle
+        (un appel par slot de synthèse) et met en cache les réussites
+        """
+        free_slots = queue.Queue()
+        for slot in self.slots:
+            free_slots.put(slot)
+
+        def run(job):
+            slot = free_slots.get() if self.slots else None
+            try:
+                text = self.llama_client.complete(build_prompt(job['inputs']), slot=slot)
+                if text:
+                    return {**job['entry'], 'summary': text}, True
+            except Exception as e:
+                logger.warning(f"⚠️ Synthèse lot échouée: {e}")
+            finally:
+                if slot is not None:
+                    free_slots.put(slot)
+            return {**job['entry'], 'summary': job['fallback']}, False
+
+        if not jobs:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            results = list(executor.map(run, jobs))
+
+        self._store([entry for entry, ok in results if ok])
+        return [entry for entry, _ in results]
+
+    def _map(self, chunks: List[List[Dict]]) -> List[Dict]:
+        """Étape map : une synthèse par lot d'articles"""
+        entries = [
+            {
+                'content_hash': self._hash_articles(chunk),
+                'article_count': len(chunk),
+                'period': self._period_label(chunk)
+            }
+            for chunk in chunks
+        ]
+
+        cached = self._get_cached([e['content_hash'] for e in entries])
+        jobs = [
+            {'entry': entry, 'inputs': chunk, 'fallback': self._fallback_summary(chunk)}
+            for entry, chunk in zip(entries, chunks)
+            if entry['content_hash'] not in cached
+        ]
+
+        logger.info(f"🗂️ Map: {len(chunks)} lots ({len(cached)} en cache, {len(jobs)} à résumer)")
+
+        computed = {e['content_hash']: e for e in self._run_parallel(
+            jobs, self.llama_client._build_chunk_summary_prompt
+        )}
+        return [cached.get(e['content_hash']) or computed[e['content_hash']] for e in entries]
+
+    def _reduce(self, summaries: List[Dict]) -> List[Dict]:
+        """
+        Étape reduce : fusionne les synthèses par groupes jusqu'à ce qu'il
+        en reste au plus reduce_fan_in (taille acceptable pour le prompt final)
+        """
+        while len(summaries) > self.reduce_fan_in:
+            groups = [
+                summaries[i:i + self.reduce_fan_in]
+                for i in range(0, len(summaries), self.reduce_fan_in)
+            ]
+            entries = [
+                {
+                    'content_hash': self._hash_summaries(group),
+                    'article_count': sum(s['article_count'] for s in group),
+                    'period': self._merge_periods(group)
+                }
+                for group in groups
+            ]
+
+            cached = self._get_cached([e['content_hash'] for e in entries])
+            jobs = [
+                {
+                    'entry': entry,
+                    'inputs': [s['summary'] for s in group],
+                    'fallback': "\n".join(s['summary'] for s in group)
+                }
+                for entry, group in zip(entries, groups)
+                if entry['content_hash'] not in cached
+            ]
+
+            logger.info(f"🗂️ Reduce: {len(summaries)} → {len(groups)} synthèses")
+
+            computed = {e['content_hash']: e for e in self._run_parallel(
+                jobs, self.llama_client._build_reduce_prompt
+            )}
+            summaries = [cached.get(e['content_hash']) or computed[e['content_hash']] for e in entries]
+
+        return summaries
+
+    def _merge_periods(self, summaries: List[Dict]) -> str:
+        """Plage de dates couverte par un groupe de synthèses"""
+        bounds = []
+        for summary in summaries:
+            bounds.extend(p.strip() for p in (summary.get('period') or '').split('→') if p.strip())
+        if not bounds:
+            return ''
+        bounds.sort()
+        return bounds[0] if bounds[0] == bounds[-1] else f"{bounds[0]} → {bounds[-1]}"
+
+    def summarize(self, articles: List[Dict]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Produit les synthèses à injecter dans le prompt final
+        Retourne None si le map-reduce n'est pas nécessaire ou si Llama
+        est inaccessible (le rapport utilise alors la liste de titres)
+        """
+        if not self.should_summarize(articles):
+            return None
+
+        if not self.llama_client.test_connection():
+            return None
+
+        chunks = self.build_chunks(articles)
+        summaries = self._reduce(self._map(chunks))
+
+        logger.info(f"✅ {len(articles)} articles résumés en {len(summaries)} synthèses")
+        return summaries
+
+
+# Instance globale
+_report_summarizer = None
+
+def get_report_summarizer(db_manager: DatabaseManager) -> ReportSummarizer:
+    """Retourne l'instance singleton du summarizer"""
+    global _report_summarizer
+    if _report_summarizer is None:
+        _report_summarizer = ReportSummarizer(db_manager)
+    return _report_summarizer
@@ -0,0 +1,236 @@
+# Flask/response_layer.py
+"""
+Sérialisation JSON rapide et compression des réponses
+- fournisseur JSON de l'application : orjson si installé (sortie compacte,
+  mêmes conversions que Flask pour les dates, Decimal, UUID...), sinon
+  le fournisseur par défaut en mode compact
+- compression gzip/brotli négociée par Accept-Encoding au-delà d'une
+  taille minimale
+- métriques par endpoint : octets avant/après compression, temps de
+  sérialisation et de compression
+"""
+
+import gzip
+import logging
+import threading
+import time
+from typing import Any, Dict
+from flask import Flask, g, request
+from flask.json.provider import DefaultJSONProvider, _default
+from .config import (
+    JSON_ENCODER, COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE,
+    COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY
+)
+
+# Importations conditionnelles
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/csv',
+    'text/javascript',
+    'application/javascript',
+    'image/svg+xml',
+}
+
+
+class CompactJSONProvider(DefaultJSONProvider):
+    """Fournisseur par défaut sans indentation ni tri des clés"""
+
+    compact = True
+    sort_keys = False
+
+    def response(self, *args, **kwargs):
+        started = time.perf_counter()
+        response = super().response(*args, **kwargs)
+        _record_serialization(started)
+        return response
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Fournisseur orjson : sérialise directement en bytes
+    Les types non natifs (et les datetime, pour garder le format HTTP de
+    Flask) passent par la même fonction de conversion que Flask
+    """
+
+    options = 0
+    if ORJSON_AVAILABLE:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self.options).decode('utf-8')
+
+    def loads(self, s, **kwargs) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        started = time.perf_counter()
+        obj = self._prepare_response_obj(args, kwargs)
+        data = orjson.dumps(obj, default=_default, option=self.options)
+        response = self._app.response_class(data, mimetype=self.mimetype)
+        _record_serialization(started)
+        return response
+
+
+def _record_serialization(started: float):
+    g.json_serialize_ms = getattr(g, 'json_serialize_ms', 0.0) + (time.perf_counter() - started) * 1000
+
+
+class ResponseMetrics:
+    """Compteurs par endpoint (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, float]] = {}
+
+    def record(self, endpoint: str, raw_bytes: int, sent_bytes: int,
+               serialize_ms: float, compress_ms: float, encoding: str = None):
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {
+                'requests': 0,
+                'compressed': 0,
+                'raw_bytes': 0,
+                'sent_bytes': 0,
+                'serialize_ms': 0.0,
+                'compress_ms': 0.0,
+                'max_raw_bytes': 0
+            })
+            stats['requests'] += 1
+            stats['raw_bytes'] += raw_bytes
+            stats['sent_bytes'] += sent_bytes
+            stats['serialize_ms'] += serialize_ms
+            stats['compress_ms'] += compress_ms
+            stats['max_raw_bytes'] = max(stats['max_raw_bytes'], raw_bytes)
+            if encoding:
+                stats['compressed'] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for endpoint, stats in self._endpoints.items():
+                requests_count = stats['requests'] or 1
+                result[endpoint] = {
+                    **stats,
+                    'serialize_ms': round(stats['serialize_ms'], 2),
+                    'compress_ms': round(stats['compress_ms'], 2),
+                    'avg_raw_bytes': int(stats['raw_bytes'] / requests_count),
+                    'avg_sent_bytes': int(stats['sent_bytes'] / requests_count),
+                    'avg_serialize_ms': round(stats['serialize_ms'] / requests_count, 3),
+                    'compression_ratio': round(stats['sent_bytes'] / stats['raw_bytes'], 3)
+                    if stats['raw_bytes'] else None
+                }
+            return result
+
+
+response_metrics = ResponseMetrics()
+
+
+def _choose_encoding(accept_encoding: str) -> str:
+    """br si accepté et disponible, sinon gzip, sinon None"""
+    accepted = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    if BROTLI_AVAILABLE and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    """after_request : compression et métriques de la réponse"""
+    serialize_ms = getattr(g, 'json_serialize_ms', 0.0)
+
+    # Flux (SSE, streaming) et fichiers envoyés tels quels
+    if response.direct_passthrough or response.is_streamed:
+        return response
+
+    raw = response.get_data()
+    encoding = None
+    compress_ms = 0.0
+
+    if (COMPRESSION_ENABLED
+            and response.status_code == 200
+            and len(raw) >= COMPRESSION_MIN_SIZE
+            and response.mimetype in COMPRESSIBLE_MIMETYPES
+            and 'Content-Encoding' not in response.headers):
+        encoding = _choose_encoding(request.headers.get('Accept-Encoding', ''))
+
+        if encoding:
+            started = time.perf_counter()
+            if encoding == 'br':
+                body = brotli.compress(raw, quality=COMPRESSION_BROTLI_QUALITY)
+            else:
+                body = gzip.compress(raw, compresslevel=COMPRESSION_GZIP_LEVEL)
+            compress_ms = (time.perf_counter() - started) * 1000
+
+            response.set_data(body)
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+
+    response_metrics.record(
+        request.endpoint or 'unknown',
+        len(raw),
+        response.content_length or 0,
+        serialize_ms,
+        compress_ms,
+        encoding
+    )
+    return response
+
+
+def init_response_layer(app: Flask):
+    """Installe le fournisseur JSON et la compression sur l'application"""
+    if JSON_ENCODER == 'orjson' and ORJSON_AVAILABLE:
+        app.json = OrjsonProvider(app)
+    else:
+        if JSON_ENCODER == 'orjson':
+            logger.warning("⚠️ orjson non installé, encodeur JSON standard (compact)")
+        app.json = CompactJSONProvider(app)
+
+    app.after_request(compress_response)
+
+    if COMPRESSION_ENABLED:
+        encodings = 'br/gzip' if BROTLI_AVAILABLE else 'gzip'
+        logger.info(f"✅ Réponses: {type(app.json).__name__}, compression {encodings} "
+                    f"dès {COMPRESSION_MIN_SIZE} octets")
+    else:
+        logger.info(f"✅ Réponses: {type(app.json).__name__}, compression désactivée")
+
+
+def get_response_metrics() -> Dict[str, Any]:
+    return {
+        'json_encoder': 'orjson' if JSON_ENCODER == 'orjson' and ORJSON_AVAILABLE else 'json',
+        'brotli_available': BROTLI_AVAILABLE,
+        'compression_enabled': COMPRESSION_ENABLED,
+        'min_size': COMPRESSION_MIN_SIZE,
+        'endpoints': response_metrics.snapshot()
+    }
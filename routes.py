@@ -1,21 +1,98 @@
-from flask import Flask, render_template, request, jsonify, send_file, Response
-from datetime import datetime, timedelta
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
+from datetime import datetime
 import json
 import logging
 import csv
 from io import StringIO, BytesIO
-from xhtml2pdf import pisa
 import tempfile
 import sqlite3
 import os
-from .database import DatabaseManager
+import xml.etree.ElementTree as ET
+from .database import DatabaseManager, day_bounds, days_ago_timestamp
 from .theme_manager import ThemeManager
 from .theme_analyzer import ThemeAnalyzer
 from .rss_manager import RSSManager
 from .anomaly_detector import AnomalyDetector  # AJOUTER CET IMPORT
+from .config import REPORT_MAX_ARTICLES
 
 logger = logging.getLogger(__name__)
 
+INVALID_DATE_ERROR = 'Date invalide : format attendu AAAA-MM-JJ'
+
+class MarkdownStreamConverter:
+    """
+    Conversion markdown → HTML ligne par ligne
+    Accepte le texte par fragments (streaming Llama) et ne convertit
+    que les lignes complètes ; finish() vide la dernière ligne.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._in_list = False
+
+    def feed(self, chunk: str) -> list:
+        """Ajoute un fragment et retourne le HTML des lignes terminées"""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+
+        html_lines = []
+        for line in lines:
+            self._convert_line(line, html_lines)
+        return html_lines
+
+    def finish(self) -> list:
+        """Convertit la ligne en attente et ferme la liste ouverte"""
+        html_lines = []
+        self._convert_line(self._buffer, html_lines)
+        self._buffer = ''
+
+        if self._in_list:
+            html_lines.append('</ul>')
+            self._in_list = False
+        return html_lines
+
+    def _close_list(self, html_lines: list):
+        if self._in_list:
+            html_lines.append('</ul>')
+            self._in_list = False
+
+    def _convert_line(self, line: str, html_lines: list):
+        # Nettoyer le texte des balises ChatML résiduelles
+        line = line.replace('<|im_start|>', '').replace('<|im_end|>', '').strip()
+
+        if not line:
+            self._close_list(html_lines)
+            html_lines.append('<br>')
+
+        # Titres H2
+        elif line.startswith('## '):
+            self._close_list(html_lines)
+            html_lines.append(f'<h2>{line[3:]}</h2>')
+
+        # Titres H3
+        elif line.startswith('### '):
+            self._close_list(html_lines)
+            html_lines.append(f'<h3>{line[4:]}</h3>')
+
+        # Listes
+        elif line.startswith('- ') or line.startswith('* '):
+            if not self._in_list:
+                html_lines.append('<ul>')
+                self._in_list = True
+            html_lines.append(f'<li>{line[2:]}</li>')
+
+        # Texte gras **texte**
+        elif '**' in line:
+            self._close_list(html_lines)
+            line = line.replace('**', '<strong>', 1).replace('**', '</strong>', 1)
+            html_lines.append(f'<p>{line}</p>')
+
+        # Paragraphe normal
+        else:
+            self._close_list(html_lines)
+            html_lines.append(f'<p>{line}</p>')
+
+
 def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: ThemeManager,
                     theme_analyzer: ThemeAnalyzer, rss_manager: RSSManager, 
                     advanced_theme_manager=None, anomaly_detector=None):  # AJOUTER anomaly_detector
@@ -156,7 +233,7 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
                 query += " AND a.sentiment_type = ?"
                 params.append(sentiment)
 
-            query += " ORDER BY a.pub_date DESC LIMIT ? OFFSET ?"
+            query += " ORDER BY a.pub_ts DESC LIMIT ? OFFSET ?"
             params.extend([limit, offset])
 
             cursor.execute(query, params)
@@ -228,14 +305,14 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
 
             cursor.execute("""
                 SELECT 
-                    DATE(pub_date) as date,
+                    DATE(pub_ts, 'unixepoch') as date,
                     sentiment_type,
                     COUNT(*) as count
                 FROM articles
-                WHERE pub_date >= DATE('now', '-7 days')
-                GROUP BY DATE(pub_date), sentiment_type
+                WHERE pub_ts >= ?
+                GROUP BY date, sentiment_type
                 ORDER BY date
-            """)
+            """, (days_ago_timestamp(7, start_of_day=True),))
 
             timeline_data = {}
             for row in cursor.fetchall():
@@ -247,12 +324,11 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
 
             timeline = list(timeline_data.values())
 
-            week_ago = datetime.now() - timedelta(days=7)
             cursor.execute("""
                 SELECT COUNT(*) 
                 FROM articles 
-                WHERE pub_date >= ?
-            """, (week_ago,))
+                WHERE pub_ts >= ?
+            """, (days_ago_timestamp(7),))
             recent_articles = cursor.fetchone()[0]
 
             conn.close()
@@ -273,6 +349,34 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             traceback.print_exc()
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/live/dashboard')
+    def live_dashboard():
+        """
+        Flux SSE des deltas du dashboard (nouveaux articles, sentiments,
+        thèmes, alertes) publiés après chaque ingestion
+        """
+        from .live_updates import get_event_bus
+        from .config import LIVE_UPDATES_ENABLED
+
+        # 204 : EventSource s'arrête et le dashboard revient au rafraîchissement périodique
+        if not LIVE_UPDATES_ENABLED:
+            return Response(status=204)
+
+        # Le publicateur lit la base : chaque processus qui sert des abonnés
+        # a le sien, y compris les workers qui ne tiennent pas le verrou des services
+        from .live_updates import get_dashboard_publisher
+        get_dashboard_publisher(db_manager).start()
+
+        bus = get_event_bus()
+        last_event_id = request.headers.get('Last-Event-ID')
+        subscription = bus.subscribe(int(last_event_id) if last_event_id and last_event_id.isdigit() else None)
+
+        return Response(
+            stream_with_context(bus.stream(subscription)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
     @app.route('/api/stats/timeline')
     def get_timeline():
         """Récupère les données de timeline sur les 30 derniers jours"""
@@ -282,14 +386,14 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
 
             cursor.execute("""
                 SELECT 
-                    DATE(pub_date) as date,
+                    DATE(pub_ts, 'unixepoch') as date,
                     sentiment_type,
                     COUNT(*) as count
                 FROM articles
-                WHERE pub_date >= DATE('now', '-30 days')
-                GROUP BY DATE(pub_date), sentiment_type
+                WHERE pub_ts >= ?
+                GROUP BY date, sentiment_type
                 ORDER BY date
-            """)
+            """, (days_ago_timestamp(30, start_of_day=True),))
 
             timeline_data = {}
             for row in cursor.fetchall():
@@ -318,6 +422,10 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             if not feed_urls:
                 return jsonify({'error': 'Aucun flux fourni'}), 400
 
+            # Les flux soumis sont ensuite suivis par le planificateur
+            from .feed_scheduler import get_feed_scheduler
+            get_feed_scheduler(db_manager, rss_manager).register_feeds(feed_urls)
+
             results = rss_manager.update_feeds(feed_urls)
 
             return jsonify({
@@ -364,27 +472,124 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
 
     @app.route('/api/sources')
     def get_sources():
-        """Récupère toutes les sources RSS uniques"""
+        """Récupère toutes les sources RSS du registre"""
         try:
-            conn = db_manager.get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT DISTINCT feed_url 
-                FROM articles 
-                WHERE feed_url IS NOT NULL
-                ORDER BY feed_url
-            """)
-
-            sources = [row[0] for row in cursor.fetchall()]
-            conn.close()
-
+            from .feed_registry import get_feed_registry
+            sources = get_feed_registry(db_manager).get_urls()
             return jsonify({'sources': sources})
 
         except Exception as e:
             logger.error(f"Erreur récupération sources: {e}")
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/feeds')
+    def list_registered_feeds():
+        """Flux du registre avec leur résultat de validation (?status=valid|error|pending)"""
+        try:
+            from .feed_registry import get_feed_registry
+            try:
+                limit = max(1, min(int(request.args.get('limit', 100)), 1000))
+                offset = max(0, int(request.args.get('offset', 0)))
+            except ValueError:
+                return jsonify({'success': False, 'error': 'limit et offset doivent être des entiers'}), 400
+
+            result = get_feed_registry(db_manager).list_feeds(
+                status=request.args.get('status'),
+                limit=limit,
+                offset=offset
+            )
+            return jsonify({'success': True, **result})
+        except Exception as e:
+            logger.error(f"Erreur liste des flux: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/feeds/import', methods=['POST'])
+    def import_feeds():
+        """
+        Import en masse : fichier (champ 'file'), JSON {'content': ...}
+        ou corps texte ; liste d'URL ou OPML. Validation lancée en
+        arrière-plan sauf validate=false
+        """
+        try:
+            from .feed_registry import get_feed_registry
+            from .feed_scheduler import get_feed_scheduler
+
+            data = request.get_json(silent=True) or {}
+            if 'file' in request.files:
+                content = request.files['file'].read().decode('utf-8', errors='replace')
+            elif data.get('content'):
+                content = data['content']
+            else:
+                content = request.get_data(as_text=True)
+
+            if not content or not content.strip():
+                return jsonify({'success': False, 'error': 'Aucune liste de flux fournie'}), 400
+
+            registry = get_feed_registry(db_manager)
+            try:
+                result = registry.import_feeds(content)
+            except ET.ParseError as e:
+                return jsonify({'success': False, 'error': f"OPML invalide: {e}"}), 400
+
+            scheduler = get_feed_scheduler(db_manager, rss_manager)
+            if scheduler.running:
+                scheduler.load()
+
+            validate = str(data.get('validate', request.args.get('validate', 'true'))).lower() != 'false'
+            if validate:
+                registry.validate_async()
+
+            return jsonify({
+                'success': True,
+                **result,
+                'validation_started': validate,
+                'validation': registry.get_validation_status()
+            })
+
+        except Exception as e:
+            logger.error(f"Erreur import des flux: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/feeds/validate', methods=['POST'])
+    def validate_feeds():
+        """Lance la validation : {'urls': [...]} ou tous les flux en attente ({'all': true} : tous)"""
+        try:
+            from .feed_registry import get_feed_registry
+            data = request.get_json(silent=True) or {}
+            urls = data.get('urls')
+            if urls is not None and (
+                not isinstance(urls, list)
+                or not all(isinstance(u, str) and u.startswith(('http://', 'https://')) for u in urls)
+            ):
+                return jsonify({'success': False, 'error': 'urls doit être une liste d\'URL http(s)'}), 400
+
+            registry = get_feed_registry(db_manager)
+            started = registry.validate_async(
+                urls=urls,
+                pending_only=not data.get('all', False)
+            )
+            return jsonify({
+                'success': True,
+                'started': started,
+                'validation': registry.get_validation_status()
+            })
+        except Exception as e:
+            logger.error(f"Erreur validation des flux: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/feeds/validation')
+    def get_feed_validation():
+        """Progression de la dernière validation"""
+        try:
+            from .feed_registry import get_feed_registry
+            return jsonify({
+                'success': True,
+                'validation': get_feed_registry(db_manager).get_validation_status()
+            })
+        except Exception as e:
+            logger.error(f"Erreur état validation des flux: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
     @app.route('/api/articles/filter')
     def filter_articles():
         """Filtre les articles selon plusieurs critères"""
@@ -397,6 +602,12 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             search = request.args.get('search', '')
             limit = int(request.args.get('limit', 100))
 
+            # Jours inclusifs → intervalle [début, lendemain de fin) sur pub_ts
+            try:
+                start_ts, end_ts = day_bounds(date_from, date_to)
+            except ValueError:
+                return jsonify({'error': INVALID_DATE_ERROR}), 400
+
             conn = db_manager.get_connection()
             cursor = conn.cursor()
 
@@ -422,16 +633,16 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
                 params.append(sentiment)
 
             if source and source != 'all':
-                conditions.append("a.feed_url = ?")
+                conditions.append("a.feed_id = (SELECT id FROM feeds WHERE url = ?)")
                 params.append(source)
 
-            if date_from:
-                conditions.append("DATE(a.pub_date) >= ?")
-                params.append(date_from)
+            if start_ts is not None:
+                conditions.append("a.pub_ts >= ?")
+                params.append(start_ts)
 
-            if date_to:
-                conditions.append("DATE(a.pub_date) <= ?")
-                params.append(date_to)
+            if end_ts is not None:
+                conditions.append("a.pub_ts < ?")
+                params.append(end_ts)
 
             if search:
                 conditions.append("(a.title LIKE ? OR a.content LIKE ?)")
@@ -443,7 +654,7 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
 
-            query += " ORDER BY a.pub_date DESC LIMIT ?"
+            query += " ORDER BY a.pub_ts DESC LIMIT ?"
             params.append(limit)
 
             cursor.execute(query, params)
@@ -479,6 +690,12 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             date_to = request.args.get('date_to')
             search = request.args.get('search', '')
 
+            # Jours inclusifs → intervalle [début, lendemain de fin) sur pub_ts
+            try:
+                start_ts, end_ts = day_bounds(date_from, date_to)
+            except ValueError:
+                return jsonify({'error': INVALID_DATE_ERROR}), 400
+
             conn = db_manager.get_connection()
             cursor = conn.cursor()
 
@@ -502,16 +719,16 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
                 params.append(sentiment)
 
             if source and source != 'all':
-                conditions.append("a.feed_url = ?")
+                conditions.append("a.feed_id = (SELECT id FROM feeds WHERE url = ?)")
                 params.append(source)
 
-            if date_from:
-                conditions.append("DATE(a.pub_date) >= ?")
-                params.append(date_from)
+            if start_ts is not None:
+                conditions.append("a.pub_ts >= ?")
+                params.append(start_ts)
 
-            if date_to:
-                conditions.append("DATE(a.pub_date) <= ?")
-                params.append(date_to)
+            if end_ts is not None:
+                conditions.append("a.pub_ts < ?")
+                params.append(end_ts)
 
             if search:
                 conditions.append("(a.title LIKE ? OR a.content LIKE ?)")
@@ -523,7 +740,7 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
 
-            query += " ORDER BY a.pub_date DESC LIMIT 1000"
+            query += " ORDER BY a.pub_ts DESC LIMIT 1000"
 
             cursor.execute(query, params)
 
@@ -776,27 +993,53 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             return jsonify({'error': str(e)}), 500
 
     # ===== FONCTIONS INTERNES POUR IA =====
-    def generate_ia_analysis(articles, report_type, themes, start_date, end_date):
+    def build_ia_context(articles, themes, start_date, end_date):
         """
-        Génère l'analyse IA avec le serveur Llama
-        Utilise llama_client.py pour la communication
+        Prépare le contexte (période, thèmes, sentiments) pour Llama
+        Au-delà d'un lot d'articles, ajoute les synthèses map-reduce
         """
-        from .llama_client import get_llama_client
+        from .report_summarizer import get_report_summarizer
         
-        # Préparer le contexte pour Llama
         sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
         for article in articles:
             sentiment = article.get('sentiment', 'neutral')
             sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + 1
         
-        context = {
-            'period': f"{start_date or 'début'} → {end_date or 'aujourd\'hui'}",
+        end_label = end_date or "aujourd'hui"
+        return {
+            'period': f"{start_date or 'début'} → {end_label}",
             'themes': themes if themes else ['Tous thèmes'],
             'sentiment_positive': sentiment_counts.get('positive', 0),
             'sentiment_negative': sentiment_counts.get('negative', 0),
             'sentiment_neutral': sentiment_counts.get('neutral', 0),
-            'total_articles': len(articles)
+            'total_articles': len(articles),
+            'chunk_summaries': get_report_summarizer(db_manager).summarize(articles)
         }
+
+    def build_ia_status_badge(success, model_used=None, error=None):
+        """Badge HTML indiquant le mode de génération (IA ou dégradé)"""
+        if success:
+            return f'''
+            <div style="background: #d4edda; border: 1px solid #c3e6cb; padding: 10px; border-radius: 5px; margin-bottom: 15px;">
+                <strong style="color: #155724;">✅ Analyse générée par IA Llama 3.2</strong><br>
+                <small>Modèle: {model_used or 'llama3.2-3b-Q4_K_M'}</small>
+            </div>
+            '''
+        return f'''
+            <div style="background: #fff3cd; border: 1px solid #ffeeba; padding: 10px; border-radius: 5px; margin-bottom: 15px;">
+                <strong style="color: #856404;">⚠️ Mode dégradé</strong><br>
+                <small>Raison: {error or 'Serveur Llama indisponible'}</small>
+            </div>
+            '''
+
+    def generate_ia_analysis(articles, report_type, themes, start_date, end_date):
+        """
+        Génère l'analyse IA avec le serveur Llama
+        Utilise llama_client.py pour la communication
+        """
+        from .llama_client import get_llama_client
+        
+        context = build_ia_context(articles, themes, start_date, end_date)
         
         # Appel au client Llama
         llama_client = get_llama_client()
@@ -806,83 +1049,18 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             context=context
         )
         
-        # Convertir le markdown en HTML (conversion améliorée)
-        analysis_text = result.get('analysis', '')
-        
-        # Nettoyer le texte des balises ChatML résiduelles
-        analysis_text = analysis_text.replace('<|im_start|>', '').replace('<|im_end|>', '')
-        
         # Conversion markdown → HTML
-        lines = analysis_text.split('\n')
-        html_lines = []
-        in_list = False
-        
-        for line in lines:
-            line = line.strip()
-            
-            if not line:
-                if in_list:
-                    html_lines.append('</ul>')
-                    in_list = False
-                html_lines.append('<br>')
-                continue
-            
-            # Titres H2
-            if line.startswith('## '):
-                if in_list:
-                    html_lines.append('</ul>')
-                    in_list = False
-                html_lines.append(f'<h2>{line[3:]}</h2>')
-            
-            # Titres H3
-            elif line.startswith('### '):
-                if in_list:
-                    html_lines.append('</ul>')
-                    in_list = False
-                html_lines.append(f'<h3>{line[4:]}</h3>')
-            
-            # Listes
-            elif line.startswith('- ') or line.startswith('* '):
-                if not in_list:
-                    html_lines.append('<ul>')
-                    in_list = True
-                html_lines.append(f'<li>{line[2:]}</li>')
-            
-            # Texte gras **texte**
-            elif '**' in line:
-                if in_list:
-                    html_lines.append('</ul>')
-                    in_list = False
-                line = line.replace('**', '<strong>', 1).replace('**', '</strong>', 1)
-                html_lines.append(f'<p>{line}</p>')
-            
-            # Paragraphe normal
-            else:
-                if in_list:
-                    html_lines.append('</ul>')
-                    in_list = False
-                html_lines.append(f'<p>{line}</p>')
-        
-        if in_list:
-            html_lines.append('</ul>')
-        
+        converter = MarkdownStreamConverter()
+        html_lines = converter.feed(result.get('analysis', ''))
+        html_lines.extend(converter.finish())
         html_content = '\n'.join(html_lines)
         
         # Ajouter un badge de statut
-        if result.get('success'):
-            status_badge = f'''
-            <div style="background: #d4edda; border: 1px solid #c3e6cb; padding: 10px; border-radius: 5px; margin-bottom: 15px;">
-                <strong style="color: #155724;">✅ Analyse générée par IA Llama 3.2</strong><br>
-                <small>Modèle: {result.get('model_used', 'llama3.2-3b-Q4_K_M')}</small>
-            </div>
-            '''
-        else:
-            status_badge = f'''
-            <div style="background: #fff3cd; border: 1px solid #ffeeba; padding: 10px; border-radius: 5px; margin-bottom: 15px;">
-                <strong style="color: #856404;">⚠️ Mode dégradé</strong><br>
-                <small>Raison: {result.get('error', 'Serveur Llama indisponible')}</small>
-            </div>
-            '''
+        status_badge = build_ia_status_badge(
+            result.get('success'),
+            model_used=result.get('model_used'),
+            error=result.get('error')
+        )
         
         html_content = status_badge + html_content
         
@@ -893,10 +1071,92 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             'llama_error': result.get('error')
         }
 
+    def stream_ia_analysis(articles, report_type, themes, start_date, end_date, meta):
+        """
+        Variante streaming de generate_ia_analysis : produit des événements SSE
+        (meta, chunk, done) au fur et à mesure de la génération Llama
+        """
+        from .llama_client import get_llama_client
+        
+        def sse(event, payload):
+            return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        
+        yield sse('meta', meta)
+        
+        context = build_ia_context(articles, themes, start_date, end_date)
+        converter = MarkdownStreamConverter()
+        
+        llama_client = get_llama_client()
+        for event in llama_client.stream_analysis(report_type, articles, context):
+            if event['type'] == 'token':
+                html_lines = converter.feed(event['content'])
+                if html_lines:
+                    yield sse('chunk', {'html': '\n'.join(html_lines) + '\n'})
+                continue
+            
+            html_lines = converter.finish()
+            if html_lines:
+                yield sse('chunk', {'html': '\n'.join(html_lines)})
+            
+            success = event.get('success', False)
+            yield sse('done', {
+                'status_badge': build_ia_status_badge(
+                    success,
+                    model_used=event.get('model_used'),
+                    error=event.get('error')
+                ),
+                'llama_status': {
+                    'success': success,
+                    'error': event.get('error'),
+                    'mode': 'IA' if success else 'Dégradé'
+                }
+            })
+
     # ===== ROUTES IA =====
+    def fetch_ia_report_articles(start_ts, end_ts, themes, max_articles=100):
+        """Sélectionne les articles à analyser pour un rapport IA (bornes pub_ts de day_bounds)"""
+        conn = db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        query = "SELECT id, title, content, pub_date, sentiment_type, feed_url FROM articles WHERE 1=1"
+        params = []
+        
+        if start_ts is not None:
+            query += " AND pub_ts >= ?"
+            params.append(start_ts)
+        if end_ts is not None:
+            query += " AND pub_ts < ?"
+            params.append(end_ts)
+        if themes:
+            placeholders = ','.join('?' * len(themes))
+            query += f" AND id IN (SELECT DISTINCT article_id FROM theme_analyses WHERE theme_id IN ({placeholders}) AND confidence >= 0.3)"
+            params.extend(themes)
+        
+        query += " ORDER BY pub_ts DESC LIMIT ?"
+        params.append(max_articles)
+        
+        cursor.execute(query, params)
+        articles = []
+        for row in cursor.fetchall():
+            articles.append({
+                'id': row[0],
+                'title': row[1],
+                'content': row[2],
+                'pub_date': row[3],
+                'sentiment': row[4],
+                'source': row[5]
+            })
+        
+        conn.close()
+        return articles
+
     @app.route('/api/generate-ia-report', methods=['POST'])
     def generate_ia_report():
-        """Génère un rapport d'analyse IA à partir des articles"""
+        """
+        Génère un rapport d'analyse IA à partir des articles
+        Avec "stream": true (ou Accept: text/event-stream), le rapport est
+        transmis en server-sent events au fil de la génération Llama
+        """
         try:
             data = request.get_json()
             
@@ -907,39 +1167,26 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             include_sentiment = data.get('include_sentiment', True)
             include_sources = data.get('include_sources', True)
             generate_pdf = data.get('generate_pdf', False)
+            stream = data.get('stream') or \
+                request.accept_mimetypes.best == 'text/event-stream'
+            # Au-delà de REPORT_CHUNK_SIZE, les articles sont résumés par lots (map-reduce)
+            try:
+                max_articles = max(1, min(int(data.get('max_articles', 100)), REPORT_MAX_ARTICLES))
+            except (TypeError, ValueError):
+                return jsonify({
+                    'success': False,
+                    'error': 'max_articles doit être un entier'
+                }), 400
             
-            conn = db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            query = "SELECT id, title, content, pub_date, sentiment_type, feed_url FROM articles WHERE 1=1"
-            params = []
-            
-            if start_date:
-                query += " AND DATE(pub_date) >= ?"
-                params.append(start_date)
-            if end_date:
-                query += " AND DATE(pub_date) <= ?"
-                params.append(end_date)
-            if themes:
-                placeholders = ','.join('?' * len(themes))
-                query += f" AND id IN (SELECT DISTINCT article_id FROM theme_analyses WHERE theme_id IN ({placeholders}) AND confidence >= 0.3)"
-                params.extend(themes)
-            
-            query += " ORDER BY pub_date DESC LIMIT 100"
-            
-            cursor.execute(query, params)
-            articles = []
-            for row in cursor.fetchall():
-                articles.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'content': row[2],
-                    'pub_date': row[3],
-                    'sentiment': row[4],
-                    'source': row[5]
-                })
+            try:
+                start_ts, end_ts = day_bounds(start_date, end_date)
+            except (TypeError, ValueError):
+                return jsonify({
+                    'success': False,
+                    'error': INVALID_DATE_ERROR
+                }), 400
             
-            conn.close()
+            articles = fetch_ia_report_articles(start_ts, end_ts, themes, max_articles)
             
             if not articles:
                 return jsonify({
@@ -947,6 +1194,29 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
                     'error': 'Aucun article trouvé avec les critères sélectionnés'
                 }), 400
             
+            response_meta = {
+                'success': True,
+                'report_type': report_type,
+                'articles_analyzed': len(articles),
+                'themes_covered': themes,
+                'period': f"{start_date} to {end_date}" if start_date and end_date else "Toutes périodes"
+            }
+            
+            if generate_pdf:
+                response_meta['pdf_generation_available'] = True
+            
+            if stream:
+                return Response(
+                    stream_with_context(stream_ia_analysis(
+                        articles, report_type, themes, start_date, end_date, response_meta
+                    )),
+                    mimetype='text/event-stream',
+                    headers={
+                        'Cache-Control': 'no-cache',
+                        'X-Accel-Buffering': 'no'
+                    }
+                )
+            
             # APPEL AU CLIENT LLAMA
             analysis_result = generate_ia_analysis(
                 articles, 
@@ -957,11 +1227,7 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             )
             
             response_data = {
-                'success': True,
-                'report_type': report_type,
-                'articles_analyzed': len(articles),
-                'themes_covered': themes,
-                'period': f"{start_date} to {end_date}" if start_date and end_date else "Toutes périodes",
+                **response_meta,
                 'analysis_html': analysis_result['html_content'],
                 'recommendations': analysis_result.get('recommendations', ''),
                 'llama_status': {
@@ -971,9 +1237,6 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
                 }
             }
             
-            if generate_pdf:
-                response_data['pdf_generation_available'] = True
-            
             return jsonify(response_data)
             
         except Exception as e:
@@ -985,6 +1248,123 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
                 'error': f'Erreur génération rapport IA: {str(e)}'
             }), 500
 
+    @app.route('/api/llama/timings')
+    def get_llama_timings():
+        """Temps d'évaluation du prompt vs génération mesurés par llama.cpp"""
+        try:
+            from .llama_client import get_llama_client
+            return jsonify({
+                'success': True,
+                'timings': get_llama_client().get_timing_stats()
+            })
+        except Exception as e:
+            logger.error(f"Erreur récupération timings Llama: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/http/metrics')
+    def get_http_metrics():
+        """Métriques des appels HTTP sortants, par hôte"""
+        try:
+            from .http_client import get_http_client
+            return jsonify({
+                'success': True,
+                'hosts': get_http_client().get_metrics()
+            })
+        except Exception as e:
+            logger.error(f"Erreur récupération métriques HTTP: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        """Métriques au format texte Prometheus"""
+        from .metrics import render_metrics
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+    @app.route('/api/metrics/responses')
+    def get_response_metrics_route():
+        """Métriques des réponses par endpoint (octets, sérialisation, compression)"""
+        try:
+            from .response_layer import get_response_metrics
+            return jsonify({'success': True, **get_response_metrics()})
+        except Exception as e:
+            logger.error(f"Erreur récupération métriques réponses: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/feeds/schedule')
+    def get_feed_schedule():
+        """État du planificateur de flux (file, intervalles, flux en erreur)"""
+        try:
+            from .feed_scheduler import get_feed_scheduler
+            return jsonify({
+                'success': True,
+                'scheduler': get_feed_scheduler(db_manager, rss_manager).get_status()
+            })
+        except Exception as e:
+            logger.error(f"Erreur récupération planificateur flux: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    def models_scope():
+        """
+        Portée des routes /api/models : le registre du processus Flask
+        Les workers du pool de sentiment ont chacun leur propre registre,
+        que ces routes ne voient ni ne déchargent
+        """
+        from .sentiment_service import get_sentiment_service
+        workers = get_sentiment_service().get_stats()['workers']
+        scope = {'scope': 'flask_process', 'sentiment_workers': workers}
+        if workers:
+            scope['note'] = (
+                f"{workers} worker(s) de scoring gèrent leurs propres modèles, "
+                "non concernés ici ; ils les déchargent après idle_timeout d'inactivité"
+            )
+        return scope
+
+    @app.route('/api/models/status')
+    def get_models_status():
+        """État des modèles de sentiment du processus Flask (chargés, inactifs...)"""
+        try:
+            from .model_registry import get_model_registry
+            registry = get_model_registry()
+            return jsonify({
+                'success': True,
+                'idle_timeout': registry.idle_timeout,
+                'models': registry.status(),
+                **models_scope()
+            })
+        except Exception as e:
+            logger.error(f"Erreur récupération état modèles: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/models/<name>/unload', methods=['POST'])
+    def unload_model(name):
+        """
+        Libère la mémoire d'un modèle du processus Flask (rechargé au
+        prochain usage) ; les workers de scoring ne sont pas concernés
+        """
+        try:
+            from .model_registry import get_model_registry
+            return jsonify({
+                'success': True,
+                'unloaded': get_model_registry().unload(name),
+                **models_scope()
+            })
+        except Exception as e:
+            logger.error(f"Erreur déchargement modèle {name}: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/sentiment/service')
+    def get_sentiment_service_stats():
+        """Statistiques du pool de scoring de sentiment"""
+        try:
+            from .sentiment_service import get_sentiment_service
+            return jsonify({
+                'success': True,
+                'service': get_sentiment_service().get_stats()
+            })
+        except Exception as e:
+            logger.error(f"Erreur statistiques service sentiment: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
     @app.route('/api/generate-pdf', methods=['POST'])
     def generate_pdf_report():
         """Génère un PDF à partir du contenu de l'analyse IA"""
@@ -1088,7 +1468,8 @@ def register_routes(app: Flask, db_manager: DatabaseManager, theme_manager: Them
             </html>
             """
 
-            # Générer le PDF avec xhtml2pdf
+            # Générer le PDF avec xhtml2pdf (importé ici : ~1,5 s au démarrage sinon)
+            from xhtml2pdf import pisa
             pdf_buffer = BytesIO()
             pisa_status = pisa.CreatePDF(
                 BytesIO(full_html.encode('UTF-8')),
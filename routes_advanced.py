@@ -9,6 +9,7 @@ from flask import request, jsonify
 import logging
 import sqlite3
 from datetime import datetime, timedelta
+from .database import days_ago_timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -117,10 +118,10 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
                 
                 cursor.execute("""
                     SELECT id FROM articles 
-                    WHERE pub_date >= DATE('now', '-7 days')
-                    ORDER BY pub_date DESC
+                    WHERE pub_ts >= ?
+                    ORDER BY pub_ts DESC
                     LIMIT 100
-                """)
+                """, (days_ago_timestamp(7, start_of_day=True),))
                 
                 article_ids = [row[0] for row in cursor.fetchall()]
                 conn.close()
@@ -182,7 +183,7 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
             cursor = conn.cursor()
             
             cursor.execute("""
-                SELECT id, title, content, pub_date, feed_url
+                SELECT id, title, content, pub_date, feed_url, feed_id
                 FROM articles WHERE id = ?
             """, (article_id,))
             
@@ -195,7 +196,8 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
                 'title': row[1],
                 'content': row[2],
                 'pub_date': row[3],
-                'feed_url': row[4]
+                'feed_url': row[4],
+                'feed_id': row[5]
             }
             
             # Récupérer les thèmes de l'article
@@ -210,13 +212,13 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
             # Récupérer les articles récents (7 derniers jours)
             cursor.execute("""
                 SELECT id, title, content, pub_date, feed_url, 
-                       sentiment_type, sentiment_score
+                       sentiment_type, sentiment_score, feed_id
                 FROM articles 
-                WHERE pub_date >= DATE('now', '-7 days')
+                WHERE pub_ts >= ?
                 AND id != ?
-                ORDER BY pub_date DESC
+                ORDER BY pub_ts DESC
                 LIMIT 200
-            """, (article_id,))
+            """, (days_ago_timestamp(7, start_of_day=True), article_id))
             
             candidates = []
             for row in cursor.fetchall():
@@ -227,7 +229,8 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
                     'pub_date': row[3],
                     'feed_url': row[4],
                     'sentiment_type': row[5],
-                    'sentiment_score': row[6]
+                    'sentiment_score': row[6],
+                    'feed_id': row[7]
                 }
                 
                 # Récupérer les thèmes du candidat
@@ -287,10 +290,10 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
                 
                 cursor.execute("""
                     SELECT id FROM articles 
-                    WHERE pub_date >= DATE('now', '-7 days')
-                    ORDER BY pub_date DESC
+                    WHERE pub_ts >= ?
+                    ORDER BY pub_ts DESC
                     LIMIT 100
-                """)
+                """, (days_ago_timestamp(7, start_of_day=True),))
                 
                 article_ids = [row[0] for row in cursor.fetchall()]
                 conn.close()
@@ -302,7 +305,7 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
             # Articles à traiter
             placeholders = ','.join('?' * len(article_ids))
             cursor.execute(f"""
-                SELECT id, title, content, pub_date, feed_url
+                SELECT id, title, content, pub_date, feed_url, feed_id
                 FROM articles 
                 WHERE id IN ({placeholders})
             """, article_ids)
@@ -314,7 +317,8 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
                     'title': row[1],
                     'content': row[2],
                     'pub_date': row[3],
-                    'feed_url': row[4]
+                    'feed_url': row[4],
+                    'feed_id': row[5]
                 }
                 
                 # Récupérer les thèmes
@@ -330,12 +334,12 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
             # Pool de candidats (articles récents)
             cursor.execute("""
                 SELECT id, title, content, pub_date, feed_url,
-                       sentiment_type, sentiment_score
+                       sentiment_type, sentiment_score, feed_id
                 FROM articles 
-                WHERE pub_date >= DATE('now', '-7 days')
-                ORDER BY pub_date DESC
+                WHERE pub_ts >= ?
+                ORDER BY pub_ts DESC
                 LIMIT 300
-            """)
+            """, (days_ago_timestamp(7, start_of_day=True),))
             
             recent_articles = []
             for row in cursor.fetchall():
@@ -346,7 +350,8 @@ def register_advanced_routes(app, db_manager, bayesian_analyzer, corroboration_e
                     'pub_date': row[3],
                     'feed_url': row[4],
                     'sentiment_type': row[5],
-                    'sentiment_score': row[6]
+                    'sentiment_score': row[6],
+                    'feed_id': row[7]
                 }
                 
                 cursor.execute("""
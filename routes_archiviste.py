@@ -5,8 +5,8 @@ Routes API pour l'archiviste - Analyse historique
 
 from flask import request, jsonify
 import logging
-from datetime import datetime, timedelta
-from .database import DatabaseManager
+from datetime import datetime
+from .database import DatabaseManager, days_ago_timestamp
 from .archiviste import get_archiviste
 
 logger = logging.getLogger(__name__)
@@ -136,43 +136,97 @@ def register_archiviste_routes(app, db_manager: DatabaseManager):
                 'error': str(e)
             }), 500
     
+    def get_page_params(default_limit: int):
+        """Pagination par curseur : limit (max 100) et before (id exclusif)"""
+        limit = max(1, min(int(request.args.get('limit', default_limit)), 100))
+        before = request.args.get('before', type=int)
+        return limit, before
+    
+    def query_analyses(filters: dict, limit: int, before: int = None,
+                       history: bool = False, with_top_themes: bool = False):
+        """
+        Lit une page d'analyses, les plus récentes d'abord
+        Par défaut depuis historical_analyses_latest (une ligne par
+        période/thème) ; history=True parcourt toutes les exécutions
+        """
+        if history:
+            table, id_column = 'historical_analyses', 'id'
+        else:
+            table, id_column = 'historical_analyses_latest', 'analysis_id'
+        
+        columns = "period_key, period_name, theme, total_items, avg_sentiment_score, emotional_intensity, created_at, top_themes"
+        query = f"SELECT {id_column}, {columns} FROM {table} WHERE 1=1"
+        params = []
+        
+        if filters.get('period_key'):
+            query += " AND period_key = ?"
+            params.append(filters['period_key'])
+        
+        if filters.get('theme'):
+            query += " AND theme = ?"
+            params.append(filters['theme'])
+        
+        if before:
+            query += f" AND {id_column} < ?"
+            params.append(before)
+        
+        # Une ligne de plus pour savoir s'il reste une page
+        query += f" ORDER BY {id_column} DESC LIMIT ?"
+        params.append(limit + 1)
+        
+        conn = db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        items = []
+        for row in rows:
+            item = {
+                'id': row[0],
+                'period_key': row[1],
+                'period_name': row[2],
+                'theme': row[3],
+                'total_items': row[4],
+                'avg_sentiment_score': row[5],
+                'emotional_intensity': row[6],
+                'created_at': row[7]
+            }
+            if with_top_themes:
+                item['top_themes'] = row[8] if row[8] else '[]'
+            items.append(item)
+        
+        pagination = {
+            'limit': limit,
+            'has_more': has_more,
+            'next_before': rows[-1][0] if has_more else None
+        }
+        return items, pagination
+    
     @app.route('/api/archiviste/analyses-history', methods=['GET'])
     def get_historical_analyses():
         """
-        Récupère l'historique des analyses
+        Récupère l'historique des analyses (paginé)
+        ?history=1 pour inclure toutes les exécutions d'un même couple période/thème
         """
         try:
-            limit = int(request.args.get('limit', 10))
-            
-            conn = db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT period_key, period_name, theme, total_items, avg_sentiment_score,
-                       emotional_intensity, top_themes, created_at
-                FROM historical_analyses
-                ORDER BY created_at DESC
-                LIMIT ?
-            """, (limit,))
-            
-            analyses = []
-            for row in cursor.fetchall():
-                analyses.append({
-                    'period_key': row[0],
-                    'period_name': row[1],
-                    'theme': row[2],
-                    'total_items': row[3],
-                    'avg_sentiment_score': row[4],
-                    'emotional_intensity': row[5],
-                    'top_themes': row[6] if row[6] else '[]',
-                    'created_at': row[7]
-                })
+            limit, before = get_page_params(10)
+            history = request.args.get('history', '').lower() in ('1', 'true')
             
-            conn.close()
+            analyses, pagination = query_analyses(
+                {}, limit, before, history=history, with_top_themes=True
+            )
             
             return jsonify({
                 'success': True,
-                'analyses': analyses
+                'analyses': analyses,
+                'pagination': pagination
             })
             
         except Exception as e:
@@ -185,54 +239,23 @@ def register_archiviste_routes(app, db_manager: DatabaseManager):
     @app.route('/api/archiviste/trends-evolution', methods=['GET'])
     def get_trends_evolution():
         """
-        Récupère l'évolution des tendances sur plusieurs périodes
+        Récupère l'évolution des tendances sur plusieurs périodes (paginé)
+        Dernière analyse de chaque période/thème ; ?history=1 pour tout l'historique
         """
         try:
-            period_key = request.args.get('period_key')
-            theme = request.args.get('theme')
-            
-            conn = db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT period_key, period_name, theme, total_items, avg_sentiment_score,
-                       emotional_intensity, created_at
-                FROM historical_analyses
-            """
-            params = []
-            
-            if period_key:
-                query += " WHERE period_key = ?"
-                params.append(period_key)
+            limit, before = get_page_params(50)
+            history = request.args.get('history', '').lower() in ('1', 'true')
+            filters = {
+                'period_key': request.args.get('period_key'),
+                'theme': request.args.get('theme')
+            }
             
-            if theme:
-                if period_key:
-                    query += " AND theme = ?"
-                else:
-                    query += " WHERE theme = ?"
-                params.append(theme)
-            
-            query += " ORDER BY created_at DESC"
-            
-            cursor.execute(query, params)
-            
-            trends = []
-            for row in cursor.fetchall():
-                trends.append({
-                    'period_key': row[0],
-                    'period_name': row[1],
-                    'theme': row[2],
-                    'total_items': row[3],
-                    'avg_sentiment_score': row[4],
-                    'emotional_intensity': row[5],
-                    'created_at': row[6]
-                })
-            
-            conn.close()
+            trends, pagination = query_analyses(filters, limit, before, history=history)
             
             return jsonify({
                 'success': True,
-                'trends': trends
+                'trends': trends,
+                'pagination': pagination
             })
             
         except Exception as e:
@@ -252,7 +275,7 @@ def register_archiviste_routes(app, db_manager: DatabaseManager):
             days = int(data.get('days', 30))  # Par défaut, dernière mois
             
             # Utiliser les données actuelles RSS
-            cutoff_date = datetime.now() - timedelta(days=days)
+            cutoff_ts = days_ago_timestamp(days)
             
             # Récupérer les articles RSS récents
             conn = db_manager.get_connection()
@@ -261,10 +284,10 @@ def register_archiviste_routes(app, db_manager: DatabaseManager):
             cursor.execute("""
                 SELECT id, title, content, sentiment_score, sentiment_type
                 FROM articles
-                WHERE pub_date >= ?
-                ORDER BY pub_date DESC
+                WHERE pub_ts >= ?
+                ORDER BY pub_ts DESC
                 LIMIT 500
-            """, (cutoff_date,))
+            """, (cutoff_ts,))
             
             rss_articles = []
             for row in cursor.fetchall():
@@ -324,4 +347,23 @@ def register_archiviste_routes(app, db_manager: DatabaseManager):
                 'error': str(e)
             }), 500
     
+    @app.route('/api/archiviste/cache-stats', methods=['GET'])
+    def get_archive_cache_stats():
+        """
+        Statistiques du cache disque Archive.org
+        """
+        try:
+            return jsonify({
+                'success': True,
+                'cache': archiviste.cache.get_stats(),
+                'snapshots': archiviste.snapshots.get_status()
+            })
+            
+        except Exception as e:
+            logger.error(f"Erreur cache stats: {e}")
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
     logger.info("✅ Routes archiviste enregistrées")
\ No newline at end of file
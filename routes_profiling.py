@@ -0,0 +1,183 @@
+# Flask/routes_profiling.py
+"""
+Routes d'administration du profilage : profils enregistrés, tâches de
+fond à profiler, instantanés mémoire (tracemalloc)
+"""
+
+from flask import request, jsonify, Response
+import logging
+from .config import PROFILING_ENABLED
+from .profiling import (
+    MODES, JOBS, token_ok, profile_store, memory_tracker,
+    arm_job, disarm_job, get_armed_jobs
+)
+
+logger = logging.getLogger(__name__)
+
+def register_profiling_routes(app):
+    """
+    Enregistre les routes /api/admin/profil* et /api/admin/tracemalloc/*
+    """
+
+    @app.before_request
+    def check_profiling_access():
+        """Endpoints invisibles si le profilage est désactivé, jeton éventuel exigé"""
+        if not request.path.startswith(('/api/admin/profil', '/api/admin/tracemalloc')):
+            return None
+        if not PROFILING_ENABLED:
+            return jsonify({'success': False, 'error': 'Profilage désactivé (PROFILING_ENABLED)'}), 404
+        if not token_ok(request):
+            return jsonify({'success': False, 'error': 'Jeton de profilage invalide'}), 403
+        return None
+
+    # ============================================================
+    # PROFILS
+    # ============================================================
+
+    @app.route('/api/admin/profiles')
+    def list_profiles():
+        try:
+            return jsonify({'success': True, 'profiles': profile_store.list()})
+        except Exception as e:
+            logger.error(f"Erreur liste des profils: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/admin/profiles/<int:profile_id>')
+    def get_profile(profile_id):
+        """Résumé d'un profil (fonctions les plus coûteuses)"""
+        try:
+            profile = profile_store.get(profile_id)
+            if profile is None:
+                return jsonify({'success': False, 'error': 'Profil non trouvé'}), 404
+
+            return jsonify({
+                'success': True,
+                'profile': {k: v for k, v in profile.items() if k != 'data'}
+            })
+        except Exception as e:
+            logger.error(f"Erreur lecture profil {profile_id}: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/admin/profiles/<int:profile_id>/download')
+    def download_profile(profile_id):
+        """
+        .prof : python -m pstats / snakeviz
+        .txt  : piles repliées (flamegraph.pl, speedscope)
+        """
+        try:
+            profile = profile_store.get(profile_id)
+            if profile is None:
+                return jsonify({'success': False, 'error': 'Profil non trouvé'}), 404
+
+            filename = f"profile-{profile_id}-{profile['mode']}.{profile['extension']}"
+            mimetype = 'application/octet-stream' if profile['extension'] == 'prof' else 'text/plain'
+            return Response(
+                profile['data'],
+                mimetype=mimetype,
+                headers={'Content-Disposition': f'attachment; filename={filename}'}
+            )
+        except Exception as e:
+            logger.error(f"Erreur téléchargement profil {profile_id}: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    # ============================================================
+    # TÂCHES DE FOND
+    # ============================================================
+
+    @app.route('/api/admin/profiling/jobs', methods=['GET', 'POST'])
+    def profiling_jobs():
+        """
+        POST {"job": "feed_scheduler", "mode": "cprofile", "runs": 3}
+        profile les 3 prochaines exécutions ; "runs": 0 désarme la tâche
+        """
+        try:
+            if request.method == 'POST':
+                data = request.get_json() or {}
+                job = data.get('job')
+                mode = data.get('mode', 'cprofile')
+                runs = int(data.get('runs', 1))
+
+                if job not in JOBS:
+                    return jsonify({'success': False, 'error': f"Tâche inconnue (attendu: {', '.join(JOBS)})"}), 400
+                if mode not in MODES:
+                    return jsonify({'success': False, 'error': f"Mode inconnu (attendu: {', '.join(MODES)})"}), 400
+
+                if runs > 0:
+                    arm_job(job, mode, runs)
+                    logger.info(f"🔬 Tâche {job} armée pour {runs} exécution(s) ({mode})")
+                else:
+                    disarm_job(job)
+
+            return jsonify({'success': True, 'jobs': list(JOBS), 'armed': get_armed_jobs()})
+        except Exception as e:
+            logger.error(f"Erreur profilage des tâches: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    # ============================================================
+    # MÉMOIRE
+    # ============================================================
+
+    @app.route('/api/admin/tracemalloc')
+    def tracemalloc_status():
+        try:
+            return jsonify({'success': True, **memory_tracker.get_status()})
+        except Exception as e:
+            logger.error(f"Erreur statut tracemalloc: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/admin/tracemalloc/start', methods=['POST'])
+    def tracemalloc_start():
+        try:
+            data = request.get_json(silent=True) or {}
+            if 'frames' in data:
+                memory_tracker.start(int(data['frames']))
+            else:
+                memory_tracker.start()
+            return jsonify({'success': True, **memory_tracker.get_status()})
+        except Exception as e:
+            logger.error(f"Erreur démarrage tracemalloc: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/admin/tracemalloc/stop', methods=['POST'])
+    def tracemalloc_stop():
+        try:
+            memory_tracker.stop()
+            return jsonify({'success': True, **memory_tracker.get_status()})
+        except Exception as e:
+            logger.error(f"Erreur arrêt tracemalloc: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/admin/tracemalloc/snapshot', methods=['POST'])
+    def tracemalloc_snapshot():
+        try:
+            key = request.args.get('key', 'lineno')
+            limit = int(request.args.get('limit', 20))
+            if key not in ('lineno', 'filename', 'traceback'):
+                return jsonify({'success': False, 'error': 'key: lineno, filename ou traceback'}), 400
+
+            return jsonify({'success': True, 'snapshot': memory_tracker.take_snapshot(key, limit)})
+        except Exception as e:
+            logger.error(f"Erreur instantané tracemalloc: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @app.route('/api/admin/tracemalloc/diff')
+    def tracemalloc_diff():
+        """?base=1[&target=3] : croissance depuis l'instantané base"""
+        try:
+            base = request.args.get('base', type=int)
+            target = request.args.get('target', type=int)
+            key = request.args.get('key', 'lineno')
+            limit = int(request.args.get('limit', 30))
+            if base is None:
+                return jsonify({'success': False, 'error': 'Paramètre base requis'}), 400
+            if key not in ('lineno', 'filename', 'traceback'):
+                return jsonify({'success': False, 'error': 'key: lineno, filename ou traceback'}), 400
+
+            diff = memory_tracker.diff(base, target, key, limit)
+            if diff is None:
+                return jsonify({'success': False, 'error': 'Instantané non trouvé'}), 404
+
+            return jsonify({'success': True, 'diff': diff})
+        except Exception as e:
+            logger.error(f"Erreur comparaison tracemalloc: {e}")
+            return jsonify({'success': False, 'error': str(e)}), 500
@@ -6,9 +6,10 @@ Routes API pour l'agrégation et la comparaison des réseaux sociaux
 from flask import request, jsonify
 import logging
 from datetime import datetime, timedelta
-from .database import DatabaseManager
+from .database import DatabaseManager, days_ago_timestamp
 from .social_aggregator import get_social_aggregator
 from .social_comparator import get_social_comparator
+from .social_collector import get_social_collector
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,7 @@ def register_social_routes(app, db_manager: DatabaseManager):
     """
     social_aggregator = get_social_aggregator(db_manager)
     social_comparator = get_social_comparator(db_manager)
+    social_collector = get_social_collector(db_manager)
     
     # ============================================================
     # ROUTES D'AGRÉGATION
@@ -32,28 +34,40 @@ def register_social_routes(app, db_manager: DatabaseManager):
             data = request.get_json() or {}
             days = int(data.get('days', 1))
             
-            cutoff_date = datetime.now() - timedelta(days=days)
+            # Collecte en arrière-plan : réponse immédiate avec l'état du stockage
+            if data.get('async'):
+                social_collector.trigger()
+                return jsonify({
+                    'success': True,
+                    'message': 'Collecte programmée',
+                    'freshness': social_collector.get_freshness()
+                })
             
-            # Récupérer les posts récents
-            posts = social_aggregator.fetch_recent_posts(cutoff_date)
+            # Collecte immédiate (sources en parallèle, budget de latence fixe)
+            result = social_collector.collect_once(days)
+            posts_with_sentiment = result.get('posts', [])
             
-            if not posts:
+            if result['error']:
+                return jsonify({
+                    'success': False,
+                    'error': result['error'],
+                    'sources_status': result['sources_status']
+                }), 500
+            
+            if not posts_with_sentiment:
                 return jsonify({
                     'success': True,
                     'message': 'Aucun post récent trouvé',
-                    'posts_count': 0
+                    'posts_count': 0,
+                    'sources_status': result['sources_status']
                 })
             
-            # Analyser le sentiment
-            posts_with_sentiment = social_aggregator.analyze_social_sentiment(posts)
-            
-            # Sauvegarder en base
-            saved_count = social_aggregator.save_social_posts(posts_with_sentiment)
-            
             return jsonify({
                 'success': True,
                 'posts_count': len(posts_with_sentiment),
-                'saved_count': saved_count,
+                'saved_count': result['saved_count'],
+                'sources_status': result['sources_status'],
+                'nitter_health': social_aggregator.get_nitter_health(),
                 'posts': posts_with_sentiment[:50]  # Limite pour l'API
             })
             
@@ -72,12 +86,14 @@ def register_social_routes(app, db_manager: DatabaseManager):
         try:
             days = int(request.args.get('days', 1))
             
+            # Lecture du stockage local uniquement (alimenté par le collecteur)
             top_themes = social_aggregator.get_top_emotion_themes(days)
             
             return jsonify({
                 'success': True,
                 'themes': top_themes,
-                'period_days': days
+                'period_days': days,
+                'freshness': social_collector.get_freshness()
             })
             
         except Exception as e:
@@ -99,7 +115,8 @@ def register_social_routes(app, db_manager: DatabaseManager):
             
             return jsonify({
                 'success': True,
-                'statistics': stats
+                'statistics': stats,
+                'freshness': social_collector.get_freshness()
             })
             
         except Exception as e:
@@ -159,7 +176,8 @@ def register_social_routes(app, db_manager: DatabaseManager):
             
             return jsonify({
                 'success': True,
-                'posts': posts
+                'posts': posts,
+                'freshness': social_collector.get_freshness()
             })
             
         except Exception as e:
@@ -169,6 +187,24 @@ def register_social_routes(app, db_manager: DatabaseManager):
                 'error': str(e)
             }), 500
     
+    @app.route('/api/social/freshness', methods=['GET'])
+    def get_social_freshness():
+        """
+        Fraîcheur du stockage local des posts sociaux
+        """
+        try:
+            return jsonify({
+                'success': True,
+                'freshness': social_collector.get_freshness()
+            })
+            
+        except Exception as e:
+            logger.error(f"Erreur social freshness: {e}")
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
     # ============================================================
     # ROUTES DE COMPARAISON
     # ============================================================
@@ -241,10 +277,10 @@ def register_social_routes(app, db_manager: DatabaseManager):
                 SELECT a.id, a.title, a.content, a.sentiment_score, a.sentiment_type
                 FROM articles a
                 JOIN theme_analyses ta ON a.id = ta.article_id
-                WHERE ta.theme_id = ? AND ta.confidence >= 0.3 AND a.pub_date >= ?
-                ORDER BY a.pub_date DESC
+                WHERE ta.theme_id = ? AND ta.confidence >= 0.3 AND a.pub_ts >= ?
+                ORDER BY a.pub_ts DESC
                 LIMIT 100
-            """, (theme, cutoff_date))
+            """, (theme, days_ago_timestamp(days)))
             
             rss_articles = []
             for row in cursor.fetchall():
@@ -1,65 +1,188 @@
 import feedparser
 import logging
-from datetime import datetime
+import requests
+import threading
+import time
+from datetime import datetime, timezone
 from typing import List, Dict, Any
-from .database import DatabaseManager
-from .sentiment_analyzer import SentimentAnalyzer
+from urllib.parse import urlsplit
+from .database import DatabaseManager, to_timestamp
+from .sentiment_service import get_sentiment_service
 from .theme_analyzer import ThemeAnalyzer
+from .live_updates import get_dashboard_publisher
+from .metrics import (
+    FEED_FETCH_SECONDS, FEED_PARSE_SECONDS, FEED_FETCHES, THEME_SCORING_SECONDS,
+    DB_WRITE_SECONDS, ARTICLES_INGESTED, ARTICLES_DEDUPED, ARTICLES_FAILED
+)
+from .http_client import HttpClient, CircuitBreaker, get_http_client
+from .config import (
+    MAX_ARTICLES_PER_FEED, FEED_FETCH_TIMEOUT, FEED_USER_AGENT,
+    FEED_HOST_FAILURE_THRESHOLD, FEED_HOST_RESET_TIMEOUT
+)
 
 logger = logging.getLogger(__name__)
 
 class RSSManager:
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, http_client: HttpClient = None):
         self.db_manager = db_manager
-        self.sentiment_analyzer = SentimentAnalyzer()
+        # Sessions keep-alive et métriques par hôte partagées
+        self.http = http_client or get_http_client()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self.sentiment_analyzer = get_sentiment_service()
         self.theme_analyzer = ThemeAnalyzer(db_manager)
+        self._feed_ids = {}  # url → feeds.id (les lignes de feeds ne sont jamais supprimées)
     
-    def parse_feed(self, feed_url: str) -> List[Dict[str, Any]]:
-        """Parse un flux RSS et retourne les articles"""
-        try:
-            feed = feedparser.parse(feed_url)
-            articles = []
+    def _entries_to_articles(self, entries, feed_url: str) -> List[Dict[str, Any]]:
+        """Convertit les entrées feedparser (au plus MAX_ARTICLES_PER_FEED)"""
+        articles = []
+        
+        for entry in entries[:MAX_ARTICLES_PER_FEED]:
+            # Extraction des données de l'article
+            title = entry.get('title', 'Sans titre')
+            link = entry.get('link', '')
+            published = entry.get('published_parsed', entry.get('updated_parsed'))
             
-            for entry in feed.entries:
-                # Extraction des données de l'article
-                title = entry.get('title', 'Sans titre')
-                link = entry.get('link', '')
-                published = entry.get('published_parsed', entry.get('updated_parsed'))
-                
-                # Conversion de la date
-                if published:
-                    pub_date = datetime(*published[:6])
-                else:
-                    pub_date = datetime.now()
-                
-                # Contenu de l'article
-                content = ''
-                if hasattr(entry, 'summary'):
-                    content = entry.summary
-                if hasattr(entry, 'content'):
-                    content = entry.content[0].value if entry.content else content
-                if hasattr(entry, 'description'):
-                    content = entry.description if not content else content
-                
-                article_data = {
-                    'title': title,
-                    'content': content,
-                    'link': link,
-                    'pub_date': pub_date,
-                    'feed_url': feed_url
-                }
-                
-                articles.append(article_data)
+            # Conversion de la date (naïve, en UTC comme published_parsed)
+            if published:
+                pub_date = datetime(*published[:6])
+            else:
+                pub_date = datetime.now(timezone.utc).replace(tzinfo=None)
             
-            return articles
+            # Contenu de l'article
+            content = ''
+            if hasattr(entry, 'summary'):
+                content = entry.summary
+            if hasattr(entry, 'content'):
+                content = entry.content[0].value if entry.content else content
+            if hasattr(entry, 'description'):
+                content = entry.description if not content else content
             
+            article_data = {
+                'title': title,
+                'content': content,
+                'link': link,
+                'pub_date': pub_date,
+                'feed_url': feed_url
+            }
+            
+            articles.append(article_data)
+        
+        return articles
+    
+    def parse_feed(self, feed_url: str) -> List[Dict[str, Any]]:
+        """Parse un flux RSS et retourne les articles (via fetch_feed)"""
+        result = self.fetch_feed(feed_url)
+        if result['error'] and not result['articles']:
+            logger.error(f"Erreur parsing flux {feed_url}: {result['error']}")
+        return result['articles']
+    
+    def _breaker(self, host: str) -> CircuitBreaker:
+        """Disjoncteur de l'hôte : plusieurs flux d'un même site partagent son état"""
+        with self._breakers_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    FEED_HOST_FAILURE_THRESHOLD, FEED_HOST_RESET_TIMEOUT
+                )
+            return breaker
+    
+    def fetch_feed(self, feed_url: str, etag: str = None,
+                   modified: str = None) -> Dict[str, Any]:
+        """
+        Télécharge un flux avec timeout et requête conditionnelle
+        (If-None-Match / If-Modified-Since) puis le parse
+        Retourne articles, statut HTTP, validateurs de cache et erreur éventuelle
+        """
+        result = {
+            'articles': [],
+            'status': None,
+            'not_modified': False,
+            'etag': etag,
+            'modified': modified,
+            'error': None
+        }
+        
+        headers = {'User-Agent': FEED_USER_AGENT}
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+        
+        host = urlsplit(feed_url).netloc
+        breaker = self._breaker(host)
+        if not breaker.allow_request():
+            result['error'] = f"Hôte {host} suspendu après des échecs répétés"
+            FEED_FETCHES.inc(result='error')
+            return result
+        
+        try:
+            with FEED_FETCH_SECONDS.time():
+                response = self.http.get(feed_url, headers=headers, timeout=FEED_FETCH_TIMEOUT)
+        except requests.RequestException as e:
+            breaker.record_failure()
+            result['error'] = f"{type(e).__name__}: {e}"
+            FEED_FETCHES.inc(result='error')
+            return result
+        
+        # Un 4xx concerne le flux, pas la disponibilité de l'hôte
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        
+        result['status'] = response.status_code
+        if response.status_code == 304:
+            result['not_modified'] = True
+            FEED_FETCHES.inc(result='not_modified')
+            return result
+        if response.status_code >= 400:
+            result['error'] = f"HTTP {response.status_code}"
+            FEED_FETCHES.inc(result='error')
+            return result
+        
+        result['etag'] = response.headers.get('ETag')
+        result['modified'] = response.headers.get('Last-Modified')
+        
+        try:
+            with FEED_PARSE_SECONDS.time():
+                feed = feedparser.parse(
+                    response.content,
+                    response_headers={**response.headers, 'content-location': response.url}
+                )
+            if feed.bozo and not feed.entries:
+                result['error'] = f"Flux invalide: {feed.get('bozo_exception')}"
+            result['articles'] = self._entries_to_articles(feed.entries, feed_url)
         except Exception as e:
-            logger.error(f"Erreur parsing flux {feed_url}: {e}")
-            return []
+            result['error'] = f"Erreur parsing: {e}"
+        
+        FEED_FETCHES.inc(result='error' if result['error'] else 'ok')
+        return result
+    
+    def _feed_id(self, cursor, feed_url: str):
+        """Id du flux dans feeds (enregistré au besoin, comme register_feeds)"""
+        if not feed_url:
+            return None
+        feed_id = self._feed_ids.get(feed_url)
+        if feed_id is not None:
+            return feed_id
+        
+        cursor.execute("SELECT id FROM feeds WHERE url = ?", (feed_url,))
+        row = cursor.fetchone()
+        if row:
+            self._feed_ids[feed_url] = row[0]
+            return row[0]
+        
+        # Pas de cache : la ligne disparaît si la transaction est annulée
+        cursor.execute("INSERT OR IGNORE INTO feeds (url) VALUES (?)", (feed_url,))
+        cursor.execute("SELECT id FROM feeds WHERE url = ?", (feed_url,))
+        return cursor.fetchone()[0]
     
-    def process_article(self, article_data: Dict[str, Any]) -> int:
+    def process_article(self, article_data: Dict[str, Any],
+                        sentiment_result: Dict[str, Any] = None) -> int:
         """
         Traite un article : sauvegarde + analyse sentiment + analyse thèmes
+        sentiment_result permet de fournir un score déjà calculé par lot
         Retourne l'ID de l'article sauvegardé
         """
         conn = self.db_manager.get_connection()
@@ -71,53 +194,111 @@ class RSSManager:
             existing = cursor.fetchone()
             
             if existing:
-                logger.info(f"Article déjà existant: {article_data['title']}")
+                logger.debug(f"Article déjà existant: {article_data['title']}")
+                ARTICLES_DEDUPED.inc()
                 return existing[0]
             
             # Analyse des sentiments
-            sentiment_result = self.sentiment_analyzer.analyze_article(
-                article_data['title'], 
-                article_data['content']
-            )
+            if sentiment_result is None:
+                sentiment_result = self.sentiment_analyzer.analyze_article(
+                    article_data['title'], 
+                    article_data['content']
+                )
             
             # Sauvegarde de l'article
+            write_started = time.perf_counter()
             cursor.execute("""
                 INSERT INTO articles 
-                (title, content, link, pub_date, feed_url, sentiment_score, sentiment_type)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (title, content, link, pub_date, pub_ts, feed_url, feed_id, sentiment_score, sentiment_type)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 article_data['title'],
                 article_data['content'],
                 article_data['link'],
                 article_data['pub_date'],
+                to_timestamp(article_data['pub_date']),
                 article_data['feed_url'],
+                self._feed_id(cursor, article_data['feed_url']),
                 sentiment_result['score'],
                 sentiment_result['type']
             ))
             
             article_id = cursor.lastrowid
+            write_seconds = time.perf_counter() - write_started
             
             # Analyse des thèmes
-            theme_scores = self.theme_analyzer.analyze_article(
-                article_data['content'],
-                article_data['title']
-            )
+            with THEME_SCORING_SECONDS.time():
+                theme_scores = self.theme_analyzer.analyze_article(
+                    article_data['content'],
+                    article_data['title']
+                )
             
             # Sauvegarde de l'analyse des thèmes
+            write_started = time.perf_counter()
             if theme_scores:
-                self.theme_analyzer.save_theme_analysis(article_id, theme_scores)
+                self.theme_analyzer.save_theme_analysis(article_id, theme_scores, cursor)
             
             conn.commit()
-            logger.info(f"Article traité: {article_data['title']} (ID: {article_id})")
+            DB_WRITE_SECONDS.observe(write_seconds + time.perf_counter() - write_started)
+            ARTICLES_INGESTED.inc()
+            logger.debug(f"Article traité: {article_data['title']} (ID: {article_id})")
             return article_id
             
         except Exception as e:
             logger.error(f"Erreur traitement article: {e}")
+            ARTICLES_FAILED.inc()
             conn.rollback()
             return -1
         finally:
             conn.close()
     
+    def _filter_new_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Articles dont le lien n'est pas encore en base"""
+        links = [a['link'] for a in articles]
+        if not links:
+            return []
+        
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            placeholders = ','.join('?' * len(links))
+            cursor.execute(f"SELECT link FROM articles WHERE link IN ({placeholders})", links)
+            existing = {row[0] for row in cursor.fetchall()}
+        finally:
+            conn.close()
+        
+        seen = set()
+        new_articles = []
+        for article in articles:
+            if article['link'] not in existing and article['link'] not in seen:
+                seen.add(article['link'])
+                new_articles.append(article)
+        return new_articles
+    
+    def ingest_articles(self, articles: List[Dict[str, Any]]) -> int:
+        """
+        Enregistre les nouveaux articles d'un flux (scoring en un seul lot)
+        Retourne le nombre d'articles effectivement ajoutés
+        """
+        # Scoring des nouveaux articles en un seul lot (pool de workers)
+        new_articles = self._filter_new_articles(articles)
+        ARTICLES_DEDUPED.inc(len(articles) - len(new_articles))
+        sentiments = self.sentiment_analyzer.analyze_articles(
+            [(a['title'], a['content']) for a in new_articles]
+        )
+        
+        added = 0
+        for article, sentiment in zip(new_articles, sentiments):
+            article_id = self.process_article(article, sentiment)
+            if article_id > 0:
+                added += 1
+        
+        # Les dashboards abonnés reçoivent le delta de cette ingestion
+        if added:
+            get_dashboard_publisher(self.db_manager).notify()
+        return added
+    
     def update_feeds(self, feed_urls: List[str]) -> Dict[str, Any]:
         """Met à jour tous les flux RSS"""
         results = {
@@ -130,15 +311,11 @@ class RSSManager:
             try:
                 articles = self.parse_feed(feed_url)
                 results['total_articles'] += len(articles)
-                
-                for article in articles:
-                    article_id = self.process_article(article)
-                    if article_id > 0:
-                        results['new_articles'] += 1
+                results['new_articles'] += self.ingest_articles(articles)
                         
             except Exception as e:
                 error_msg = f"Erreur flux {feed_url}: {e}"
                 logger.error(error_msg)
                 results['errors'].append(error_msg)
         
-        return results
\ No newline at end of file
+        return results
@@ -91,8 +91,10 @@ def main():
     print("-" * 50)
     
     try:
-        from Flask.app_factory import create_app
-        app = create_app()
+        from Flask.app_factory import create_app, should_start_services
+        # Le rechargeur (debug) relance le script : planificateur et tâches de
+        # fond uniquement dans le processus qui sert les requêtes
+        app = create_app(start_services=should_start_services(use_reloader=True))
         app.run(debug=True, host='0.0.0.0', port=port)
     except Exception as e:
         print(f"\n❌ Erreur au démarrage: {e}")
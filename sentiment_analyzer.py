@@ -1,9 +1,11 @@
 # Flask/sentiment_analyzer.py - VERSION AMÉLIORÉE
+import importlib.util
 import logging
-import threading
 from typing import Dict, Any
 import numpy as np
-from scipy import stats
+from .model_registry import ModelRegistry, get_model_registry
+from .config import SENTIMENT_BACKEND
+from .metrics import SENTIMENT_SECONDS
 
 # Importations conditionnelles
 try:
@@ -12,64 +14,38 @@ try:
 except ImportError:
     TEXTBLOB_AVAILABLE = False
 
-try:
-    import nltk
-    from nltk.sentiment import SentimentIntensityAnalyzer
-    NLTK_AVAILABLE = True
-except ImportError:
-    NLTK_AVAILABLE = False
-
-try:
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+# NLTK et transformers ne sont importés qu'au chargement des modèles
+# (voir model_registry) : on vérifie seulement leur présence ici
+NLTK_AVAILABLE = importlib.util.find_spec('nltk') is not None
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec('transformers') is not None
+if SENTIMENT_BACKEND == 'onnx':
+    TRANSFORMERS_AVAILABLE = TRANSFORMERS_AVAILABLE and importlib.util.find_spec('onnxruntime') is not None
 
 logger = logging.getLogger(__name__)
 
 class SentimentAnalyzer:
-    def __init__(self):
-        self.sia = None
-        self.transformer_pipeline = None
-        self._initialize_nltk()
-        self._initialize_transformer()
-    
-    def _initialize_nltk(self):
-        """Initialise NLTK en arrière-plan"""
+    """
+    Analyse de sentiment combinant TextBlob, VADER et un Transformer
+    Les modèles proviennent du registre partagé : ils sont chargés une
+    seule fois par processus, au premier usage
+    """
+
+    def __init__(self, registry: ModelRegistry = None):
+        self.registry = registry or get_model_registry()
+
+    @property
+    def sia(self):
+        """Analyseur VADER partagé (None si indisponible)"""
         if not NLTK_AVAILABLE:
-            return
-            
-        def download_nltk_data():
-            try:
-                nltk.data.find('vader_lexicon')
-                logger.info("✅ VADER lexicon déjà disponible")
-            except LookupError:
-                logger.info("📥 Téléchargement de VADER lexicon...")
-                nltk.download('vader_lexicon', quiet=True)
-                logger.info("✅ VADER lexicon téléchargé")
-            
-            self.sia = SentimentIntensityAnalyzer()
-        
-        # Lance le téléchargement dans un thread séparé
-        thread = threading.Thread(target=download_nltk_data)
-        thread.daemon = True
-        thread.start()
-    
-    def _initialize_transformer(self):
-        """Initialise le modèle de transformers pour une analyse plus précise"""
+            return None
+        return self.registry.get('vader')
+
+    @property
+    def transformer_pipeline(self):
+        """Pipeline Transformer partagé (None si indisponible)"""
         if not TRANSFORMERS_AVAILABLE:
-            return
-            
-        try:
-            # Utilisation d'un modèle multilingue pour une meilleure couverture
-            self.transformer_pipeline = pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                return_all_scores=True
-            )
-            logger.info("✅ Modèle Transformer initialisé")
-        except Exception as e:
-            logger.warning(f"⚠️ Impossible d'initialiser le modèle Transformer: {e}")
+            return None
+        return self.registry.get('transformer')
     
     def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """
@@ -91,17 +67,20 @@ class SentimentAnalyzer:
             
             # Analyse avec TextBlob
             if TEXTBLOB_AVAILABLE:
-                blob = TextBlob(text)
-                polarity = blob.sentiment.polarity
-                subjectivity = blob.sentiment.subjectivity
+                with SENTIMENT_SECONDS.time(backend='textblob'):
+                    blob = TextBlob(text)
+                    polarity = blob.sentiment.polarity
+                    subjectivity = blob.sentiment.subjectivity
                 scores.append(polarity)
                 methods.append('textblob')
                 # Confiance basée sur la subjectivité (plus subjectif = moins confiant)
                 confidences.append(1.0 - subjectivity)
             
             # Analyse avec VADER
-            if self.sia:
-                vader_scores = self.sia.polarity_scores(text)
+            sia = self.sia
+            if sia:
+                with SENTIMENT_SECONDS.time(backend='vader'):
+                    vader_scores = sia.polarity_scores(text)
                 vader_compound = vader_scores['compound']
                 scores.append(vader_compound)
                 methods.append('vader')
@@ -110,9 +89,11 @@ class SentimentAnalyzer:
                 confidences.append(min(1.0, emotion_strength * 2))
             
             # Analyse avec Transformer (si disponible)
-            if self.transformer_pipeline:
+            transformer_pipeline = self.transformer_pipeline
+            if transformer_pipeline:
                 try:
-                    transformer_result = self.transformer_pipeline(text[:512])  # Limite de tokens
+                    with SENTIMENT_SECONDS.time(backend=f'transformer_{SENTIMENT_BACKEND}'):
+                        transformer_result = transformer_pipeline(text[:512])  # Limite de tokens
                     # Extraire le score de la classe la plus probable
                     best_score = max(transformer_result[0], key=lambda x: x['score'])
                     if best_score['label'] == 'LABEL_2':  # POSITIF
@@ -0,0 +1,287 @@
+# Flask/sentiment_service.py
+"""
+Service de scoring de sentiment multi-processus
+Les analyses (TextBlob, VADER, Transformer) sont CPU-bound : elles sont
+exécutées dans un pool de processus (un jeu de modèles par worker) plutôt
+que dans le thread de la requête Flask, sous le GIL. Les textes soumis
+sont regroupés par lots pendant une courte fenêtre pour amortir les
+échanges entre processus.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Tuple
+from .metrics import SENTIMENT_SECONDS, SENTIMENT_BATCH_SECONDS
+from .config import (
+    SENTIMENT_WORKERS, SENTIMENT_BATCH_SIZE, SENTIMENT_BATCH_WINDOW_MS,
+    SENTIMENT_TIMEOUT, SENTIMENT_WARMUP
+)
+
+logger = logging.getLogger(__name__)
+
+NEUTRAL_RESULT = {
+    'score': 0.0,
+    'type': 'neutral',
+    'confidence': 0.0,
+    'method': 'none'
+}
+
+# Analyseur propre à chaque processus worker
+_worker_analyzer = None
+
+
+def _init_worker():
+    """
+    Initialisation d'un worker : un seul thread de calcul par processus
+    Seul VADER (léger) est préchargé ; le Transformer est chargé au premier
+    texte et déchargé par le registre du worker après MODEL_IDLE_TIMEOUT
+    """
+    global _worker_analyzer
+    os.environ.setdefault('OMP_NUM_THREADS', '1')
+
+    from .sentiment_analyzer import SentimentAnalyzer
+
+    _worker_analyzer = SentimentAnalyzer()
+    if SENTIMENT_WARMUP:
+        _worker_analyzer.sia
+
+
+def _score_job(analyzer, job: Tuple) -> Dict[str, Any]:
+    kind = job[0]
+    if kind == 'article':
+        return analyzer.analyze_article(job[1], job[2])
+    return analyzer.analyze_sentiment(job[1])
+
+
+def _score_batch(jobs: List[Tuple]) -> Tuple[List[Dict[str, Any]], Dict]:
+    """
+    Exécuté dans un worker : score un lot de textes
+    Retourne aussi les mesures par backend du lot, fusionnées côté parent
+    """
+    results = [_score_job(_worker_analyzer, job) for job in jobs]
+    return results, SENTIMENT_SECONDS.drain()
+
+
+def _noop() -> bool:
+    return True
+
+
+class SentimentService:
+    """
+    Façade de scoring : même interface que SentimentAnalyzer
+    (analyze_sentiment, analyze_article) plus des variantes par lot
+
+    Avec workers=0, ou si le pool est indisponible, le scoring se fait
+    dans le processus courant.
+    """
+
+    def __init__(self, workers: int = SENTIMENT_WORKERS,
+                 batch_size: int = SENTIMENT_BATCH_SIZE,
+                 batch_window_ms: float = SENTIMENT_BATCH_WINDOW_MS,
+                 timeout: float = SENTIMENT_TIMEOUT):
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window_ms / 1000.0
+        self.timeout = timeout
+        self._queue: "queue.Queue[Tuple[Tuple, Future]]" = queue.Queue()
+        self._executor = None
+        self._dispatcher = None
+        self._local_analyzer = None
+        self._lock = threading.Lock()
+        self.stats = {'jobs': 0, 'batches': 0, 'inline': 0, 'errors': 0}
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Démarre le pool et le thread de regroupement (idempotent)"""
+        if not self.workers or self._executor is not None:
+            return
+        if multiprocessing.parent_process() is not None:
+            # Déjà dans un worker : jamais de pool imbriqué, scoring local
+            self.workers = 0
+            return
+
+        with self._lock:
+            if self._executor is not None:
+                return
+            try:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # spawn : pas de fork d'un processus déjà multi-threadé
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+                # Lance tous les workers (et leur préchargement) tout de suite
+                for _ in range(self.workers):
+                    self._executor.submit(_noop)
+            except Exception as e:
+                logger.warning(f"⚠️ Pool de sentiment indisponible, scoring local: {e}")
+                self.workers = 0
+                self._executor = None
+                return
+
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name='sentiment-dispatch')
+                self._dispatcher.daemon = True
+                self._dispatcher.start()
+            logger.info(f"✅ Service de sentiment: {self.workers} workers")
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    # ------------------------------------------------------------------
+    # Regroupement par lots
+    # ------------------------------------------------------------------
+
+    def _dispatch_loop(self):
+        """Regroupe les soumissions pendant batch_window puis envoie le lot"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_window
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._send(batch)
+
+    def _send(self, batch: List[Tuple[Tuple, Future]]):
+        jobs = [job for job, _ in batch]
+        futures = [future for _, future in batch]
+
+        executor = self._executor
+        if executor is None:
+            self._resolve_inline(batch)
+            return
+
+        try:
+            remote = executor.submit(_score_batch, jobs)
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.error(f"❌ Pool de sentiment arrêté: {e}")
+            self._on_pool_broken()
+            self._resolve_inline(batch)
+            return
+
+        self.stats['batches'] += 1
+        submitted_at = time.perf_counter()
+
+        def on_done(done: Future):
+            try:
+                results, timings = done.result()
+                SENTIMENT_BATCH_SECONDS.observe(time.perf_counter() - submitted_at)
+                SENTIMENT_SECONDS.merge(timings)
+            except Exception as e:
+                logger.error(f"❌ Erreur lot sentiment ({len(jobs)} textes): {e}")
+                self.stats['errors'] += 1
+                if isinstance(e, BrokenProcessPool):
+                    self._on_pool_broken()
+                self._resolve_inline(batch)
+                return
+            for future, result in zip(futures, results):
+                future.set_result(result)
+
+        remote.add_done_callback(on_done)
+
+    def _on_pool_broken(self):
+        """Un worker est mort : on recrée le pool au prochain appel"""
+        with self._lock:
+            self._executor = None
+
+    def _resolve_inline(self, batch: List[Tuple[Tuple, Future]]):
+        for job, future in batch:
+            if not future.done():
+                try:
+                    future.set_result(self._score_inline(job))
+                except Exception as e:
+                    future.set_exception(e)
+
+    def _score_inline(self, job: Tuple) -> Dict[str, Any]:
+        if self._local_analyzer is None:
+            from .sentiment_analyzer import SentimentAnalyzer
+            self._local_analyzer = SentimentAnalyzer()
+        self.stats['inline'] += 1
+        return _score_job(self._local_analyzer, job)
+
+    # ------------------------------------------------------------------
+    # API publique
+    # ------------------------------------------------------------------
+
+    def submit(self, job: Tuple) -> Future:
+        """Soumet un job ('text', texte) ou ('article', titre, contenu)"""
+        self.stats['jobs'] += 1
+        future = Future()
+
+        if self.workers and self._executor is None:
+            self.start()
+
+        if self._executor is None:
+            self._resolve_inline([(job, future)])
+        else:
+            self._queue.put((job, future))
+        return future
+
+    def _wait(self, futures: List[Future]) -> List[Dict[str, Any]]:
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=self.timeout))
+            except Exception as e:
+                logger.warning(f"⚠️ Scoring sentiment échoué: {e}")
+                self.stats['errors'] += 1
+                results.append(dict(NEUTRAL_RESULT, method='error', error=str(e)))
+        return results
+
+    def analyze_sentiment(self, text: str) -> Dict[str, Any]:
+        return self._wait([self.submit(('text', text))])[0]
+
+    def analyze_article(self, title: str, content: str) -> Dict[str, Any]:
+        return self._wait([self.submit(('article', title, content))])[0]
+
+    def analyze_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score une liste de textes (soumis d'un coup, lots remplis)"""
+        return self._wait([self.submit(('text', text)) for text in texts])
+
+    def analyze_articles(self, articles: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Score une liste de (titre, contenu)"""
+        return self._wait([self.submit(('article', title, content)) for title, content in articles])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'workers': self.workers if self._executor is not None else 0,
+            'queued': self._queue.qsize(),
+            'batch_size': self.batch_size,
+            'batch_window_ms': self.batch_window * 1000
+        }
+
+
+# Instance globale
+_sentiment_service = None
+_service_lock = threading.Lock()
+
+def get_sentiment_service() -> SentimentService:
+    """Retourne le service de scoring partagé par le processus"""
+    global _sentiment_service
+    if _sentiment_service is None:
+        with _service_lock:
+            if _sentiment_service is None:
+                _sentiment_service = SentimentService()
+                atexit.register(_sentiment_service.shutdown)
+    return _sentiment_service
@@ -0,0 +1,59 @@
+# Flask/service_lock.py
+"""
+Verrous de processus pour les services de fond
+Sous un serveur multi-processus (gunicorn -w N), chaque worker crée
+l'application : un verrou de fichier non bloquant, posé à côté de la base,
+désigne le seul processus qui démarre les tâches de fond. Le verrou est
+libéré par le système à la mort du processus ; le worker qui le remplace
+le reprend au démarrage.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict
+from .config import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# Fichiers verrouillés gardés ouverts pendant toute la vie du processus
+_held: Dict[str, object] = {}
+_held_lock = threading.Lock()
+
+
+def _try_lock(handle) -> bool:
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def acquire_service_lock(name: str, db_path: str = DB_PATH) -> bool:
+    """
+    Vrai si ce processus détient (ou vient de prendre) le verrou `name`
+    pour la base db_path ; faux s'il est tenu par un autre processus
+    """
+    path = f"{db_path}.{name}.lock"
+    with _held_lock:
+        if path in _held:
+            return True
+
+        handle = open(path, 'a+')
+        if not _try_lock(handle):
+            handle.close()
+            logger.info(f"⏸️ Verrou {name} tenu par un autre processus ({path})")
+            return False
+
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        _held[path] = handle
+        logger.info(f"🔒 Verrou {name} pris par le processus {os.getpid()}")
+        return True
@@ -4,14 +4,18 @@ Module d'agrégation de flux de réseaux sociaux
 Compatible avec l'architecture Flask existante
 """
 
-import requests
 import logging
 import re
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from .database import DatabaseManager
-from .sentiment_analyzer import SentimentAnalyzer
+from .sentiment_service import get_sentiment_service
+from .http_client import HttpClient, CircuitBreaker, get_http_client
+from .config import (SOCIAL_FETCH_BUDGET, NITTER_HEDGE_DELAY,
+                     NITTER_FAILURE_THRESHOLD, NITTER_RESET_TIMEOUT)
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +24,10 @@ class SocialAggregator:
     Agrégateur de flux de réseaux sociaux avec analyse thématique
     """
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, http_client: HttpClient = None):
         self.db_manager = db_manager
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment_analyzer = get_sentiment_service()
+        self.http = http_client or get_http_client()
         
         # Instances Nitter avec rotation automatique
         self.nitter_instances = [
@@ -34,6 +39,20 @@ class SocialAggregator:
         ]
         self.current_instance_index = 0
         
+        # Disjoncteur par instance : les instances mortes sont ignorées
+        self.nitter_breakers = {
+            instance: CircuitBreaker(NITTER_FAILURE_THRESHOLD, NITTER_RESET_TIMEOUT)
+            for instance in self.nitter_instances
+        }
+        self.nitter_hedge_delay = NITTER_HEDGE_DELAY
+        self.fetch_budget = SOCIAL_FETCH_BUDGET
+        
+        # Pools séparés : sources d'un côté, requêtes Nitter (hedging) de l'autre,
+        # pour qu'une source ne bloque jamais en attendant un worker de son propre pool
+        self._source_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='social-source')
+        self._nitter_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='social-nitter')
+        self.last_fetch_status = {}
+        
         # Sources par défaut (thèmes émotionnels et géopolitiques)
         self.default_sources = [
             {
@@ -81,43 +100,94 @@ class SocialAggregator:
             'fear': ['peur', 'crainte', 'appréhension', 'fear', 'worry', 'anxiety', 'concern'],
             'surprise': ['surprise', 'étonnement', 'stupéfaction', 'surprise', 'shock', 'amazement']
         }
+        self._emotion_matcher = None
         
     def _get_current_nitter_instance(self) -> str:
         """Retourne l'instance Nitter actuelle"""
         return self.nitter_instances[self.current_instance_index]
     
-    def _rotate_nitter_instance(self) -> str:
-        """Fait tourner l'instance Nitter en cas d'erreur"""
-        self.current_instance_index = (self.current_instance_index + 1) % len(self.nitter_instances)
-        return self._get_current_nitter_instance()
-    
-    def _fetch_from_nitter(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _fetch_from_nitter(self, source: Dict[str, Any],
+                           deadline: float = None) -> List[Dict[str, Any]]:
         """
-        Récupère des données depuis Nitter avec gestion d'erreurs
+        Récupère des données depuis Nitter en « hedged requests » :
+        l'instance préférée est interrogée d'abord, puis une instance miroir
+        est lancée en parallèle toutes les nitter_hedge_delay secondes (ou
+        dès qu'une tentative échoue). La première réponse non vide l'emporte.
+        Les instances dont le disjoncteur est ouvert sont ignorées ;
+        allow_request() n'est appelé qu'au lancement effectif d'une
+        tentative, pour qu'un essai semi-ouvert soit toujours conclu.
         """
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                return self._nitter_request(source)
-            except Exception as e:
-                logger.warning(f"❌ Nitter attempt {attempt + 1} failed: {e}")
-                
-                if attempt < max_retries - 1:
-                    # Rotation d'instance
-                    old_instance = self._get_current_nitter_instance()
-                    self._rotate_nitter_instance()
-                    logger.info(f"🔄 Rotating Nitter: {old_instance} → {self._get_current_nitter_instance()}")
-                    
-                    # Attente progressive
-                    import time
-                    time.sleep(2 ** attempt)
-                else:
-                    logger.error(f"❌ Nitter failed after {max_retries} attempts")
-                    return []
+        start_index = self.current_instance_index
+        ordered = self.nitter_instances[start_index:] + self.nitter_instances[:start_index]
+        instances = [i for i in ordered if not self.nitter_breakers[i].is_open()]
+        
+        if not instances:
+            logger.warning("⚠️ Toutes les instances Nitter sont coupées (circuit ouvert)")
+            return []
+        
+        pending = {}
+        launched = []
+        candidates = list(instances)
+        
+        def launch_next() -> bool:
+            while candidates:
+                instance = candidates.pop(0)
+                # Un autre appel a pu prendre l'essai semi-ouvert entre-temps
+                if not self.nitter_breakers[instance].allow_request():
+                    continue
+                launched.append(instance)
+                future = self._nitter_executor.submit(self._nitter_attempt, source, instance)
+                pending[future] = instance
+                return True
+            return False
+        
+        if not launch_next():
+            logger.warning("⚠️ Toutes les instances Nitter sont coupées (circuit ouvert)")
+            return []
+        
+        while pending:
+            can_hedge = bool(candidates)
+            timeout = self.nitter_hedge_delay if can_hedge else None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"⏱️ Nitter: budget épuisé pour {source['name']}")
+                    break
+                timeout = min(timeout, remaining) if timeout is not None else remaining
+            
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                instance = pending.pop(future)
+                posts = future.result()
+                if posts:
+                    # L'instance gagnante devient la préférée pour les prochains appels
+                    self.current_instance_index = self.nitter_instances.index(instance)
+                    return posts
+            
+            # Délai de hedge écoulé ou tentative échouée : lancer un miroir
+            if can_hedge:
+                previous = launched[-1]
+                if launch_next():
+                    logger.info(f"🔄 Hedge Nitter: {previous} → {launched[-1]}")
+        
+        return []
+    
+    def _nitter_attempt(self, source: Dict[str, Any], instance: str) -> Optional[List[Dict[str, Any]]]:
+        """Une tentative sur une instance, avec mise à jour de son disjoncteur"""
+        breaker = self.nitter_breakers[instance]
+        try:
+            posts = self._nitter_request(source, instance)
+            breaker.record_success()
+            return posts
+        except Exception as e:
+            breaker.record_failure()
+            logger.warning(f"❌ Nitter {instance} failed: {e} (circuit: {breaker.state})")
+            return None
     
-    def _nitter_request(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _nitter_request(self, source: Dict[str, Any], base_url: str = None) -> List[Dict[str, Any]]:
         """Effectue la requête vers Nitter"""
-        base_url = self._get_current_nitter_instance()
+        base_url = base_url or self._get_current_nitter_instance()
         config = source.get('config', {})
         
         # Construction de l'URL
@@ -149,7 +219,7 @@ class SocialAggregator:
             'Connection': 'keep-alive'
         }
         
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = self.http.get(url, params=params, headers=headers, timeout=15)
         response.raise_for_status()
         
         # Parse du HTML
@@ -331,7 +401,7 @@ class SocialAggregator:
                 'User-Agent': 'GEOPOLIS/1.0 (+https://github.com/geopolis)'
             }
             
-            response = requests.get(reddit_url, headers=headers, timeout=15)
+            response = self.http.get(reddit_url, headers=headers, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -364,51 +434,93 @@ class SocialAggregator:
             logger.error(f"❌ Reddit fetch error: {e}")
             return []
     
+    def _build_emotion_matcher(self):
+        """
+        Compile tous les lexiques émotionnels en une seule expression
+        Retourne (pattern, mot-clé -> émotions) ; un mot-clé présent
+        plusieurs fois dans un lexique compte autant de fois
+        """
+        keyword_emotions = {}
+        for emotion, keywords in self.emotion_themes.items():
+            for keyword in keywords:
+                keyword_emotions.setdefault(keyword.lower(), []).append(emotion)
+        
+        # Les plus longs d'abord pour que les expressions priment sur leurs préfixes
+        alternatives = sorted(keyword_emotions, key=len, reverse=True)
+        pattern = re.compile(r'\b(' + '|'.join(map(re.escape, alternatives)) + r')\b')
+        return pattern, keyword_emotions
+    
+    def _load_stored_posts(self, cutoff_date: datetime) -> List[tuple]:
+        """Posts stockés depuis cutoff_date : (titre, contenu, engagement JSON)"""
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT title, content, engagement
+                FROM social_posts
+                WHERE pub_date >= ?
+            """, (cutoff_date,))
+            return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error loading stored social posts: {e}")
+            return []
+        finally:
+            conn.close()
+    
     def get_top_emotion_themes(self, days: int = 1) -> List[Dict[str, Any]]:
         """
         Identifie les 5 thèmes émotionnels les plus discussés
+        
+        Lecture des posts stockés (social_posts) et scoring en un seul
+        passage : chaque post est mis en minuscules une fois, tous les
+        lexiques sont cherchés avec une seule expression compilée, et les
+        compteurs et l'engagement sont cumulés dans la même boucle.
         """
         cutoff_date = datetime.now() - timedelta(days=days)
+        rows = self._load_stored_posts(cutoff_date)
         
-        # Récupérer tous les posts récents
-        all_posts = self.fetch_recent_posts(cutoff_date)
-        
-        if not all_posts:
+        if not rows:
             return []
         
-        # Analyser les émotions
-        emotion_scores = {}
+        if self._emotion_matcher is None:
+            self._emotion_matcher = self._build_emotion_matcher()
+        pattern, keyword_emotions = self._emotion_matcher
         
-        for emotion, keywords in self.emotion_themes.items():
-            score = 0
-            matched_posts = 0
+        emotion_scores = {
+            emotion: {'score': 0, 'posts_count': 0, 'total_engagement': 0}
+            for emotion in self.emotion_themes
+        }
+        
+        for title, content, engagement_json in rows:
+            text = f"{title or ''} {content or ''}".lower()
             
-            for post in all_posts:
-                text = f"{post['title']} {post['content']}".lower()
-                
-                # Compter les correspondances
-                for keyword in keywords:
-                    score += text.count(keyword.lower())
-                
-                if any(keyword.lower() in text for keyword in keywords):
-                    matched_posts += 1
-            
-            # Score pondéré par le nombre de posts et l'engagement
-            total_engagement = sum(
-                post['engagement'].get('likes', 0) + 
-                post['engagement'].get('retweets', 0) + 
-                post['engagement'].get('comments', 0)
-                for post in all_posts
-                if any(keyword.lower() in f"{post['title']} {post['content']}".lower() 
-                       for keyword in keywords)
+            matched = set()
+            for match in pattern.finditer(text):
+                for emotion in keyword_emotions[match.group(1)]:
+                    emotion_scores[emotion]['score'] += 1
+                    matched.add(emotion)
+            
+            if not matched:
+                continue
+            
+            try:
+                engagement = json.loads(engagement_json) if engagement_json else {}
+            except (TypeError, ValueError):
+                engagement = {}
+            post_engagement = (
+                engagement.get('likes', 0) +
+                engagement.get('retweets', 0) +
+                engagement.get('comments', 0)
             )
             
-            emotion_scores[emotion] = {
-                'score': score,
-                'posts_count': matched_posts,
-                'total_engagement': total_engagement,
-                'final_score': score * (1 + total_engagement / 100)  # Pondération par engagement
-            }
+            for emotion in matched:
+                emotion_scores[emotion]['posts_count'] += 1
+                emotion_scores[emotion]['total_engagement'] += post_engagement
+        
+        for data in emotion_scores.values():
+            # Score pondéré par l'engagement
+            data['final_score'] = data['score'] * (1 + data['total_engagement'] / 100)
         
         # Trier par score final et prendre les 5 premiers
         top_themes = sorted(
@@ -428,27 +540,45 @@ class SocialAggregator:
             for theme, data in top_themes
         ]
     
-    def fetch_recent_posts(self, cutoff_date: datetime) -> List[Dict[str, Any]]:
+    def _fetch_source(self, source: Dict[str, Any], deadline: float) -> List[Dict[str, Any]]:
+        """Récupère les posts d'une source (exécuté dans le pool de sources)"""
+        logger.info(f"📡 Fetching from {source['name']} ({source['type']})")
+        
+        if source['type'] == 'nitter':
+            return self._fetch_from_nitter(source, deadline)
+        elif source['type'] == 'reddit':
+            return self._fetch_from_reddit(source)
+        
+        logger.warning(f"Unknown source type: {source['type']}")
+        return []
+    
+    def fetch_recent_posts(self, cutoff_date: datetime,
+                           budget: float = None) -> List[Dict[str, Any]]:
         """
         Récupère tous les posts récents depuis les sources activées
+        
+        Les sources sont interrogées en parallèle ; à l'expiration du budget
+        (secondes), les résultats déjà reçus sont retournés et les sources
+        encore en cours sont signalées 'timeout' dans last_fetch_status.
         """
+        budget = self.fetch_budget if budget is None else budget
+        deadline = time.monotonic() + budget
+        
+        futures = {
+            self._source_executor.submit(self._fetch_source, source, deadline): source
+            for source in self.default_sources
+            if source.get('enabled', True)
+        }
+        
+        done, not_done = wait(list(futures), timeout=budget)
+        
         all_posts = []
-        sources = self.default_sources
+        fetch_status = {}
         
-        for source in sources:
-            if not source.get('enabled', True):
-                continue
-                
-            logger.info(f"📡 Fetching from {source['name']} ({source['type']})")
-            
+        for future in done:
+            source = futures[future]
             try:
-                if source['type'] == 'nitter':
-                    posts = self._fetch_from_nitter(source)
-                elif source['type'] == 'reddit':
-                    posts = self._fetch_from_reddit(source)
-                else:
-                    logger.warning(f"Unknown source type: {source['type']}")
-                    posts = []
+                posts = future.result()
                 
                 # Filtrer par date
                 recent_posts = [
@@ -457,111 +587,117 @@ class SocialAggregator:
                 ]
                 
                 all_posts.extend(recent_posts)
+                fetch_status[source['id']] = {'status': 'ok', 'posts': len(recent_posts)}
                 logger.info(f"✅ {source['name']}: {len(recent_posts)} recent posts")
                 
             except Exception as e:
+                fetch_status[source['id']] = {'status': 'error', 'error': str(e)}
                 logger.error(f"❌ Error fetching from {source['name']}: {e}")
         
+        for future in not_done:
+            source = futures[future]
+            fetch_status[source['id']] = {'status': 'timeout'}
+            logger.warning(f"⏱️ {source['name']}: budget de {budget}s dépassé, résultats partiels")
+        
+        self.last_fetch_status = fetch_status
+        
         # Trier par date décroissante
         all_posts.sort(key=lambda x: x['pub_date'], reverse=True)
         
         logger.info(f"📊 Total recent posts: {len(all_posts)}")
         return all_posts
     
+    def get_nitter_health(self) -> Dict[str, str]:
+        """État des disjoncteurs Nitter"""
+        return {instance: breaker.state for instance, breaker in self.nitter_breakers.items()}
+    
     def analyze_social_sentiment(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Analyse le sentiment des posts sociaux
         """
         posts_with_sentiment = []
         
-        for post in posts:
-            try:
-                # Analyser le sentiment
-                sentiment_result = self.sentiment_analyzer.analyze_sentiment(
-                    f"{post['title']} {post['content']}"
-                )
-                
-                # Enrichir le post
-                enriched_post = {
-                    **post,
-                    'sentiment_score': sentiment_result['score'],
-                    'sentiment_type': sentiment_result['type'],
-                    'sentiment_confidence': sentiment_result['confidence']
-                }
-                
-                posts_with_sentiment.append(enriched_post)
-                
-            except Exception as e:
-                logger.debug(f"Error analyzing sentiment for post {post.get('id', 'unknown')}: {e}")
-                # Ajouter le post sans analyse de sentiment
-                posts_with_sentiment.append({
-                    **post,
-                    'sentiment_score': 0.0,
-                    'sentiment_type': 'neutral',
-                    'sentiment_confidence': 0.0
-                })
+        # Soumission de tous les textes d'un coup : le service les regroupe par lots
+        try:
+            sentiments = self.sentiment_analyzer.analyze_many(
+                [f"{post.get('title', '')} {post.get('content', '')}" for post in posts]
+            )
+        except Exception as e:
+            logger.debug(f"Error analyzing social sentiment: {e}")
+            sentiments = [{}] * len(posts)
+        
+        for post, sentiment_result in zip(posts, sentiments):
+            # Enrichir le post (neutre si l'analyse a échoué)
+            posts_with_sentiment.append({
+                **post,
+                'sentiment_score': sentiment_result.get('score', 0.0),
+                'sentiment_type': sentiment_result.get('type', 'neutral'),
+                'sentiment_confidence': sentiment_result.get('confidence', 0.0)
+            })
         
         return posts_with_sentiment
     
+    def _post_row(self, post: Dict[str, Any]) -> Optional[tuple]:
+        """Ligne social_posts d'un post (None si des champs obligatoires manquent)"""
+        try:
+            return (
+                post['id'],
+                post['title'],
+                post['content'],
+                post['link'],
+                post['pub_date'],
+                post['source'],
+                post['source_type'],
+                post['author'],
+                post.get('sentiment_score', 0.0),
+                post.get('sentiment_type', 'neutral'),
+                post.get('sentiment_confidence', 0.0),
+                # Clés triées : un engagement inchangé donne le même texte
+                json.dumps(post.get('engagement', {}), ensure_ascii=False, sort_keys=True)
+            )
+        except KeyError as e:
+            logger.debug(f"Error saving post {post.get('id', 'unknown')}: champ manquant {e}")
+            return None
+    
     def save_social_posts(self, posts: List[Dict[str, Any]]) -> int:
         """
         Sauvegarde les posts sociaux dans la base de données
+        
+        Upsert par lot en une transaction : un post existant ne voit
+        mises à jour que les colonnes qui évoluent (texte, sentiment,
+        engagement), et seulement si l'une d'elles a changé
         """
+        rows = [row for row in map(self._post_row, posts) if row is not None]
+        if not rows:
+            return 0
+        
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         
         try:
-            # Créer la table si elle n'existe pas
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS social_posts (
-                    id TEXT PRIMARY KEY,
-                    title TEXT,
-                    content TEXT,
-                    link TEXT,
-                    pub_date DATETIME,
-                    source TEXT,
-                    source_type TEXT,
-                    author TEXT,
-                    sentiment_score REAL,
-                    sentiment_type TEXT,
-                    sentiment_confidence REAL,
-                    engagement TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            saved_count = 0
-            
-            for post in posts:
-                try:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO social_posts 
-                        (id, title, content, link, pub_date, source, source_type, 
-                         author, sentiment_score, sentiment_type, sentiment_confidence, engagement)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        post['id'],
-                        post['title'],
-                        post['content'],
-                        post['link'],
-                        post['pub_date'],
-                        post['source'],
-                        post['source_type'],
-                        post['author'],
-                        post.get('sentiment_score', 0.0),
-                        post.get('sentiment_type', 'neutral'),
-                        post.get('sentiment_confidence', 0.0),
-                        json.dumps(post.get('engagement', {}), ensure_ascii=False)
-                    ))
-                    saved_count += 1
-                    
-                except Exception as e:
-                    logger.debug(f"Error saving post {post.get('id', 'unknown')}: {e}")
-                    continue
+            cursor.executemany("""
+                INSERT INTO social_posts 
+                (id, title, content, link, pub_date, source, source_type, 
+                 author, sentiment_score, sentiment_type, sentiment_confidence, engagement)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    title = excluded.title,
+                    content = excluded.content,
+                    sentiment_score = excluded.sentiment_score,
+                    sentiment_type = excluded.sentiment_type,
+                    sentiment_confidence = excluded.sentiment_confidence,
+                    engagement = excluded.engagement
+                WHERE social_posts.title IS NOT excluded.title
+                   OR social_posts.content IS NOT excluded.content
+                   OR social_posts.sentiment_score IS NOT excluded.sentiment_score
+                   OR social_posts.sentiment_type IS NOT excluded.sentiment_type
+                   OR social_posts.sentiment_confidence IS NOT excluded.sentiment_confidence
+                   OR social_posts.engagement IS NOT excluded.engagement
+            """, rows)
             
             conn.commit()
-            logger.info(f"💾 Saved {saved_count} social posts")
-            return saved_count
+            logger.info(f"💾 Saved {len(rows)} social posts ({cursor.rowcount} inserted or changed)")
+            return len(rows)
             
         except Exception as e:
             logger.error(f"Error saving social posts: {e}")
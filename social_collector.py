@@ -0,0 +1,201 @@
+# Flask/social_collector.py
+"""
+Collecteur périodique des réseaux sociaux
+Interroge Nitter/Reddit en arrière-plan et alimente social_posts : les
+routes de lecture ne consultent que le stockage local et ne dépendent
+plus de la disponibilité des services tiers.
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from .database import DatabaseManager
+from .social_aggregator import SocialAggregator, get_social_aggregator
+from .profiling import profile_job
+from .config import SOCIAL_COLLECT_INTERVAL, SOCIAL_COLLECT_DAYS
+
+logger = logging.getLogger(__name__)
+
+
+class SocialCollector:
+    """
+    Boucle de collecte : fetch → sentiment → sauvegarde, toutes les
+    interval secondes, avec historique des exécutions en base
+    """
+
+    def __init__(self, db_manager: DatabaseManager, aggregator: SocialAggregator = None,
+                 interval: float = SOCIAL_COLLECT_INTERVAL,
+                 days: int = SOCIAL_COLLECT_DAYS):
+        self.db_manager = db_manager
+        self.aggregator = aggregator or get_social_aggregator(db_manager)
+        self.interval = interval
+        self.days = days
+        self._thread = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._collect_lock = threading.Lock()
+        self.collecting = False
+
+    def start(self):
+        """Démarre la boucle de collecte (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='social-collector')
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"✅ Collecteur social démarré (toutes les {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def trigger(self):
+        """Demande une collecte immédiate (asynchrone)"""
+        self._wake.set()
+
+    def _run(self):
+        # Première collecte tout de suite si le stockage est vide ou périmé
+        freshness = self.get_freshness()
+        if freshness['age_seconds'] is not None and not freshness['stale']:
+            self._wake.wait(self.interval - freshness['age_seconds'])
+
+        while not self._stop.is_set():
+            self._wake.clear()
+            with profile_job('social_collector'):
+                self.collect_once()
+            self._wake.wait(self.interval)
+
+    def collect_once(self, days: int = None) -> Dict[str, Any]:
+        """
+        Exécute une collecte complète et l'enregistre dans social_collection_runs
+        Une seule collecte à la fois : un appel concurrent attend la fin de la précédente
+        """
+        days = days or self.days
+
+        with self._collect_lock:
+            self.collecting = True
+            started_at = datetime.now()
+            result = {
+                'posts_count': 0,
+                'saved_count': 0,
+                'sources_status': {},
+                'error': None
+            }
+
+            try:
+                cutoff_date = started_at - timedelta(days=days)
+                posts = self.aggregator.fetch_recent_posts(cutoff_date)
+                result['sources_status'] = self.aggregator.last_fetch_status
+
+                if posts:
+                    posts_with_sentiment = self.aggregator.analyze_social_sentiment(posts)
+                    result['posts_count'] = len(posts_with_sentiment)
+                    result['saved_count'] = self.aggregator.save_social_posts(posts_with_sentiment)
+                    result['posts'] = posts_with_sentiment
+
+                logger.info(f"📡 Collecte sociale: {result['saved_count']}/{result['posts_count']} posts enregistrés")
+
+            except Exception as e:
+                logger.error(f"❌ Erreur collecte sociale: {e}")
+                result['error'] = str(e)
+
+            finally:
+                self.collecting = False
+
+            self._record_run(started_at, datetime.now(), result)
+            return result
+
+    def _record_run(self, started_at: datetime, finished_at: datetime, result: Dict[str, Any]):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                INSERT INTO social_collection_runs
+                (started_at, finished_at, posts_count, saved_count, sources_status, error)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                started_at,
+                finished_at,
+                result['posts_count'],
+                result['saved_count'],
+                json.dumps(result['sources_status'], ensure_ascii=False),
+                result['error']
+            ))
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Erreur enregistrement collecte sociale: {e}")
+        finally:
+            conn.close()
+
+    def _last_run(self, successful: bool) -> Optional[tuple]:
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            query = "SELECT finished_at, posts_count, saved_count, sources_status, error FROM social_collection_runs"
+            if successful:
+                query += " WHERE error IS NULL AND saved_count > 0"
+            cursor.execute(query + " ORDER BY id DESC LIMIT 1")
+            return cursor.fetchone()
+        except Exception as e:
+            logger.debug(f"Historique de collecte indisponible: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def get_freshness(self) -> Dict[str, Any]:
+        """
+        Métadonnées de fraîcheur du stockage local : date de la dernière
+        collecte ayant apporté des posts, âge, et état de la dernière exécution
+        """
+        last_success = self._last_run(successful=True)
+        last_run = self._last_run(successful=False)
+
+        collected_at = None
+        age_seconds = None
+        if last_success:
+            collected_at = str(last_success[0])
+            try:
+                age_seconds = int((datetime.now() - datetime.fromisoformat(collected_at)).total_seconds())
+            except ValueError:
+                age_seconds = None
+
+        last_run_info = None
+        if last_run:
+            try:
+                sources_status = json.loads(last_run[3]) if last_run[3] else {}
+            except ValueError:
+                sources_status = {}
+            last_run_info = {
+                'finished_at': str(last_run[0]),
+                'posts_count': last_run[1],
+                'saved_count': last_run[2],
+                'sources_status': sources_status,
+                'error': last_run[4]
+            }
+
+        return {
+            'last_collected_at': collected_at,
+            'age_seconds': age_seconds,
+            # Périmé si aucune collecte réussie depuis deux intervalles
+            'stale': age_seconds is None or age_seconds > 2 * self.interval,
+            'collect_interval': self.interval,
+            'collecting': self.collecting,
+            'last_run': last_run_info
+        }
+
+
+# Instance globale
+_social_collector = None
+
+def get_social_collector(db_manager: DatabaseManager) -> SocialCollector:
+    """Retourne l'instance singleton du collecteur social"""
+    global _social_collector
+    if _social_collector is None:
+        _social_collector = SocialCollector(db_manager)
+    return _social_collector
@@ -4,9 +4,9 @@ Module de comparaison des sentiments RSS vs Réseaux Sociaux
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
-from .database import DatabaseManager
+from .database import DatabaseManager, to_timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -96,10 +96,10 @@ class SocialComparator:
         cursor.execute("""
             SELECT id, title, content, sentiment_score, sentiment_type
             FROM articles
-            WHERE pub_date >= ?
-            ORDER BY pub_date DESC
+            WHERE pub_ts >= ?
+            ORDER BY pub_ts DESC
             LIMIT 500
-        """, (cutoff_date,))
+        """, (to_timestamp(cutoff_date.astimezone(timezone.utc)),))
         
         articles = []
         for row in cursor.fetchall():
@@ -323,22 +323,6 @@ class SocialComparator:
         cursor = conn.cursor()
         
         try:
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS sentiment_comparisons (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME,
-                    rss_total INTEGER,
-                    rss_avg_sentiment REAL,
-                    social_total INTEGER,
-                    social_avg_sentiment REAL,
-                    divergence_absolute REAL,
-                    factor_z_value REAL,
-                    interpretation TEXT,
-                    recommendations TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
             cursor.execute("""
                 INSERT INTO sentiment_comparisons 
                 (timestamp, rss_total, rss_avg_sentiment, social_total, social_avg_sentiment,
@@ -15,6 +15,10 @@ set LLAMA_DIR=llama.cpp
 set SERVER_EXE=llama-server.exe
 set MODEL_FILE=Llama-3.2-3B-Q4_K_M.gguf
 set LLAMA_PORT=8080
+REM Slots paralleles : doit valoir LLAMA_PARALLEL_SLOTS (Flask\config.py)
+REM 4 slots de rapport + 2 de synthese ; -c est partage : 2048 tokens par slot
+set LLAMA_SLOTS=6
+set LLAMA_CTX=12288
 set FLASK_PORT=5000
 
 echo [1/3] Verification de l'environnement...
@@ -50,7 +54,7 @@ echo [2/3] Demarrage du serveur IA Llama...
 echo.
 
 REM Démarrer le serveur Llama dans une nouvelle fenêtre
-start "Serveur IA Llama 3.2" /D "%LLAMA_DIR%" cmd /k "%SERVER_EXE% -m models\%MODEL_FILE% -c 2048 -b 256 -t 6 --host 0.0.0.0 --port %LLAMA_PORT% --ctx-size 2048"
+start "Serveur IA Llama 3.2" /D "%LLAMA_DIR%" cmd /k "%SERVER_EXE% -m models\%MODEL_FILE% -c %LLAMA_CTX% -np %LLAMA_SLOTS% -b 256 -t 6 --host 0.0.0.0 --port %LLAMA_PORT%"
 
 echo   [OK] Serveur IA demarre sur http://localhost:%LLAMA_PORT%
 echo   Patientez 10 secondes pour l'initialisation...
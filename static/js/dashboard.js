@@ -7,11 +7,16 @@ class DashboardManager {
         timeline: null
     };
 
+    static data = null;
+    static liveSource = null;
+    static pollTimer = null;
+
     static async loadDashboardData() {
         try {
             const data = await ApiClient.get('/api/stats');
             console.log('📊 Données dashboard reçues:', data);
             
+            this.data = data;
             this.updateStatsCards(data);
             this.createCharts(data);
             this.loadPopularThemes(data.theme_stats);
@@ -20,6 +25,111 @@ class DashboardManager {
         }
     }
 
+    // Abonnement SSE : le serveur pousse un delta après chaque ingestion
+    static subscribeLiveUpdates() {
+        if (!window.EventSource) {
+            this.startPolling();
+            return;
+        }
+
+        const source = new EventSource('/api/live/dashboard');
+        this.liveSource = source;
+        let connectedOnce = false;
+
+        source.addEventListener('hello', () => {
+            // Après une reconnexion, l'état complet est rechargé une fois
+            if (connectedOnce) this.loadDashboardData();
+            connectedOnce = true;
+            this.stopPolling();
+        });
+        source.addEventListener('delta', (event) => this.applyDelta(JSON.parse(event.data)));
+        source.addEventListener('resync', () => this.loadDashboardData());
+        source.onerror = () => {
+            // Flux désactivé côté serveur (204) ou refusé : retour au polling
+            if (source.readyState === EventSource.CLOSED) {
+                console.warn('⚠️ Flux temps réel indisponible, rafraîchissement périodique');
+                this.startPolling();
+            }
+        };
+    }
+
+    static startPolling() {
+        if (!this.pollTimer) {
+            this.pollTimer = setInterval(() => this.loadDashboardData(), 30000);
+        }
+    }
+
+    static stopPolling() {
+        if (this.pollTimer) {
+            clearInterval(this.pollTimer);
+            this.pollTimer = null;
+        }
+    }
+
+    static applyDelta(delta) {
+        const data = this.data;
+        if (!data || !delta.new_articles) return;
+
+        // Thème inconnu (créé depuis le chargement) : rechargement complet
+        const themeStats = data.theme_stats || {};
+        if (Object.keys(delta.themes || {}).some(themeId => !themeStats[themeId])) {
+            this.loadDashboardData();
+            return;
+        }
+
+        data.total_articles = (data.total_articles || 0) + delta.new_articles;
+        data.sentiment_distribution = data.sentiment_distribution || {};
+        Object.entries(delta.sentiment || {}).forEach(([type, count]) => {
+            data.sentiment_distribution[type] = (data.sentiment_distribution[type] || 0) + count;
+        });
+        Object.entries(delta.themes || {}).forEach(([themeId, count]) => {
+            themeStats[themeId].article_count += count;
+        });
+
+        data.timeline_data = data.timeline_data || [];
+        Object.entries(delta.timeline || {}).forEach(([date, counts]) => {
+            let day = data.timeline_data.find(d => d.date === date);
+            if (!day) {
+                day = { date: date, positive: 0, negative: 0, neutral: 0 };
+                data.timeline_data.push(day);
+                data.timeline_data.sort((a, b) => a.date.localeCompare(b.date));
+            }
+            Object.entries(counts).forEach(([type, count]) => { day[type] = (day[type] || 0) + count; });
+        });
+
+        console.log(`📡 Delta reçu: ${delta.new_articles} nouveaux articles`);
+        this.updateStatsCards(data);
+        this.createCharts(data);
+        this.loadPopularThemes(data.theme_stats);
+        this.showAnomalyAlerts(delta.anomalies || []);
+    }
+
+    static showAnomalyAlerts(anomalies) {
+        if (anomalies.length === 0) return;
+
+        let container = document.getElementById('liveAnomalyAlerts');
+        if (!container) {
+            container = document.createElement('div');
+            container.id = 'liveAnomalyAlerts';
+            container.className = 'fixed bottom-4 right-4 space-y-2 z-50 max-w-sm';
+            document.body.appendChild(container);
+        }
+
+        anomalies.slice(0, 3).forEach(anomaly => {
+            const alert = document.createElement('div');
+            const color = anomaly.z_score > 0 ? 'border-green-500' : 'border-red-500';
+            alert.className = `bg-white shadow-lg rounded-lg p-3 border-l-4 ${color} text-sm`;
+            alert.innerHTML = `
+                <p class="font-medium text-gray-800"><i class="fas fa-exclamation-triangle mr-1"></i>Anomalie de sentiment (z = ${anomaly.z_score})</p>
+                <p class="text-gray-600"></p>
+            `;
+            // Titre issu d'un flux externe : inséré comme texte
+            alert.lastElementChild.textContent = Formatters.truncateText(anomaly.title || '', 100);
+            container.appendChild(alert);
+            setTimeout(() => alert.remove(), 15000);
+        });
+    }
+
     static updateStatsCards(data) {
         const elements = {
             'statTotalArticles': data.total_articles || 0,
@@ -381,6 +491,6 @@ document.addEventListener('DOMContentLoaded', function () {
     // Charger les données si on est sur la page dashboard
     if (document.getElementById('sentimentChart')) {
         DashboardManager.loadDashboardData();
-        setInterval(() => DashboardManager.loadDashboardData(), 30000);
+        DashboardManager.subscribeLiveUpdates();
     }
 });
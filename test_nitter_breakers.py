@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test de non-régression : disjoncteurs des instances Nitter
+Une instance dont le délai d'ouverture est écoulé ne doit pas rester
+bloquée en semi-ouvert quand une autre instance répond la première
+"""
+
+import sys
+import os
+import time
+import pytest
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Flask.http_client import CircuitBreaker
+
+RESET_TIMEOUT = 0.05
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_is_open_does_not_change_state():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=RESET_TIMEOUT)
+    trip(breaker)
+    assert breaker.is_open()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(RESET_TIMEOUT * 2)
+    assert not breaker.is_open()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.is_open()
+
+
+@pytest.fixture
+def aggregator(tmp_path):
+    from Flask.database import DatabaseManager
+    from Flask.social_aggregator import SocialAggregator
+
+    agg = SocialAggregator(DatabaseManager(str(tmp_path / 'social.db')))
+    agg.nitter_instances = ['A', 'B', 'C']
+    agg.current_instance_index = 0
+    agg.nitter_breakers = {
+        name: CircuitBreaker(failure_threshold=1, reset_timeout=RESET_TIMEOUT)
+        for name in agg.nitter_instances
+    }
+    agg.nitter_hedge_delay = 1.0
+    return agg
+
+
+def test_unlaunched_instances_stay_available(aggregator):
+    for breaker in aggregator.nitter_breakers.values():
+        trip(breaker)
+    time.sleep(RESET_TIMEOUT * 2)
+
+    calls = []
+
+    def fake_request(source, instance):
+        calls.append(instance)
+        return [{'title': f'post {instance}'}]
+
+    aggregator._nitter_request = fake_request
+    source = {'name': 'test', 'config': {}}
+
+    posts = aggregator._fetch_from_nitter(source)
+    assert posts == [{'title': 'post A'}]
+    assert calls == ['A']
+
+    states = {name: b.state for name, b in aggregator.nitter_breakers.items()}
+    assert states == {'A': 'closed', 'B': 'open', 'C': 'open'}
+
+    # B et C restent candidates : si A tombe, elles prennent le relais
+    def failing_a(source, instance):
+        calls.append(instance)
+        if instance == 'A':
+            raise ConnectionError('A hors service')
+        return [{'title': f'post {instance}'}]
+
+    aggregator._nitter_request = failing_a
+    posts = aggregator._fetch_from_nitter(source)
+    assert posts == [{'title': 'post B'}]
+    assert aggregator.nitter_breakers['B'].state == 'closed'
+    assert aggregator.nitter_breakers['C'].state == 'open'
+    assert not aggregator.nitter_breakers['C'].is_open()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q', '-s']))
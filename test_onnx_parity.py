@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test de parité : pipeline PyTorch pleine précision vs ONNX Runtime int8
+Vérifie que le modèle quantifié prédit les mêmes libellés que PyTorch
+"""
+
+import sys
+import os
+import sqlite3
+import pytest
+
+# Ajouter le répertoire parent au path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Taux d'accord minimal accepté entre les deux backends
+MIN_AGREEMENT = 0.95
+# Écart max de confiance accepté quand les libellés concordent
+MAX_SCORE_DELTA = 0.1
+
+SAMPLE_TEXTS = [
+    "Les négociations de paix progressent, un accord historique est en vue.",
+    "L'attaque a fait des dizaines de victimes civiles dans la capitale.",
+    "Le parlement examinera le projet de loi la semaine prochaine.",
+    "Markets rallied strongly after the central bank cut interest rates.",
+    "The ceasefire collapsed overnight as fighting resumed near the border.",
+    "The ministry published its quarterly report on Tuesday.",
+    "Une sécheresse sans précédent menace les récoltes de la région.",
+    "Les exportations ont atteint un niveau record ce trimestre.",
+    "Protesters clashed with police, leaving several people injured.",
+    "Scientists welcomed the breakthrough as a major step forward.",
+]
+
+
+def load_corpus(limit=200):
+    """Titres d'articles de la base locale, ou textes d'exemple"""
+    db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rss_analyzer.db')
+    texts = []
+    if os.path.exists(db_path):
+        try:
+            conn = sqlite3.connect(db_path)
+            rows = conn.execute(
+                "SELECT title, content FROM articles ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+            conn.close()
+            texts = [f"{title}. {content or ''}"[:512] for title, content in rows if title]
+        except sqlite3.Error as e:
+            print(f"⚠️ Lecture base impossible: {e}")
+    return texts or SAMPLE_TEXTS
+
+
+def top_label(scores):
+    best = max(scores, key=lambda x: x['score'])
+    return best['label'], best['score']
+
+
+def test_onnx_parity():
+    print("\n" + "=" * 60)
+    print("🧪 TEST DE PARITÉ PYTORCH / ONNX INT8")
+    print("=" * 60)
+
+    transformers = pytest.importorskip('transformers')
+    pytest.importorskip('torch')
+    pytest.importorskip('onnxruntime')
+    from Flask.config import SENTIMENT_TRANSFORMER_MODEL
+    from Flask.onnx_sentiment import load_onnx_pipeline
+
+    torch_pipeline = transformers.pipeline(
+        "sentiment-analysis",
+        model=SENTIMENT_TRANSFORMER_MODEL,
+        return_all_scores=True
+    )
+    onnx_pipeline = load_onnx_pipeline()
+
+    texts = load_corpus()
+    print(f"📄 {len(texts)} textes")
+
+    agree = 0
+    max_delta = 0.0
+    for text in texts:
+        torch_label, torch_score = top_label(torch_pipeline(text[:512])[0])
+        onnx_label, onnx_score = top_label(onnx_pipeline(text[:512])[0])
+        if torch_label == onnx_label:
+            agree += 1
+            max_delta = max(max_delta, abs(torch_score - onnx_score))
+        else:
+            print(f"   ≠ {torch_label} / {onnx_label}: {text[:70]}")
+
+    agreement = agree / len(texts)
+    print(f"\n📊 Accord des libellés: {agreement:.1%} ({agree}/{len(texts)})")
+    print(f"📊 Écart max de confiance (libellés identiques): {max_delta:.4f}")
+
+    assert agreement >= MIN_AGREEMENT, f"Accord {agreement:.1%} inférieur à {MIN_AGREEMENT:.0%}"
+    assert max_delta <= MAX_SCORE_DELTA, f"Écart de confiance {max_delta:.4f} supérieur à {MAX_SCORE_DELTA}"
+    print("✅ Parité respectée")
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q', '-s']))
@@ -59,7 +59,8 @@ class ThemeAnalyzer:
         if doc_freq == 0 or term_freq == 0:
             return 0.0
         tf = math.log(1 + term_freq)  # Log frequency weighting
-        idf = math.log(total_docs / doc_freq)
+        # Terme plus fréquent dans l'article que de documents en base : IDF nul
+        idf = max(0.0, math.log(total_docs / doc_freq))
         return tf * idf
     
     def analyze_article(self, article_text: str, article_title: str = "") -> Dict[str, float]:
@@ -132,8 +133,21 @@ class ThemeAnalyzer:
         
         return results
     
-    def save_theme_analysis(self, article_id: int, theme_scores: Dict[str, float]):
-        """Sauvegarde l'analyse des thèmes pour un article"""
+    def save_theme_analysis(self, article_id: int, theme_scores: Dict[str, float], cursor=None):
+        """
+        Sauvegarde l'analyse des thèmes pour un article
+        Avec cursor, l'écriture se fait dans la transaction de l'appelant
+        (qui la valide) : une seconde connexion attendrait son verrou
+        """
+        if cursor is not None:
+            cursor.execute("DELETE FROM theme_analyses WHERE article_id = ?", (article_id,))
+            cursor.executemany("""
+                INSERT INTO theme_analyses (article_id, theme_id, confidence)
+                VALUES (?, ?, ?)
+            """, [(article_id, theme_id, confidence)
+                  for theme_id, confidence in theme_scores.items() if confidence >= 0.01])
+            return
+
         conn = self.db_manager.get_connection()
         cursor = conn.cursor()
         
@@ -17,70 +17,8 @@ class AdvancedThemeManager:
     """
     
     def __init__(self, db_manager: DatabaseManager):
+        # Tables créées par la migration 12_create_theme_advanced_tables
         self.db_manager = db_manager
-        self._init_advanced_tables()
-    
-    def _init_advanced_tables(self):
-        """Initialise les tables avancées pour la gestion des thèmes"""
-        conn = self.db_manager.get_connection()
-        cursor = conn.cursor()
-        
-        # Table pour les mots-clés pondérés
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS theme_keywords_weighted (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                theme_id TEXT NOT NULL,
-                keyword TEXT NOT NULL,
-                weight REAL DEFAULT 1.0,
-                category TEXT DEFAULT 'primary',
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE,
-                UNIQUE(theme_id, keyword)
-            )
-        """)
-        
-        # Table pour les synonymes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS theme_synonyms (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                theme_id TEXT NOT NULL,
-                original_word TEXT NOT NULL,
-                synonym TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Table pour le contexte géopolitique
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS theme_context (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                theme_id TEXT NOT NULL,
-                context_type TEXT NOT NULL,
-                context_value TEXT NOT NULL,
-                metadata TEXT,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # Table pour les statistiques d'apprentissage
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS theme_learning_stats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                theme_id TEXT NOT NULL,
-                keyword TEXT NOT NULL,
-                usage_count INTEGER DEFAULT 0,
-                accuracy REAL DEFAULT 0.0,
-                last_used DATETIME,
-                FOREIGN KEY (theme_id) REFERENCES themes(id) ON DELETE CASCADE,
-                UNIQUE(theme_id, keyword)
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-        logger.info("✅ Tables avancées initialisées")
     
     def theme_exists(self, theme_id: str) -> bool:
         """Vérifie si un thème existe déjà"""
@@ -0,0 +1,8 @@
+# Point d'entrée des serveurs WSGI : gunicorn -c gunicorn.conf.py wsgi:app
+# Workers gthread obligatoires pour le flux SSE /api/live/dashboard (une
+# connexion ouverte par onglet) ; avec des workers sync, passer
+# LIVE_UPDATES_ENABLED = False : le dashboard revient au rafraîchissement périodique.
+# Jamais importé par les workers du pool de sentiment (contrairement à __main__)
+from Flask.app_factory import create_app
+
+app = create_app()